@@ -1,7 +1,56 @@
+import functools
+import threading
+
 import dash
+import flask
+# O plotly serializa imagens PIL se o módulo já estiver em sys.modules; se o
+# reportlab (importado só na geração do PDF) estiver importando o PIL numa
+# thread, outra thread do gunicorn vê o módulo pela metade e o callback
+# falha. Importar o PIL aqui (~15 ms) evita a corrida.
+import PIL.Image  # noqa: F401
 from dash import Dash, html, dcc
+from plotly.io.json import to_json_plotly
+
+from dados import registro
+from monitoramento import etapas, memoria
+from monitoramento import metricas as monitoramento
+from monitoramento import perfil
+from rotas import downloads, exportacao, metricas, perfis
+from rotas import memoria as rotas_memoria
+
+
+class PainelDash(Dash):
+    # As páginas são funções de layout montadas a partir do snapshot atual
+    # (e memorizadas por versão das planilhas); aqui o JSON de /_dash-layout
+    # também é guardado por versão, em vez de serializado a cada acesso.
+    _layout_json = (None, None)
+
+    def serve_layout(self):
+        versao = registro.versao()
+        if self._layout_json[0] != versao:
+            self._layout_json = (versao, to_json_plotly(self._layout_value()))
+        return flask.Response(self._layout_json[1], mimetype="application/json")
+
+    def dispatch(self):
+        # Tempo, CPU, bytes e erros de cada callback (ver /metrics) e tempo
+        # por etapa (Server-Timing). Saídas que não são de nenhum callback
+        # não viram rótulo novo. Com o token de admin, a requisição roda sob
+        # o perfilador (ver monitoramento.perfil).
+        saida = (flask.request.get_json(silent=True) or {}).get("output")
+        nome = (
+            monitoramento.nome_callback(saida)
+            if saida in self.callback_map
+            else "desconhecido"
+        )
+        despachar = super().dispatch
+        if perfil.solicitado():
+            despachar = functools.partial(perfil.perfilar, nome, despachar)
+        return monitoramento.medir_callback(
+            nome, lambda: etapas.rastrear(nome, despachar)
+        )
 
-app = Dash(
+
+app = PainelDash(
     __name__,
     use_pages=True,
     suppress_callback_exceptions=True,  # boa prática
@@ -9,6 +58,34 @@ app = Dash(
 )
 server = app.server
 
+# As planilhas carregam em segundo plano: o servidor sobe sem esperar a rede
+# e as páginas mostram "carregando" até o snapshot ficar pronto
+registro.carregar_em_segundo_plano()
+memoria.iniciar_linha_do_tempo()
+memoria.registrar_cache("app.layout_json", lambda: app._layout_json[1])
+
+
+def _aquecer_graficos():
+    # O plotly.express monta o template padrão na primeira figura, e essa
+    # montagem não é segura entre threads: com gunicorn --threads, as
+    # primeiras figuras simultâneas podem falhar com "Invalid value". Uma
+    # figura descartável, feita enquanto as planilhas carregam, deixa o
+    # template pronto antes do primeiro callback.
+    import plotly.express as px
+
+    px.line(x=[0], y=[0])
+
+
+threading.Thread(target=_aquecer_graficos, daemon=True).start()
+
+# Rotas Flask adicionais (exportação de dados, download dos PDFs, métricas,
+# perfis de callbacks e memória)
+exportacao.registrar(server)
+downloads.registrar(server)
+metricas.registrar(server)
+perfis.registrar(server)
+rotas_memoria.registrar(server)
+
 
 menu_links = [
     {"label": "Passagens DCF", "href": "/passagens-dcf"},
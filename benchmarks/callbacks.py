@@ -0,0 +1,327 @@
+# benchmarks/callbacks.py
+
+# Tempo, pico de memória e tamanho da resposta dos caminhos de cada página:
+# carga da planilha, callback principal (filtro, agregação, gráficos e
+# tabelas) e geração do PDF.
+#
+# Uso:
+#   python benchmarks/callbacks.py --tamanhos 1000 10000 50000
+#   python benchmarks/callbacks.py --casos passagens. dotacao.gerar_pdf
+#   python benchmarks/callbacks.py --salvar benchmarks/callbacks_base.json
+#   python benchmarks/callbacks.py --comparar benchmarks/callbacks_base.json
+#
+# Para cada tamanho, gera planilhas sintéticas (ferramentas.gerar_planilhas)
+# com esse número de linhas, carrega cada uma pela função de dados.registro
+# e chama os callbacks das páginas direto, como o Dash chamaria, com o ano
+# mais recente selecionado e os demais filtros vazios. Cada caso registra:
+#   tempo:   mediana de --repeticoes execuções (s);
+#   memoria: pico alocado durante uma execução à parte, com tracemalloc
+#            (bytes; medido separado para não distorcer o tempo);
+#   bytes:   tamanho da resposta (CSV lido na carga, JSON da resposta do
+#            callback como o Dash serializa, arquivo gravado no PDF).
+# Os PDFs incluem as tabelas completas e dominam o tempo total (vários
+# segundos por relatório a partir de 10 mil linhas); --casos restringe a
+# medição aos casos cujo nome contém algum dos trechos dados.
+#
+# Com --comparar, sai com código 1 se algum caso presente na base piorar
+# mais que --tolerancia em qualquer das três medidas (diferenças de tempo
+# abaixo de TEMPO_MINIMO são ignoradas, por serem ruído).
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from urllib.parse import unquote
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TAMANHOS = [1000, 5000]
+ANOS = [2023, 2024, 2025]
+TEMPO_MINIMO = 0.005  # segundos
+
+MEDIDAS = ("tempo", "memoria", "bytes")
+
+
+# --------------------------------------------------
+# Medição
+# --------------------------------------------------
+def _medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        gc.collect()
+        inicio = time.perf_counter()
+        saida = funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return saida, statistics.median(tempos), pico
+
+
+def _json(saida):
+    from plotly.io.json import to_json_plotly
+
+    return to_json_plotly({"response": saida})
+
+
+def _tamanho_pdf(href):
+    from rotas import downloads
+
+    token, nome = unquote(href).split("/")[2:]
+    return os.path.getsize(os.path.join(downloads.DIRETORIO, token, nome))
+
+
+def _estado(saida):
+    # O navegador devolve ao servidor as saídas já em JSON (figuras como
+    # dicionários), e é assim que os callbacks de PDF as recebem
+    return json.loads(_json(saida))["response"]
+
+
+# --------------------------------------------------
+# Casos
+# --------------------------------------------------
+def _callbacks(ano, saidas):
+    """Casos de callback por página: [(caso, função, tipo, guardar_em)].
+
+    Os casos de PDF usam como State as saídas do callback principal, que
+    medir_tamanho guarda em saidas[guardar_em]; por isso cada página é uma
+    lista executada em ordem.
+    """
+    from pages import dotacao
+    from pages import execucao_orcamento_unifei as unifei
+    from pages import execucao_ted as ted
+    from pages import natureza_despesa_2024 as naturezas
+    from pages import pagamentos, passagens_dcf
+
+    from dados import registro
+
+    return {
+        "passagens": [
+            (
+                "atualizar_pagina",
+                lambda: passagens_dcf.atualizar_pagina(ano, None, None, None),
+                "json",
+                "passagens",
+            ),
+            (
+                "atualizar_detalhe",
+                lambda: passagens_dcf.atualizar_detalhe(ano, None, None, None),
+                "json",
+                "detalhe",
+            ),
+            ("gerar_pdf", lambda: passagens_dcf.gerar_pdf(
+                1,
+                saidas["passagens"][1],
+                saidas["passagens"][2],
+                saidas["passagens"][3],
+                saidas["detalhe"],
+                saidas["passagens"][4],
+            ), "pdf", None),
+        ],
+        "pagamentos": [
+            (
+                "atualizar_tabela",
+                lambda: pagamentos.atualizar_tabela(ano, None, None, None, None),
+                "json",
+                "pagamentos",
+            ),
+            ("gerar_pdf", lambda: pagamentos.gerar_pdf(
+                1, saidas["pagamentos"][0], saidas["pagamentos"][1]
+            ), "pdf", None),
+        ],
+        "dotacao": [
+            (
+                "atualizar_painel",
+                lambda: dotacao.atualizar_painel(None, ano, None, None, None),
+                "json",
+                "dotacao",
+            ),
+            ("gerar_pdf", lambda: dotacao.gerar_pdf(1, saidas["dotacao"][6]), "pdf", None),
+        ],
+        "execucao_unifei": [
+            (
+                "atualizar_painel",
+                lambda: unifei.atualizar_painel(None, None, ano, None, None, None, None),
+                "json",
+                "unifei",
+            ),
+            ("gerar_pdf", lambda: unifei.gerar_pdf(1, saidas["unifei"][4]), "pdf", None),
+        ],
+        "execucao_ted": [
+            (
+                "atualizar_painel",
+                lambda: ted.atualizar_painel(None, None, ano, None, None, None, None, None),
+                "json",
+                "ted",
+            ),
+            ("gerar_pdf", lambda: ted.gerar_pdf(1, saidas["ted"][4]), "pdf", None),
+        ],
+        "naturezas": [
+            ("gerar_pdf", lambda: naturezas.gerar_pdf(
+                1, registro.obter("naturezas").to_dict("records")
+            ), "pdf", None),
+        ],
+    }
+
+
+def medir_tamanho(linhas, diretorio, repeticoes, semente=0, casos=None):
+    from dados import registro
+    from ferramentas import gerar_planilhas
+
+    por_planilha = {nome: linhas for nome in registro.DATASETS}
+    por_planilha["naturezas"] = gerar_planilhas.CARDINALIDADES["naturezas"]
+    caminhos = gerar_planilhas.gerar_todas(
+        os.path.join(diretorio, str(linhas)), por_planilha, ANOS, semente
+    )
+
+    def escolhido(caso):
+        return not casos or any(trecho in caso for trecho in casos)
+
+    resultados = {}
+    for nome, carregar in registro.DATASETS.items():
+        if not escolhido(f"{nome}.carga"):
+            registro.definir(nome, carregar(caminhos[nome]))
+            continue
+        df, tempo, pico = _medir(lambda: carregar(caminhos[nome]), repeticoes)
+        resultados[f"{linhas}/{nome}.carga"] = {
+            "tempo": tempo,
+            "memoria": pico,
+            "bytes": os.path.getsize(caminhos[nome]),
+        }
+        registro.definir(nome, df)
+
+    # Só depois dos snapshots definidos: assim o import do app não agenda
+    # nenhum download em segundo plano
+    import app  # noqa: F401
+
+    saidas = {}
+    for pagina, lista in _callbacks(max(ANOS), saidas).items():
+        for caso, funcao, tipo, guardar_em in lista:
+            if not escolhido(f"{pagina}.{caso}"):
+                if guardar_em:
+                    saidas[guardar_em] = _estado(funcao())
+                continue
+            print(f"{linhas}/{pagina}.{caso}", file=sys.stderr)
+            saida, tempo, pico = _medir(funcao, repeticoes)
+            if guardar_em:
+                saidas[guardar_em] = _estado(saida)
+            resultados[f"{linhas}/{pagina}.{caso}"] = {
+                "tempo": tempo,
+                "memoria": pico,
+                "bytes": _tamanho_pdf(saida) if tipo == "pdf" else len(_json(saida)),
+            }
+    return resultados
+
+
+# --------------------------------------------------
+# Base de comparação
+# --------------------------------------------------
+def comparar(atuais, base, tolerancia):
+    """Lista de (caso, medida, base, atual) que pioraram além da tolerância."""
+    regressoes = []
+    for caso, medidas in atuais.items():
+        anteriores = base.get(caso)
+        if anteriores is None:
+            continue
+        for medida in MEDIDAS:
+            antes, agora = anteriores[medida], medidas[medida]
+            if agora <= antes * (1 + tolerancia):
+                continue
+            if medida == "tempo" and agora - antes < TEMPO_MINIMO:
+                continue
+            regressoes.append((caso, medida, antes, agora))
+    return regressoes
+
+
+def _formatar(medida, valor):
+    if medida == "tempo":
+        return f"{valor * 1000:.1f} ms"
+    if medida == "memoria":
+        return f"{valor / 1024:.0f} KiB"
+    return f"{valor} bytes"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Mede carga, callbacks e PDFs das páginas do painel."
+    )
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument(
+        "--casos", nargs="+", metavar="TRECHO", help="mede só esses casos"
+    )
+    parser.add_argument("--raiz", default=RAIZ)
+    parser.add_argument("--salvar", metavar="ARQUIVO", help="grava a medição em JSON")
+    parser.add_argument("--comparar", metavar="ARQUIVO", help="JSON de base")
+    parser.add_argument(
+        "--tolerancia",
+        type=float,
+        default=0.25,
+        help="piora máxima aceita em relação à base (0.25 = 25%%)",
+    )
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, args.raiz)
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.environ["PAINEL_DOWNLOADS_DIR"] = os.path.join(diretorio, "downloads")
+        resultados = {}
+        for linhas in args.tamanhos:
+            resultados.update(
+                medir_tamanho(
+                    linhas, diretorio, args.repeticoes, args.semente, args.casos
+                )
+            )
+
+    print(f"{'caso':<40} {'tempo (ms)':>11} {'pico (KiB)':>11} {'bytes':>11}")
+    for caso, medidas in resultados.items():
+        print(
+            f"{caso:<40} {medidas['tempo'] * 1000:>11.1f} "
+            f"{medidas['memoria'] / 1024:>11.0f} {medidas['bytes']:>11}"
+        )
+
+    if args.salvar:
+        with open(args.salvar, "w", encoding="utf-8") as fh:
+            json.dump(
+                {
+                    "ambiente": {
+                        "python": platform.python_version(),
+                        "maquina": platform.machine(),
+                        "cpus": os.cpu_count(),
+                        "repeticoes": args.repeticoes,
+                    },
+                    "resultados": resultados,
+                },
+                fh,
+                indent=2,
+                ensure_ascii=False,
+            )
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as fh:
+            base = json.load(fh)["resultados"]
+        regressoes = comparar(resultados, base, args.tolerancia)
+        for caso, medida, antes, agora in regressoes:
+            print(
+                f"REGRESSÃO {caso} {medida}: "
+                f"{_formatar(medida, antes)} -> {_formatar(medida, agora)}",
+                file=sys.stderr,
+            )
+        if regressoes:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,509 @@
+# benchmarks/carga.py
+
+# Teste de carga dos callbacks do painel com usuários simultâneos.
+#
+# Uso:
+#   python benchmarks/carga.py --usuarios 20 --workers 1 2 4 --threads 1 4
+#   python benchmarks/carga.py --linhas 10000 --duracao 60 --json carga.json
+#
+# Gera planilhas sintéticas (ferramentas.gerar_planilhas), sobe o servidor
+# de planilhas local (ferramentas.servidor_planilhas) e, para cada
+# combinação de --workers e --threads, um gunicorn com o app apontando para
+# ele. Cada usuário virtual repete, até o fim de --duracao, uma sessão como
+# a do navegador:
+#   abrir página: GET da página e de /_dash-layout, rota do dash pages e
+#                 callbacks iniciais dos componentes novos;
+#   filtro:       novo valor num dropdown, sorteado entre as opções;
+#   tick:         n_intervals + 1 em cada dcc.Interval da tela;
+#   pdf:          clique no botão do relatório e GET do arquivo gerado.
+# As requisições a /_dash-update-component são montadas a partir de
+# /_dash-dependencies e do estado dos componentes devolvido pelo servidor,
+# e os callbacks disparados por uma resposta são chamados em seguida, como
+# o renderer do Dash faria.
+#
+# Relata, por configuração, a vazão (requisições/s) e os erros, e, por
+# callback (identificado pela primeira saída), p50/p95/p99 da latência. O
+# gerador de carga roda na mesma máquina que o gunicorn: numa máquina com
+# poucas CPUs, ele também disputa processador com os workers.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGINAS = [
+    "/passagens-dcf",
+    "/pagamentos",
+    "/dotacao",
+    "/execucao-orcamento-unifei",
+    "/natureza-despesa-2024",
+    "/execucao-ted",
+]
+
+# Peso de cada ação depois da abertura da primeira página
+ACOES = {"filtro": 0.6, "tick": 0.15, "pagina": 0.2, "pdf": 0.05}
+
+# O gunicorn (gthread) fecha conexões ociosas após 2 s; o cliente descarta
+# as suas antes disso, como o navegador, para não reaproveitar uma conexão
+# que o servidor já fechou
+LIMITES = httpx.Limits(keepalive_expiry=1.0)
+
+RODADAS_MAXIMAS = 4
+ESPERA_PRONTO = 120  # segundos
+
+
+# --------------------------------------------------
+# Callbacks e estado dos componentes
+# --------------------------------------------------
+def _id_prop(texto):
+    id_, _, prop = texto.rpartition(".")
+    return id_, prop
+
+
+def indexar_callbacks(dependencias):
+    """Callbacks do servidor, a partir do JSON de /_dash-dependencies."""
+    callbacks = []
+    for dep in dependencias:
+        if dep.get("clientside_function"):
+            continue
+        saida = dep["output"]
+        if saida.startswith(".."):
+            saidas = [_id_prop(s) for s in saida[2:-2].split("...")]
+        else:
+            saidas = [_id_prop(saida)]
+        callbacks.append(
+            {
+                "output": saida,
+                "multi": saida.startswith(".."),
+                "saidas": saidas,
+                "entradas": [(e["id"], e["property"]) for e in dep["inputs"]],
+                "estados": [(e["id"], e["property"]) for e in dep["state"]],
+                "inicial": not dep.get("prevent_initial_call"),
+                "nome": ".".join(saidas[0]),
+            }
+        )
+    return callbacks
+
+
+class Sessao:
+    """Estado dos componentes na tela de um usuário virtual."""
+
+    def __init__(self, cliente, callbacks, registrar, aleatorio):
+        self.cliente = cliente
+        self.callbacks = callbacks
+        self.registrar = registrar
+        self.aleatorio = aleatorio
+        self.props = {}
+        self.tipos = {}
+
+    def coletar(self, arvore):
+        # Percorre o JSON de componentes e guarda as props de quem tem id
+        novos = set()
+        pilha = [arvore]
+        while pilha:
+            item = pilha.pop()
+            if isinstance(item, list):
+                pilha.extend(item)
+            elif isinstance(item, dict):
+                props = item.get("props")
+                if "type" in item and isinstance(props, dict):
+                    id_ = props.get("id")
+                    if isinstance(id_, str):
+                        novos.add(id_)
+                        self.tipos[id_] = item["type"]
+                        for prop, valor in props.items():
+                            self.props[(id_, prop)] = valor
+                    pilha.extend(props.values())
+                else:
+                    pilha.extend(item.values())
+        return novos
+
+    async def medir(self, nome, requisicao):
+        inicio = time.perf_counter()
+        try:
+            resposta = await requisicao
+            status = resposta.status_code
+        except httpx.HTTPError:
+            resposta, status = None, 0
+        self.registrar(nome, time.perf_counter() - inicio, status)
+        return resposta
+
+    async def _disparar(self, callback, mudou):
+        def valores(pares):
+            return [
+                {"id": id_, "property": prop, "value": self.props.get((id_, prop))}
+                for id_, prop in pares
+            ]
+
+        saidas = [{"id": id_, "property": prop} for id_, prop in callback["saidas"]]
+        corpo = {
+            "output": callback["output"],
+            "outputs": saidas if callback["multi"] else saidas[0],
+            "inputs": valores(callback["entradas"]),
+            "changedPropIds": [
+                f"{id_}.{prop}" for id_, prop in callback["entradas"]
+                if (id_, prop) in mudou
+            ],
+            "state": valores(callback["estados"]),
+        }
+        resposta = await self.medir(
+            callback["nome"],
+            self.cliente.post("/_dash-update-component", json=corpo),
+        )
+        if resposta is None or resposta.status_code != 200:
+            return set(), set()
+
+        alterados, novos = set(), set()
+        for id_, props in resposta.json().get("response", {}).items():
+            for prop, valor in props.items():
+                self.props[(id_, prop)] = valor
+                alterados.add((id_, prop))
+                novos |= self.coletar(valor)
+        return alterados, novos
+
+    async def propagar(self, mudou, novos=()):
+        """Dispara os callbacks afetados e, em seguida, os que eles afetam."""
+        for _ in range(RODADAS_MAXIMAS):
+            disparar = [
+                cb for cb in self.callbacks
+                if all(id_ in self.tipos for id_, _ in cb["entradas"])
+                and (
+                    any(e in mudou for e in cb["entradas"])
+                    or cb["inicial"] and any(id_ in novos for id_, _ in cb["entradas"])
+                )
+            ]
+            if not disparar:
+                return
+            resultados = await asyncio.gather(
+                *(self._disparar(cb, mudou) for cb in disparar)
+            )
+            mudou, novos = set(), set()
+            for alterados, criados in resultados:
+                mudou |= alterados
+                novos |= criados
+
+    def _ids(self, tipo, prefixo=""):
+        return sorted(
+            id_ for id_, t in self.tipos.items()
+            if t == tipo and id_.startswith(prefixo)
+        )
+
+    # --------------------------------------------------
+    # Ações
+    # --------------------------------------------------
+    async def abrir_pagina(self, caminho):
+        await self.medir("GET página", self.cliente.get(caminho))
+        resposta = await self.medir(
+            "GET /_dash-layout", self.cliente.get("/_dash-layout")
+        )
+        if resposta is None or resposta.status_code != 200:
+            return
+        self.props, self.tipos = {}, {}
+        novos = self.coletar(resposta.json())
+        mudou = set()
+        for id_ in ("_pages_location", "url"):
+            self.props[(id_, "pathname")] = caminho
+            self.props[(id_, "search")] = ""
+            mudou |= {(id_, "pathname"), (id_, "search")}
+        await self.propagar(mudou, novos)
+
+    async def trocar_filtro(self):
+        filtros = self._ids("Dropdown", "filtro_")
+        if not filtros:
+            return
+        id_ = self.aleatorio.choice(filtros)
+        opcoes = self.props.get((id_, "options")) or []
+        valores = [o["value"] if isinstance(o, dict) else o for o in opcoes]
+        self.props[(id_, "value")] = self.aleatorio.choice(valores + [None])
+        await self.propagar({(id_, "value")})
+
+    async def tick(self):
+        mudou = set()
+        for id_ in self._ids("Interval"):
+            atual = self.props.get((id_, "n_intervals")) or 0
+            self.props[(id_, "n_intervals")] = atual + 1
+            mudou.add((id_, "n_intervals"))
+        await self.propagar(mudou)
+
+    async def baixar_pdf(self):
+        for botao in self._ids("Button", "btn_download_relatorio"):
+            self.props[(botao, "n_clicks")] = (
+                self.props.get((botao, "n_clicks")) or 0
+            ) + 1
+            await self.propagar({(botao, "n_clicks")})
+            href = self.props.get((botao.replace("btn_", "", 1), "href"))
+            if href and href.startswith("/download/"):
+                await self.medir("GET /download", self.cliente.get(href))
+
+
+# --------------------------------------------------
+# Usuários virtuais
+# --------------------------------------------------
+async def _usuario(base_url, callbacks, fim, pausa, proporcao_pdf, registrar, semente):
+    aleatorio = random.Random(semente)
+    acoes = {**ACOES, "pdf": proporcao_pdf}
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=httpx.Timeout(120.0), limits=LIMITES
+    ) as cliente:
+        sessao = Sessao(cliente, callbacks, registrar, aleatorio)
+        await sessao.abrir_pagina(aleatorio.choice(PAGINAS))
+        while time.monotonic() < fim:
+            if pausa:
+                await asyncio.sleep(aleatorio.expovariate(1 / pausa))
+            acao = aleatorio.choices(list(acoes), weights=list(acoes.values()))[0]
+            if acao == "pagina":
+                await sessao.abrir_pagina(aleatorio.choice(PAGINAS))
+            elif acao == "filtro":
+                await sessao.trocar_filtro()
+            elif acao == "tick":
+                await sessao.tick()
+            else:
+                await sessao.baixar_pdf()
+
+
+async def _rodada(base_url, usuarios, duracao, pausa, proporcao_pdf, semente):
+    medicoes = []
+
+    def registrar(nome, duracao, status):
+        medicoes.append((nome, duracao, status))
+
+    async with httpx.AsyncClient(base_url=base_url) as cliente:
+        dependencias = (await cliente.get("/_dash-dependencies")).json()
+    callbacks = indexar_callbacks(dependencias)
+
+    inicio = time.monotonic()
+    await asyncio.gather(
+        *(
+            _usuario(
+                base_url,
+                callbacks,
+                inicio + duracao,
+                pausa,
+                proporcao_pdf,
+                registrar,
+                f"{semente}-{i}",
+            )
+            for i in range(usuarios)
+        )
+    )
+    return medicoes, time.monotonic() - inicio
+
+
+def resumir(medicoes, tempo_total):
+    por_nome = {}
+    for nome, duracao, status in medicoes:
+        por_nome.setdefault(nome, []).append((duracao, status))
+
+    def percentis(duracoes):
+        if len(duracoes) < 2:
+            return {p: duracoes[0] if duracoes else None for p in ("p50", "p95", "p99")}
+        q = statistics.quantiles(duracoes, n=100, method="inclusive")
+        return {"p50": q[49], "p95": q[94], "p99": q[98]}
+
+    return {
+        "requisicoes": len(medicoes),
+        "vazao": len(medicoes) / tempo_total,
+        "erros": sum(1 for _, _, status in medicoes if not 200 <= status < 400),
+        "geral": percentis([d for _, d, _ in medicoes]),
+        "callbacks": {
+            nome: {
+                "n": len(itens),
+                "erros": sum(1 for _, s in itens if not 200 <= s < 400),
+                **percentis([d for d, _ in itens]),
+            }
+            for nome, itens in sorted(por_nome.items())
+        },
+    }
+
+
+# --------------------------------------------------
+# Servidores
+# --------------------------------------------------
+def _porta_livre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _esperar_pronto(base_url, workers):
+    # Cada worker carrega as planilhas por conta própria: espera até uma
+    # sequência de respostas (atendidas por workers quaisquer) sem o aviso
+    # de "carregando"
+    rota = {
+        "output": ".._pages_content.children..._pages_store.data..",
+        "outputs": [
+            {"id": "_pages_content", "property": "children"},
+            {"id": "_pages_store", "property": "data"},
+        ],
+        "inputs": [
+            {"id": "_pages_location", "property": "pathname", "value": PAGINAS[0]},
+            {"id": "_pages_location", "property": "search", "value": ""},
+        ],
+        "changedPropIds": ["_pages_location.pathname"],
+    }
+    limite = time.monotonic() + ESPERA_PRONTO
+    seguidas = 0
+    with httpx.Client(base_url=base_url, timeout=30) as cliente:
+        while time.monotonic() < limite:
+            try:
+                resposta = cliente.post("/_dash-update-component", json=rota)
+                pronto = (
+                    resposta.status_code == 200
+                    and "conteudo_carregando" not in resposta.text
+                )
+            except httpx.HTTPError:
+                pronto = False
+            seguidas = seguidas + 1 if pronto else 0
+            if seguidas >= 4 * workers:
+                return
+            time.sleep(0.1 if pronto else 0.5)
+    raise RuntimeError("o app não ficou pronto a tempo")
+
+
+def subir_gunicorn(raiz, workers, threads, env):
+    porta = _porta_livre()
+    processo = subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn", "app:server",
+            "--workers", str(workers),
+            "--threads", str(threads),
+            "--bind", f"127.0.0.1:{porta}",
+            "--timeout", "120",
+            "--log-level", "warning",
+        ],
+        cwd=raiz,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{porta}"
+    try:
+        _esperar_pronto(base_url, workers)
+    except Exception:
+        processo.terminate()
+        processo.wait()
+        raise
+    return processo, base_url
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Teste de carga dos callbacks do painel sob gunicorn."
+    )
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--usuarios", type=int, default=10)
+    parser.add_argument("--duracao", type=float, default=30, help="segundos")
+    parser.add_argument(
+        "--pausa",
+        type=float,
+        default=1.0,
+        help="tempo médio entre ações de um usuário (s); 0 = sem pausa",
+    )
+    parser.add_argument("--proporcao-pdf", type=float, default=ACOES["pdf"])
+    parser.add_argument("--linhas", type=int, default=5000)
+    parser.add_argument(
+        "--latencia", type=float, default=0.0, help="latência das planilhas (s)"
+    )
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--raiz", default=RAIZ)
+    parser.add_argument("--json", metavar="ARQUIVO", help="grava o resumo em JSON")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, args.raiz)
+    from ferramentas import gerar_planilhas, servidor_planilhas
+
+    resultados = []
+    with tempfile.TemporaryDirectory() as diretorio:
+        linhas = {nome: args.linhas for nome in gerar_planilhas.GERADORES}
+        linhas["naturezas"] = gerar_planilhas.CARDINALIDADES["naturezas"]
+        gerar_planilhas.gerar_todas(
+            diretorio, linhas, [2023, 2024, 2025], args.semente
+        )
+        planilhas = servidor_planilhas.iniciar(
+            diretorio, semente=args.semente, latencia=args.latencia
+        )
+        env = {
+            **os.environ,
+            "PAINEL_SHEETS_BASE": planilhas.base_url,
+            "PAINEL_DOWNLOADS_DIR": os.path.join(diretorio, "downloads"),
+        }
+
+        for workers in args.workers:
+            for threads in args.threads:
+                print(
+                    f"== {workers} worker(s) x {threads} thread(s), "
+                    f"{args.usuarios} usuários, {args.duracao:.0f} s",
+                    file=sys.stderr,
+                )
+                processo, base_url = subir_gunicorn(args.raiz, workers, threads, env)
+                try:
+                    medicoes, tempo_total = asyncio.run(
+                        _rodada(
+                            base_url,
+                            args.usuarios,
+                            args.duracao,
+                            args.pausa,
+                            args.proporcao_pdf,
+                            args.semente,
+                        )
+                    )
+                finally:
+                    processo.terminate()
+                    processo.wait()
+                resumo = resumir(medicoes, tempo_total)
+                resultados.append({"workers": workers, "threads": threads, **resumo})
+                _imprimir(resultados[-1])
+
+        planilhas.shutdown()
+
+    print(f"\n{'workers':>7} {'threads':>7} {'req/s':>8} {'p95 (ms)':>9} {'erros':>6}")
+    for r in resultados:
+        print(
+            f"{r['workers']:>7} {r['threads']:>7} {r['vazao']:>8.1f} "
+            f"{_ms(r['geral']['p95']):>9} {r['erros']:>6}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(
+                {"parametros": vars(args), "resultados": resultados},
+                fh,
+                indent=2,
+                ensure_ascii=False,
+            )
+    return 0
+
+
+def _ms(valor):
+    return "-" if valor is None else f"{valor * 1000:.0f}"
+
+
+def _imprimir(resultado):
+    print(
+        f"\n{resultado['workers']} worker(s) x {resultado['threads']} thread(s): "
+        f"{resultado['vazao']:.1f} req/s, {resultado['requisicoes']} requisições, "
+        f"{resultado['erros']} erros"
+    )
+    print(
+        f"{'callback':<40} {'n':>5} {'erros':>5} "
+        f"{'p50':>7} {'p95':>7} {'p99':>7} (ms)"
+    )
+    for nome, m in resultado["callbacks"].items():
+        print(
+            f"{nome:<40} {m['n']:>5} {m['erros']:>5} {_ms(m['p50']):>7} "
+            f"{_ms(m['p95']):>7} {_ms(m['p99']):>7}"
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+# benchmarks/diferencas.py
+
+# Mede a diferença entre snapshots (dados.diferencas) e a atualização dos
+# cubos (dados.cubos) com ela.
+#
+# Uso:
+#   python benchmarks/diferencas.py
+#   python benchmarks/diferencas.py --linhas 1000000 --mudancas 10 1000
+#
+# Para cada planilha com cubo, gera o CSV (ferramentas.gerar_planilhas),
+# carrega o snapshot e monta um segundo com --mudancas linhas alteradas (um
+# terço removidas do último sexto, o ano corrente; um terço com valores
+# novos; um terço acrescentadas no fim). Mede a
+# mediana de --repeticoes execuções de: diferenca(), Cubo.aplicar() com a
+# diferença e Cubo.montar() do zero. Antes de medir, confere que o cubo
+# atualizado é igual ao montado do zero.
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LINHAS = [100_000, 1_000_000]
+MUDANCAS = [10, 1_000, 10_000]
+ANOS = list(range(2020, 2026))
+PLANILHAS = ["dotacao", "execucao_unifei", "execucao_ted"]
+
+
+def _mediana(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def _alterar(df, coluna, mudancas, semente):
+    # Como numa atualização: um terço de mudancas removidas do último sexto
+    # (o ano corrente, no fim do snapshot com dados.historico), um terço com
+    # coluna alterada e um terço acrescentadas no fim
+    import numpy as np
+    import pandas as pd
+
+    gerador = np.random.default_rng(semente)
+    terco = max(mudancas // 3, 1)
+    valor = df.columns.get_loc(coluna)
+    corrente = len(df) - len(df) // 6
+    removidas = corrente + gerador.choice(len(df) - corrente, terco, replace=False)
+    novo = df.drop(df.index[removidas])
+    novo.iloc[gerador.choice(len(novo), terco, replace=False), valor] += 1
+    inseridas = df.take(gerador.choice(len(df), terco, replace=False)).copy()
+    inseridas.iloc[:, valor] += 7
+    return pd.concat([novo, inseridas], ignore_index=True)
+
+
+def _ordenado(cubo):
+    return cubo.tabela.sort_values(cubo.dimensoes).reset_index(drop=True)
+
+
+def medir_planilha(nome, caminho, mudancas, repeticoes, semente):
+    import pandas as pd
+
+    from dados import cubos, diferencas, registro
+
+    antigo = registro.DATASETS[nome](caminho)
+    novo = _alterar(antigo, cubos.CUBOS[nome][1][-1], mudancas, semente)
+    cubo = cubos.Cubo.montar(antigo, *cubos.CUBOS[nome])
+
+    dif = diferencas.diferenca(nome, antigo, novo)
+    pd.testing.assert_frame_equal(
+        _ordenado(cubo.aplicar(antigo, novo, dif)),
+        _ordenado(cubos.Cubo.montar(novo, *cubos.CUBOS[nome])),
+        check_exact=True,
+    )
+    return {
+        "diferenca": _mediana(
+            lambda: diferencas.diferenca(nome, antigo, novo), repeticoes
+        ),
+        "aplicar": _mediana(lambda: cubo.aplicar(antigo, novo, dif), repeticoes),
+        "montar": _mediana(
+            lambda: cubos.Cubo.montar(novo, *cubos.CUBOS[nome]), repeticoes
+        ),
+        "mudadas": diferencas.tamanho(dif),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Mede a diferença entre snapshots e a atualização dos cubos."
+    )
+    parser.add_argument("--linhas", type=int, nargs="+", default=LINHAS)
+    parser.add_argument("--mudancas", type=int, nargs="+", default=MUDANCAS)
+    parser.add_argument("--planilhas", nargs="+", choices=PLANILHAS, default=PLANILHAS)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--raiz", default=RAIZ)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, args.raiz)
+    from ferramentas import gerar_planilhas
+
+    print(
+        f"{'caso':<36} {'mudadas':>8} {'diferença (ms)':>15} "
+        f"{'aplicar (ms)':>13} {'montar (ms)':>12}"
+    )
+    with tempfile.TemporaryDirectory() as diretorio:
+        for linhas in args.linhas:
+            for nome in args.planilhas:
+                caminho = gerar_planilhas.gerar_todas(
+                    os.path.join(diretorio, str(linhas)),
+                    linhas,
+                    ANOS,
+                    args.semente,
+                    nomes=[nome],
+                )[nome]
+                for mudancas in args.mudancas:
+                    tempos = medir_planilha(
+                        nome, caminho, mudancas, args.repeticoes, args.semente
+                    )
+                    print(
+                        f"{f'{linhas}/{nome}/{mudancas}':<36} "
+                        f"{tempos['mudadas']:>8} "
+                        f"{tempos['diferenca'] * 1000:>15.1f} "
+                        f"{tempos['aplicar'] * 1000:>13.1f} "
+                        f"{tempos['montar'] * 1000:>12.1f}",
+                        flush=True,
+                    )
+                os.remove(caminho)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+# benchmarks/historico.py
+
+# Mede o histórico particionado por ano (dados.historico).
+#
+# Uso:
+#   python benchmarks/historico.py
+#   python benchmarks/historico.py --linhas 1000000 --planilhas execucao_unifei
+#
+# Para cada tamanho e planilha, gera o CSV (ferramentas.gerar_planilhas) com
+# ANOS e mede a mediana de --repeticoes cargas em quatro situações: sem
+# histórico (a planilha inteira, como antes), a primeira carga com histórico
+# (que ainda congela os anos fechados), as seguintes sem mudança na
+# planilha (só o ano corrente é convertido, e volta o mesmo snapshot) e as
+# seguintes com o ano corrente mudado (uma linha a mais, alternando entre
+# dois CSVs; os anos fechados já juntos em memória só são concatenados com
+# ele). Antes de medir, confere que a carga com histórico devolve as mesmas
+# linhas que a carga inteira, também com a mudança.
+
+import argparse
+import itertools
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LINHAS = [100_000, 1_000_000]
+ANOS = list(range(2020, 2026))
+PLANILHAS = ["passagens", "pagamentos", "dotacao", "execucao_unifei", "execucao_ted"]
+
+
+def _mediana(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def _conferir(nome, cheio, com_historico):
+    # Mesmas linhas: os anos fechados vêm antes, em ordem de ano
+    import pandas as pd
+
+    from dados import historico
+
+    coluna = historico.COLUNA_ANO[nome]
+    anos = cheio[coluna].fillna(cheio[coluna].max())
+    esperado = cheio.iloc[anos.argsort(kind="stable")].reset_index(drop=True)
+    for c in esperado.columns:
+        if isinstance(esperado[c].dtype, pd.CategoricalDtype):
+            esperado[c] = esperado[c].cat.remove_unused_categories()
+    pd.testing.assert_frame_equal(com_historico, esperado, check_exact=True)
+
+
+def _com_linha_corrente(caminho, cheio, coluna):
+    # Cópia do CSV com uma linha do ano corrente repetida no fim
+    posicao = int((cheio[coluna] == cheio[coluna].max()).to_numpy().argmax())
+    with open(caminho, encoding="utf-8") as fh:
+        linhas = fh.read().rstrip("\n").split("\n")
+    mudado = f"{caminho}.mudado.csv"
+    with open(mudado, "w", encoding="utf-8") as fh:
+        fh.write("\n".join([*linhas, linhas[posicao + 1]]) + "\n")
+    return mudado
+
+
+def medir_planilha(nome, caminho, diretorio, repeticoes):
+    from dados import historico, registro
+
+    carregar = registro.DATASETS[nome]
+    historico.DIRETORIO = diretorio
+    com_historico = historico.carregador(
+        nome, caminho, carregar, registro.COLUNAS[nome]
+    )
+    cheio = carregar(caminho)  # também serve de aquecimento
+    tempos = {"cheio": _mediana(lambda: carregar(caminho), repeticoes)}
+
+    inicio = time.perf_counter()
+    df = com_historico(caminho)
+    tempos["primeira"] = time.perf_counter() - inicio
+    _conferir(nome, cheio, df)
+    tempos["seguintes"] = _mediana(lambda: com_historico(caminho), repeticoes)
+
+    mudado = _com_linha_corrente(caminho, cheio, historico.COLUNA_ANO[nome])
+    _conferir(nome, carregar(mudado), com_historico(mudado))
+    # A última carga foi a de mudado: cada carga daqui em diante muda
+    origens = itertools.cycle([caminho, mudado])
+    tempos["mudou"] = _mediana(lambda: com_historico(next(origens)), repeticoes)
+    os.remove(mudado)
+    return tempos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Mede a carga das planilhas com o histórico por ano."
+    )
+    parser.add_argument("--linhas", type=int, nargs="+", default=LINHAS)
+    parser.add_argument("--planilhas", nargs="+", choices=PLANILHAS, default=PLANILHAS)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--raiz", default=RAIZ)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, args.raiz)
+    from ferramentas import gerar_planilhas
+
+    print(
+        f"{'caso':<28} {'sem (ms)':>10} {'1ª (ms)':>10} {'seguintes (ms)':>15} "
+        f"{'razão':>7} {'mudou (ms)':>11} {'razão':>7}"
+    )
+    with tempfile.TemporaryDirectory() as diretorio:
+        for linhas in args.linhas:
+            for nome in args.planilhas:
+                caminho = gerar_planilhas.gerar_todas(
+                    os.path.join(diretorio, str(linhas)),
+                    linhas,
+                    ANOS,
+                    args.semente,
+                    nomes=[nome],
+                )[nome]
+                tempos = medir_planilha(
+                    nome,
+                    caminho,
+                    os.path.join(diretorio, "historico", str(linhas)),
+                    args.repeticoes,
+                )
+                os.remove(caminho)
+                print(
+                    f"{f'{linhas}/{nome}':<28} "
+                    f"{tempos['cheio'] * 1000:>10.1f} "
+                    f"{tempos['primeira'] * 1000:>10.1f} "
+                    f"{tempos['seguintes'] * 1000:>15.1f} "
+                    f"{tempos['cheio'] / tempos['seguintes']:>6.1f}x "
+                    f"{tempos['mudou'] * 1000:>11.1f} "
+                    f"{tempos['cheio'] / tempos['mudou']:>6.1f}x",
+                    flush=True,
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
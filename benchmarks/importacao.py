@@ -0,0 +1,122 @@
+# benchmarks/importacao.py
+
+# Tempo de importação do app (equivalente a python -X importtime).
+#
+# Uso:
+#   python benchmarks/importacao.py --snapshots /tmp/snapshots --repeticoes 5
+#
+# Cada repetição roda "import app" num processo novo, como no boot de um
+# worker do gunicorn, e mede o tempo total da importação (inclui o registro
+# das páginas pelo Dash) e o tempo acumulado de cada pacote reportado pelo
+# -X importtime. Com --snapshots as planilhas são restauradas do disco antes
+# da importação, para o resultado não depender da rede.
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Dependências que só devem ser carregadas quando usadas
+PESADOS = ["reportlab", "plotly.express", "pyarrow", "xlsxwriter", "pypdf"]
+
+_PRELUDIO = """
+import json, sys, time
+sys.path.insert(0, {raiz!r})
+if {snapshots!r}:
+    from dados import registro
+    registro.restaurar_snapshots({snapshots!r})
+inicio = time.perf_counter()
+import app
+fim = time.perf_counter()
+print(json.dumps({{
+    "total": fim - inicio,
+    "carregados": [m for m in {pesados!r} if m in sys.modules],
+}}))
+"""
+
+
+def _ler_importtime(saida_erro):
+    # "import time: self [us] | cumulative | imported package"
+    # Guarda o acumulado de cada pacote (sem submódulos, exceto os de
+    # PESADOS), qualquer que seja o nível em que foi importado pela 1ª vez.
+    pacotes = {}
+    for linha in saida_erro.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _, acumulado, nome = linha[len("import time:"):].split("|")
+        nome = nome.strip()
+        if "." in nome and nome not in PESADOS:
+            continue
+        pacotes[nome] = int(acumulado) / 1e6
+    return pacotes
+
+
+def medir(raiz=RAIZ, snapshots=None):
+    codigo = _PRELUDIO.format(raiz=raiz, snapshots=snapshots, pesados=PESADOS)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=raiz,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    resultado = json.loads(proc.stdout.strip().splitlines()[-1])
+    resultado["pacotes"] = _ler_importtime(proc.stderr)
+    return resultado
+
+
+def relatorio(medicoes, top=15):
+    totais = [m["total"] for m in medicoes]
+    pacotes = {}
+    for m in medicoes:
+        for nome, tempo in m["pacotes"].items():
+            pacotes.setdefault(nome, []).append(tempo)
+    medianas = sorted(
+        ((statistics.median(t), nome) for nome, t in pacotes.items()),
+        reverse=True,
+    )
+
+    linhas = [
+        f"import app: mediana {statistics.median(totais) * 1000:.0f} ms "
+        f"(mín {min(totais) * 1000:.0f} ms, {len(totais)} repetições)",
+        "",
+        "Dependências pesadas carregadas no import: "
+        + (", ".join(medicoes[-1]["carregados"]) or "nenhuma"),
+        "",
+        f"{'pacote':<32}{'acumulado (ms)':>16}",
+    ]
+    for tempo, nome in medianas[:top]:
+        linhas.append(f"{nome:<32}{tempo * 1000:>16.1f}")
+    return "\n".join(linhas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Mede o tempo de importação do app."
+    )
+    parser.add_argument(
+        "--snapshots",
+        help="diretório de snapshots restaurado antes do import (sem rede)",
+    )
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument(
+        "--raiz",
+        default=RAIZ,
+        help="raiz do repositório a medir (padrão: este checkout)",
+    )
+    args = parser.parse_args(argv)
+
+    medicoes = [
+        medir(args.raiz, args.snapshots) for _ in range(args.repeticoes)
+    ]
+    print(relatorio(medicoes, args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
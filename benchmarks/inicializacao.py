@@ -0,0 +1,114 @@
+# benchmarks/inicializacao.py
+
+# Tempo de inicialização do app com a rede indisponível.
+#
+# Uso:
+#   python benchmarks/inicializacao.py --repeticoes 5 --limite 1.0
+#
+# Cada repetição sobe o app num processo novo com os proxies HTTP(S)
+# apontando para uma porta fechada, de modo que qualquer download das
+# planilhas falhe. Mede o "import app" e o tempo até o servidor responder
+# "/" e "/_dash-layout", e confere que as páginas com dados devolvem o aviso
+# de "carregando" em vez de travar. Sai com código 1 se a mediana passar do
+# limite.
+#
+# O Dash importa o IPython quando ele está instalado (integração com
+# Jupyter, ~0,4 s). Como ele não faz parte do requirements.txt, o import é
+# bloqueado no processo medido, salvo com --manter-ipython.
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SEM_REDE = "http://127.0.0.1:9"
+
+_CODIGO = """
+import json, sys, time
+if {bloquear_ipython!r}:
+    sys.modules["IPython"] = None
+inicio = time.perf_counter()
+sys.path.insert(0, {raiz!r})
+import app
+import dash
+importado = time.perf_counter()
+cliente = app.server.test_client()
+status = [cliente.get(p).status_code for p in ("/", "/_dash-layout")]
+respondendo = time.perf_counter()
+carregando = sorted(
+    nome
+    for nome, pagina in dash.page_registry.items()
+    if callable(pagina["layout"])
+    and getattr(pagina["layout"](), "id", None) == "conteudo_carregando"
+)
+print(json.dumps({{
+    "importacao": importado - inicio,
+    "primeira_resposta": respondendo - inicio,
+    "status": status,
+    "carregando": carregando,
+}}))
+"""
+
+
+def medir(raiz=RAIZ, manter_ipython=False):
+    env = dict(os.environ)
+    for var in ("http_proxy", "https_proxy", "HTTP_PROXY", "HTTPS_PROXY"):
+        env[var] = SEM_REDE
+    env.pop("no_proxy", None)
+    env.pop("NO_PROXY", None)
+
+    codigo = _CODIGO.format(raiz=raiz, bloquear_ipython=not manter_ipython)
+    proc = subprocess.run(
+        [sys.executable, "-c", codigo],
+        cwd=raiz,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Mede a inicialização do app sem acesso à rede."
+    )
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument(
+        "--limite",
+        type=float,
+        default=1.0,
+        help="tempo máximo aceito para a primeira resposta, em segundos",
+    )
+    parser.add_argument("--raiz", default=RAIZ)
+    parser.add_argument(
+        "--manter-ipython",
+        action="store_true",
+        help="não bloqueia o import do IPython pelo Dash",
+    )
+    args = parser.parse_args(argv)
+
+    medicoes = [
+        medir(args.raiz, args.manter_ipython) for _ in range(args.repeticoes)
+    ]
+    importacao = statistics.median(m["importacao"] for m in medicoes)
+    resposta = statistics.median(m["primeira_resposta"] for m in medicoes)
+    ultima = medicoes[-1]
+
+    print(f"import app:        mediana {importacao * 1000:.0f} ms")
+    print(f"primeira resposta: mediana {resposta * 1000:.0f} ms")
+    print(f"status de / e /_dash-layout: {ultima['status']}")
+    print("páginas em 'carregando': " + ", ".join(ultima["carregando"]))
+
+    if resposta > args.limite:
+        print(f"ACIMA DO LIMITE de {args.limite:.1f} s", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+# benchmarks/leitores.py
+
+# Compara os leitores das planilhas (dados.planilhas.leitor): pandas (com o
+# pyarrow.csv e os esquemas de dados.esquemas) e Polars.
+#
+# Uso:
+#   python benchmarks/leitores.py
+#   python benchmarks/leitores.py --linhas 1000000 --planilhas pagamentos
+#
+# Para cada tamanho e planilha, gera o CSV (ferramentas.gerar_planilhas) e
+# mede a mediana de --repeticoes cargas completas em cada leitor (leitura do
+# arquivo, tipos do esquema, conversão de moeda, datas e meses) e a memória
+# do snapshot resultante (memory_usage com deep=True). Antes de medir,
+# confere que os dois leitores devolvem o mesmo DataFrame
+# (pd.testing.assert_frame_equal, com check_exact).
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LINHAS = [100_000, 1_000_000]
+ANOS = list(range(2020, 2026))
+LEITORES = ("pandas", "polars")
+PLANILHAS = ["passagens", "pagamentos", "dotacao", "execucao_unifei", "execucao_ted"]
+
+
+def _mediana(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def medir_planilha(nome, caminho, repeticoes):
+    import pandas as pd
+
+    from dados import registro
+
+    carregar = registro.DATASETS[nome]
+    variavel = f"PAINEL_LEITOR_{nome.upper()}"
+    tempos, resultados = {}, {}
+    try:
+        for leitor in LEITORES:
+            os.environ[variavel] = leitor
+            resultados[leitor] = carregar(caminho)  # também serve de aquecimento
+            tempos[leitor] = _mediana(lambda: carregar(caminho), repeticoes)
+    finally:
+        os.environ.pop(variavel, None)
+    pd.testing.assert_frame_equal(
+        resultados["pandas"], resultados["polars"], check_exact=True
+    )
+    return tempos, int(resultados["pandas"].memory_usage(deep=True).sum())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compara os leitores pandas e Polars das planilhas."
+    )
+    parser.add_argument("--linhas", type=int, nargs="+", default=LINHAS)
+    parser.add_argument("--planilhas", nargs="+", choices=PLANILHAS, default=PLANILHAS)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--raiz", default=RAIZ)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, args.raiz)
+    from ferramentas import gerar_planilhas
+
+    print(
+        f"{'caso':<28} {'pandas (ms)':>12} {'polars (ms)':>12} {'razão':>7} "
+        f"{'memória (MB)':>13}"
+    )
+    with tempfile.TemporaryDirectory() as diretorio:
+        for linhas in args.linhas:
+            for nome in args.planilhas:
+                caminho = gerar_planilhas.gerar_todas(
+                    os.path.join(diretorio, str(linhas)),
+                    linhas,
+                    ANOS,
+                    args.semente,
+                    nomes=[nome],
+                )[nome]
+                tempos, memoria = medir_planilha(nome, caminho, args.repeticoes)
+                os.remove(caminho)
+                print(
+                    f"{f'{linhas}/{nome}':<28} "
+                    f"{tempos['pandas'] * 1000:>12.1f} {tempos['polars'] * 1000:>12.1f} "
+                    f"{tempos['pandas'] / tempos['polars']:>6.1f}x "
+                    f"{memoria / 1e6:>13.1f}",
+                    flush=True,
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+# benchmarks/motores.py
+
+# Compara os motores de consulta (dados.motores) nos painéis de dotação e
+# execução, com planilhas sintéticas grandes.
+#
+# Uso:
+#   python benchmarks/motores.py
+#   python benchmarks/motores.py --linhas 1000000 --planilhas execucao_ted
+#
+# Para cada tamanho e planilha, gera a planilha (ferramentas.gerar_planilhas),
+# carrega pela função de dados.registro e mede, em cada motor, a mediana de
+# --repeticoes execuções de:
+#   filtro:    linhas() (o DataFrame filtrado que vira a tabela da página);
+#   agregados: os totais dos cards e as somas por grupo dos gráficos, sem
+#              materializar as linhas;
+#   painel:    filtro + agregados, como no callback principal da página
+#              (sem a formatação da tabela, que não depende do motor).
+# Os filtros vão de nenhum (planilha inteira) ao ano mais recente com os
+# valores mais frequentes de outras colunas. O preparo do DuckDB e do Polars
+# (conversão do snapshot, uma vez por versão) é medido à parte. A razão é o
+# tempo do pandas dividido pelo do motor (acima de 1x, o motor é mais rápido).
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LINHAS = [100_000, 1_000_000]
+ANOS = list(range(2020, 2026))
+MOTORES = ("pandas", "duckdb", "polars")
+
+# planilha -> (consultar_*, colunas dos totais, [(grupo, coluna)] dos gráficos,
+#              [(cenário, {filtro: coluna de onde tirar o valor})])
+PLANILHAS = {
+    "dotacao": (
+        "consultar_dotacao",
+        ["DOTACAO ATUALIZADA", "DESTAQUE RECEBIDO"],
+        [
+            ("GRUPO DA DESPESA", "DOTACAO ATUALIZADA"),
+            ("GRUPO DA DESPESA", "DESTAQUE RECEBIDO"),
+            ("Fonte Recursos Detalhada", "DOTACAO ATUALIZADA"),
+            ("Fonte Recursos Detalhada", "DESTAQUE RECEBIDO"),
+        ],
+        [
+            ("todos", {}),
+            ("ano", {"ano": "ANO"}),
+            ("ano+grupo+unidade", {
+                "ano": "ANO",
+                "grupo": "GRUPO DA DESPESA",
+                "unidade": "UNIDADE ORÇAMENTÁRIA",
+            }),
+        ],
+    ),
+    "execucao_unifei": (
+        "consultar_execucao_unifei",
+        [
+            "DESPESAS INSCRITAS EM RP NAO PROCESSADOS",
+            "DESPESAS EMPENHADAS (CONTROLE EMPENHO)",
+            "DESPESAS LIQUIDADAS (CONTROLE EMPENHO)",
+            "DESPESAS LIQUIDADAS A PAGAR(CONTROLE EMPENHO)",
+            "DESPESAS PAGAS (CONTROLE EMPENHO)",
+        ],
+        [("GRUPO DESP", "DESPESAS EMPENHADAS (CONTROLE EMPENHO)")],
+        [
+            ("todos", {}),
+            ("ano", {"ano": "Ano"}),
+            ("ano+mes+ug", {"ano": "Ano", "mes": "Mês", "ug_exec": "UG Executora"}),
+        ],
+    ),
+    "execucao_ted": (
+        "consultar_execucao_ted",
+        [
+            "DESPESAS INSCRITAS EM RP NAO PROCESSADOS",
+            "DESPESAS EMPENHADAS (CONTROLE EMPENHO)",
+            "DESPESAS LIQUIDADAS (CONTROLE EMPENHO)",
+            "DESPESAS LIQUIDADAS A PAGAR(CONTROLE EMPENHO)",
+            "DESPESAS PAGAS (CONTROLE EMPENHO)",
+        ],
+        [("GRUPO DESP", "DESPESAS EMPENHADAS (CONTROLE EMPENHO)")],
+        [
+            ("todos", {}),
+            ("ano", {"ano": "Ano"}),
+            ("ano+mes+uo", {"ano": "Ano", "mes": "Mês", "uo": "Unidade Orçamentária"}),
+        ],
+    ),
+}
+
+
+def _mediana(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def _valores(df, colunas):
+    # Ano mais recente; nas demais colunas, o valor mais frequente
+    return {
+        filtro: int(df[coluna].max()) if coluna in ("ANO", "Ano")
+        else df[coluna].mode().iloc[0]
+        for filtro, coluna in colunas.items()
+    }
+
+
+def medir_planilha(nome, df, repeticoes):
+    from dados import consultas, motores
+
+    consultar_nome, totais, grupos, cenarios = PLANILHAS[nome]
+    consultar = getattr(consultas, consultar_nome)
+
+    def filtro(filtros):
+        consultar(df, **filtros).linhas()
+
+    def agregados(filtros):
+        consulta = consultar(df, **filtros)
+        consulta.somar(totais)
+        for grupo, coluna in grupos:
+            consulta.somar_por(grupo, coluna)
+
+    def painel(filtros):
+        consulta = consultar(df, **filtros)
+        consulta.linhas()
+        consulta.somar(totais)
+        for grupo, coluna in grupos:
+            consulta.somar_por(grupo, coluna)
+
+    variavel = f"PAINEL_MOTOR_{nome.upper()}"
+    resultados = {}
+    try:
+        resultados[f"{nome}.preparo"] = {}
+        for motor in MOTORES[1:]:
+            os.environ[variavel] = motor
+            motores._tabelas.pop(nome, None)
+            motores._quadros.pop(nome, None)
+            inicio = time.perf_counter()
+            consultar(df).somar(totais[:1])
+            resultados[f"{nome}.preparo"][motor] = time.perf_counter() - inicio
+
+        for cenario, colunas in cenarios:
+            filtros = _valores(df, colunas)
+            for operacao in (filtro, agregados, painel):
+                caso = f"{nome}.{cenario}.{operacao.__name__}"
+                resultados[caso] = {}
+                for motor in MOTORES:
+                    os.environ[variavel] = motor
+                    operacao(filtros)  # aquecimento
+                    resultados[caso][motor] = _mediana(
+                        lambda: operacao(filtros), repeticoes
+                    )
+    finally:
+        os.environ.pop(variavel, None)
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compara os motores pandas, DuckDB e Polars nas consultas dos painéis."
+    )
+    parser.add_argument("--linhas", type=int, nargs="+", default=LINHAS)
+    parser.add_argument(
+        "--planilhas", nargs="+", choices=list(PLANILHAS), default=list(PLANILHAS)
+    )
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--raiz", default=RAIZ)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, args.raiz)
+    from dados import registro
+    from ferramentas import gerar_planilhas
+
+    print(
+        f"{'caso':<52} "
+        + " ".join(f"{f'{m} (ms)':>12}" for m in MOTORES)
+        + "".join(f" {f'razão {m}':>13}" for m in MOTORES[1:])
+    )
+    with tempfile.TemporaryDirectory() as diretorio:
+        for linhas in args.linhas:
+            for nome in args.planilhas:
+                caminho = gerar_planilhas.gerar_todas(
+                    os.path.join(diretorio, str(linhas)),
+                    linhas,
+                    ANOS,
+                    args.semente,
+                    nomes=[nome],
+                )[nome]
+                df = registro.DATASETS[nome](caminho)
+                os.remove(caminho)
+                for caso, tempos in medir_planilha(nome, df, args.repeticoes).items():
+                    pandas_s = tempos.get("pandas")
+                    colunas = [
+                        "" if m not in tempos else f"{tempos[m] * 1000:.1f}"
+                        for m in MOTORES
+                    ] + [
+                        f"{pandas_s / tempos[m]:.1f}x" if pandas_s else ""
+                        for m in MOTORES[1:]
+                    ]
+                    print(
+                        f"{f'{linhas}/{caso}':<52} "
+                        + " ".join(f"{c:>12}" for c in colunas[: len(MOTORES)])
+                        + "".join(f" {c:>13}" for c in colunas[len(MOTORES):]),
+                        flush=True,
+                    )
+                del df
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,3 @@
+# componentes/__init__.py
+
+# Componentes Dash compartilhados entre as páginas.
@@ -0,0 +1,65 @@
+# componentes/carregando.py
+
+# Aviso exibido no lugar da página enquanto as planilhas dela carregam.
+#
+# As páginas chamam layout_carregando(__name__, [DATASET]) quando o
+# snapshot ainda não está pronto. O aviso consulta o registro a cada
+# INTERVALO e, quando todas as planilhas estão prontas, é substituído pelo
+# layout da própria página (sem recarregar o navegador).
+
+import dash
+from dash import html, dcc, Input, Output, State
+
+from dados import registro
+
+INTERVALO = 2000  # ms
+
+MENSAGENS = {
+    "carregando": "carregando…",
+    "erro": "falha ao carregar, tentando novamente…",
+    None: "aguardando…",
+    "pronto": "pronto",
+}
+
+
+def _aviso(pagina, datasets):
+    return [
+        html.Div(
+            style={"textAlign": "center", "marginTop": "40px"},
+            children=[
+                html.H3("Carregando dados…"),
+                html.Ul(
+                    [
+                        html.Li(f"{nome}: {MENSAGENS[registro.estado(nome)]}")
+                        for nome in datasets
+                    ],
+                    style={"listStyle": "none", "padding": 0},
+                ),
+            ],
+        ),
+        dcc.Interval(id="intervalo_carregando", interval=INTERVALO),
+        dcc.Store(
+            id="pagina_carregando",
+            data={"pagina": pagina, "datasets": datasets},
+        ),
+    ]
+
+
+def layout_carregando(pagina, datasets):
+    return html.Div(id="conteudo_carregando", children=_aviso(pagina, datasets))
+
+
+@dash.callback(
+    Output("conteudo_carregando", "children"),
+    Input("intervalo_carregando", "n_intervals"),
+    State("pagina_carregando", "data"),
+    prevent_initial_call=True,
+)
+def verificar_carga(n, dados):
+    pagina, datasets = dados["pagina"], dados["datasets"]
+    if not all(registro.pronto(nome) for nome in datasets):
+        # Refaz a tentativa das planilhas que falharam e atualiza o aviso
+        registro.carregar_em_segundo_plano(datasets)
+        return _aviso(pagina, datasets)
+
+    return dash.page_registry[pagina]["layout"]()
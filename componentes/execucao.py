@@ -0,0 +1,336 @@
+# componentes/execucao.py
+
+# Layout e callbacks das páginas de Execução do Orçamento (UNIFEI e TED).
+#
+# As duas páginas são o mesmo painel sobre planilhas diferentes: cada uma
+# só declara o dataset, o título, o sufixo dos ids e os filtros, em linhas
+# de (parâmetro, id do dropdown, rótulo). As colunas de cada filtro e da
+# tabela vêm de dados.execucao.PLANILHAS, e a consulta passa pelo motor
+# comum (dados.execucao), com os mesmos cubos e motores nas duas páginas.
+# Os callbacks continuam nas páginas (os ids são delas) e chamam estas
+# funções.
+
+import datetime as dt
+
+import pandas as pd
+from dash import html, dcc, dash_table
+
+from componentes.idade_dados import indicador_idade
+from dados import consultas, execucao, registro
+from dados.moeda import fmt_centavos, reais
+from dados.planilhas import COLUNAS_EXECUCAO
+
+dropdown_style = {
+    "color": "black",
+    "marginBottom": "10px",
+    "whiteSpace": "normal",
+}
+
+# Rótulos dos valores nos cards e na tabela, na ordem de COLUNAS_EXECUCAO
+ROTULOS_VALORES = [
+    "RP Não Processados",
+    "Empenhadas",
+    "Liquidadas",
+    "Liquidadas a Pagar",
+    "Pagas",
+]
+
+_ESTILOS = {
+    "Ano": {"minWidth": "120px", "flex": "0 0 150px"},
+    "Mês": {"minWidth": "150px", "flex": "0 0 180px"},
+}
+_ESTILO_PADRAO = {"minWidth": "220px", "flex": "1"}
+_PLACEHOLDERS = {"Mês": "Todos", "GRUPO DESP": "Todos"}
+
+
+# --------------------------------------------------
+# Layout
+# --------------------------------------------------
+def _dropdown(df_base, coluna, id_, rotulo, ano_padrao):
+    if coluna == "Ano":
+        dropdown = dcc.Dropdown(
+            id=id_,
+            options=[
+                {"label": int(a), "value": int(a)}
+                for a in sorted(df_base[coluna].dropna().unique())
+            ],
+            value=ano_padrao,
+            clearable=False,
+            style=dropdown_style,
+        )
+    else:
+        dropdown = dcc.Dropdown(
+            id=id_,
+            options=[
+                {"label": v, "value": v}
+                for v in sorted(df_base[coluna].dropna().unique())
+            ],
+            value=None,
+            placeholder=_PLACEHOLDERS.get(coluna, "Todas"),
+            clearable=True,
+            style=dropdown_style,
+        )
+    return html.Div(
+        style=_ESTILOS.get(coluna, _ESTILO_PADRAO),
+        children=[html.Label(rotulo), dropdown],
+    )
+
+
+def montar_layout(dataset, titulo, sufixo, filtros):
+    """Layout do painel; filtros são duas linhas de (parâmetro, id, rótulo)."""
+    df_base = registro.obter(dataset)
+    ano_padrao = consultas.ano_mais_recente(df_base["Ano"])
+    planilha = execucao.PLANILHAS[dataset]
+
+    linhas = [
+        [
+            _dropdown(df_base, planilha.filtros[p], id_, rotulo, ano_padrao)
+            for p, id_, rotulo in linha
+        ]
+        for linha in filtros
+    ]
+    # Na tabela, as colunas que também são filtro levam o rótulo do filtro
+    rotulos = {
+        planilha.filtros[p]: rotulo for linha in filtros for p, _, rotulo in linha
+    }
+
+    return html.Div(
+        children=[
+            html.H2(titulo, style={"textAlign": "center"}),
+            indicador_idade([dataset]),
+            html.Div(
+                style={"marginBottom": "20px"},
+                children=[
+                    html.H3("Filtros", className="sidebar-title"),
+                    html.Div(
+                        style={
+                            "display": "flex",
+                            "flexWrap": "wrap",
+                            "gap": "10px",
+                            "marginBottom": "8px",
+                        },
+                        children=linhas[0],
+                    ),
+                    # 2ª linha: filtros + botões
+                    html.Div(
+                        style={
+                            "display": "flex",
+                            "flexWrap": "wrap",
+                            "gap": "10px",
+                            "alignItems": "flex-end",
+                        },
+                        children=[
+                            *linhas[1],
+                            html.Div(
+                                style={
+                                    "display": "flex",
+                                    "gap": "10px",
+                                    "marginTop": "24px",
+                                },
+                                children=[
+                                    html.Button(
+                                        "Limpar filtros",
+                                        id=f"btn_limpar_filtros_{sufixo}",
+                                        n_clicks=0,
+                                        className="filtros-button",
+                                    ),
+                                    html.Button(
+                                        "Baixar Relatório PDF",
+                                        id=f"btn_download_relatorio_{sufixo}",
+                                        n_clicks=0,
+                                        className="filtros-button",
+                                    ),
+                                    dcc.Location(
+                                        id=f"download_relatorio_{sufixo}",
+                                        refresh=True,
+                                    ),
+                                    html.Div(
+                                        id=f"links_exportacao_{sufixo}",
+                                        style={"marginTop": "6px", "fontSize": "13px"},
+                                    ),
+                                ],
+                            ),
+                        ],
+                    ),
+                ],
+            ),
+            html.Div(
+                id=f"cards_container_{sufixo}",
+                className="cards-container",
+            ),
+            html.Div(
+                className="charts-row",
+                children=[
+                    dcc.Graph(
+                        id=f"grafico_barras_grupo_{sufixo}", style={"width": "50%"}
+                    ),
+                    dcc.Graph(
+                        id=f"grafico_pizza_status_{sufixo}", style={"width": "50%"}
+                    ),
+                ],
+            ),
+            html.H4("Detalhamento"),
+            dash_table.DataTable(
+                id=f"tabela_execucao_{sufixo}",
+                columns=[
+                    {"name": rotulos.get(c, c), "id": c} for c in planilha.tabela
+                ]
+                + [
+                    {"name": rotulo, "id": c}
+                    for rotulo, c in zip(ROTULOS_VALORES, COLUNAS_EXECUCAO)
+                ],
+                data=[],
+                style_table={"overflowX": "auto"},
+                style_cell={
+                    "textAlign": "center",
+                    "padding": "6px",
+                    "fontSize": "12px",
+                    "whiteSpace": "normal",
+                    "height": "auto",
+                    "maxWidth": "220px",
+                },
+                style_header={
+                    "fontWeight": "bold",
+                    "backgroundColor": "#0b2b57",
+                    "color": "white",
+                },
+            ),
+            dcc.Store(id=f"store_pdf_{sufixo}"),
+        ],
+    )
+
+
+# --------------------------------------------------
+# Callback principal
+# --------------------------------------------------
+def _card(titulo, valor):
+    return html.Div(
+        className="card",
+        children=[
+            html.Div(titulo, className="card-title"),
+            html.Div(fmt_centavos(valor), className="card-value"),
+        ],
+    )
+
+
+def _grafico_barras(consulta, dff):
+    import plotly.express as px
+
+    empenhadas = "DESPESAS EMPENHADAS (CONTROLE EMPENHO)"
+    if dff.empty:
+        fig_barras = px.bar(title="Sem dados para os filtros selecionados")
+        fig_barras.update_layout(title_x=0.5, title_y=0.9)
+        return fig_barras
+
+    grp_grupo = consulta.somar_por("GRUPO DESP", empenhadas).sort_values(
+        empenhadas, ascending=False
+    )
+    valores = grp_grupo[empenhadas].values
+    limiar = 0.2 * valores.max() if valores.size > 0 else 0
+    textpositions = ["inside" if v >= limiar else "outside" for v in valores]
+    grp_grupo[empenhadas] = reais(valores)
+
+    fig_barras = px.bar(
+        grp_grupo,
+        x="GRUPO DESP",
+        y=empenhadas,
+        title="Despesas Empenhadas por Grupo de Despesa",
+    )
+    fig_barras.update_traces(
+        marker_color="#003A70",
+        text=[fmt_centavos(v) for v in valores],
+        textposition=textpositions,
+        insidetextanchor="middle",
+        hovertemplate="Grupo=%{x}<br>Empenhadas=R$ %{y:,.2f}",
+        cliponaxis=False,
+    )
+    fig_barras.update_layout(
+        xaxis_title="Grupo de Despesa",
+        yaxis_title="Empenhadas (R$)",
+        yaxis_tickprefix="R$ ",
+        yaxis_tickformat=",.2f",
+        title_x=0.5,
+        title_y=0.9,
+        uniformtext_minsize=10,
+        uniformtext_mode="hide",
+    )
+    return fig_barras
+
+
+def _grafico_pizza(tot):
+    import plotly.express as px
+
+    if tot["emp"] + tot["liq"] + tot["pagas"] <= 0:
+        fig_pizza = px.pie(title="Sem valores para Empenhadas, Liquidadas e Pagas")
+        fig_pizza.update_layout(title_x=0.5, title_y=0.9)
+        return fig_pizza
+
+    df_pizza = pd.DataFrame(
+        {
+            "Status": ["Empenhadas", "Liquidadas", "Pagas"],
+            "Valor": [reais(tot["emp"]), reais(tot["liq"]), reais(tot["pagas"])],
+        }
+    )
+    fig_pizza = px.pie(
+        df_pizza,
+        names="Status",
+        values="Valor",
+        title="Distribuição: Empenhadas x Liquidadas x Pagas",
+        color="Status",
+        color_discrete_map={
+            "Empenhadas": "#003A70",
+            "Liquidadas": "#DA291C",
+            "Pagas": "#A2AAAD",
+        },
+    )
+    fig_pizza.update_traces(
+        texttemplate="%{label}<br>R$ %{value:,.2f}",
+        hovertemplate="%{label}<br>R$ %{value:,.2f}",
+    )
+    fig_pizza.update_layout(
+        legend_title="Status",
+        legend_orientation="h",
+        legend_y=-0.1,
+        legend_x=0.5,
+        legend_xanchor="center",
+        title_x=0.5,
+        title_y=0.9,
+    )
+    return fig_pizza
+
+
+def atualizar_painel(dataset, filtros, n_intervals):
+    """Tabela, cards, gráficos e dados do PDF para os filtros da página."""
+    # Atualiza o snapshot somente em horário permitido (exemplo: 08h–18h)
+    hora = dt.datetime.now().hour
+    if 8 <= hora < 18:
+        if n_intervals is not None:
+            registro.revalidar(dataset)
+
+    consulta = execucao.consultar(dataset, registro.obter(dataset), **filtros)
+    dff = consulta.linhas()
+    dados_pdf = execucao.relatorio(dataset, consulta, filtros)
+
+    tot = dados_pdf["totais"]
+    cards = [
+        _card(rotulo, tot[chave])
+        for rotulo, chave in zip(
+            ROTULOS_VALORES, ["rp", "emp", "liq", "liq_pagar", "pagas"]
+        )
+    ]
+    fig_barras = _grafico_barras(consulta, dff)
+    fig_pizza = _grafico_pizza(tot)
+
+    return dados_pdf["tabela"], cards, fig_barras, fig_pizza, dados_pdf
+
+
+# --------------------------------------------------
+# Limpar filtros
+# --------------------------------------------------
+def filtros_limpos(dataset):
+    """Valores dos filtros, na ordem da página, depois de limpar."""
+    ano_padrao = consultas.ano_mais_recente(registro.obter(dataset)["Ano"])
+    return tuple(
+        ano_padrao if coluna == "Ano" else None
+        for coluna in execucao.PLANILHAS[dataset].filtros.values()
+    )
@@ -0,0 +1,55 @@
+# componentes/idade_dados.py
+
+# Indicador de quando os dados exibidos na página foram atualizados.
+#
+# Mostra a idade do snapshot em uso e avisa quando a última tentativa de
+# atualização falhou (a página continua com o snapshot anterior). O texto é
+# refeito no servidor a cada INTERVALO, porque o layout da página fica em
+# cache enquanto a planilha não muda.
+
+import dash
+from dash import html, dcc, Input, Output, State
+
+from dados import registro
+
+INTERVALO = 60 * 1000  # ms
+
+
+def descrever_idade(segundos):
+    minutos = int(segundos // 60)
+    if minutos < 1:
+        return "agora há pouco"
+    if minutos < 60:
+        return f"há {minutos} min"
+    horas = minutos // 60
+    if horas < 24:
+        return f"há {horas} h"
+    return f"há {horas // 24} dia(s)"
+
+
+def indicador_idade(datasets):
+    return html.Div(
+        style={"textAlign": "center", "fontSize": "12px", "color": "#555"},
+        children=[
+            html.Span(id="texto_idade_dados"),
+            dcc.Interval(id="intervalo_idade_dados", interval=INTERVALO),
+            dcc.Store(id="datasets_idade_dados", data=datasets),
+        ],
+    )
+
+
+@dash.callback(
+    Output("texto_idade_dados", "children"),
+    Input("intervalo_idade_dados", "n_intervals"),
+    State("datasets_idade_dados", "data"),
+)
+def atualizar_idade(n, datasets):
+    idades = [registro.idade(nome) for nome in datasets]
+    idades = [i for i in idades if i is not None]
+    if not idades:
+        return ""
+
+    texto = f"Dados atualizados {descrever_idade(max(idades))}"
+    if any(registro.ultimo_erro(nome) is not None for nome in datasets):
+        texto += " (a última atualização falhou; exibindo os dados anteriores)"
+    return texto
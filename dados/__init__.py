@@ -0,0 +1,5 @@
+# dados/__init__.py
+
+# Camada de dados compartilhada pelas páginas, relatórios e scripts de linha
+# de comando. Nada aqui depende do Dash: os módulos podem ser importados em
+# processos de trabalho sem registrar páginas.
@@ -0,0 +1,324 @@
+# dados/consultas.py
+
+# Filtros e resumos de cada painel.
+#
+# As funções recebem o DataFrame do snapshot e os filtros selecionados e
+# devolvem estruturas prontas para a tela (tabelas formatadas e totais) e
+# para o relatório em PDF. Os nomes dos parâmetros de filtro são os mesmos
+# das chaves de "filtros" gravadas nos dados do PDF.
+#
+# Dotação e execução passam pelos motores de consulta (dados.motores): as
+# funções consultar_* devolvem a consulta filtrada, e os relatórios dessas
+# planilhas aceitam tanto a consulta quanto o DataFrame já filtrado. As de
+# execução delegam ao motor comum da UNIFEI e do TED (dados.execucao).
+#
+# Totais e cards são centavos inteiros (ver dados.moeda); as tabelas já vêm
+# formatadas em reais.
+
+import inspect
+
+from dados import execucao, motores
+from dados.moeda import fmt_centavos
+from monitoramento.etapas import etapa
+
+
+def filtros_vazios(filtrar):
+    """Dicionário com todos os filtros aceitos por filtrar, sem valor."""
+    parametros = list(inspect.signature(filtrar).parameters)[1:]
+    return dict.fromkeys(parametros)
+
+
+def ano_mais_recente(serie):
+    """Maior ano da coluna; é o ano selecionado por padrão nos filtros."""
+    return int(serie.dropna().max())
+
+
+# --------------------------------------------------
+# Passagens DCF
+# --------------------------------------------------
+COLUNAS_RESUMO_PASSAGENS = [
+    "Valor das Diárias",
+    "Valor da Passagem",
+    "Valor Restituição",
+    "Valor Seguro Viagem",
+]
+
+COLUNAS_DETALHE_PASSAGENS = [
+    "Unidade (Viagem)",
+    "Número da PCDP",
+    "Data Início da Viagem",
+    "Custo com emissão de passagens dentro do prazo",
+    "Custo com emissão de passagens em caráter de urgência",
+]
+
+
+@etapa("filtro")
+def filtrar_passagens(df, ano=None, mes=None, unidade=None):
+    dff = df
+    if ano:
+        dff = dff[dff["Ano"] == ano]
+    if mes:
+        dff = dff[dff["Mes"] == mes]
+    if unidade:
+        dff = dff[dff["Unidade (Viagem)"] == unidade]
+    return dff
+
+
+def relatorio_passagens(dff, filtros):
+    with etapa("agregacao"):
+        cards = {
+            "total_viagem": int(dff["Valor da Viagem"].sum()),
+            "total_prazo": int(
+                dff["Custo com emissão de passagens dentro do prazo"].sum()
+            ),
+            "total_urgencia": int(
+                dff["Custo com emissão de passagens em caráter de urgência"].sum()
+            ),
+            "total_diarias": int(dff["Valor das Diárias"].sum()),
+            "total_seguro": int(dff["Valor Seguro Viagem"].sum()),
+            "total_restit": int(dff["Valor Restituição"].sum()),
+            "total_passagem": int(dff["Valor da Passagem"].sum()),
+        }
+
+        resumo = dff.groupby("Unidade (Viagem)", as_index=False, observed=True)[
+            COLUNAS_RESUMO_PASSAGENS
+        ].sum()
+    with etapa("moeda"):
+        for col in COLUNAS_RESUMO_PASSAGENS:
+            resumo[col] = resumo[col].apply(fmt_centavos)
+    with etapa("serializacao"):
+        registros = resumo.to_dict("records")
+
+    return {
+        "resumo": registros,
+        "filtros": filtros,
+        "cards": cards,
+    }
+
+
+def detalhe_passagens(dff):
+    with etapa("moeda"):
+        dff = dff[COLUNAS_DETALHE_PASSAGENS].copy()
+        dff["Data Início da Viagem"] = dff["Data Início da Viagem"].dt.strftime(
+            "%d/%m/%Y"
+        )
+        for col in COLUNAS_DETALHE_PASSAGENS[3:]:
+            dff[col] = dff[col].apply(fmt_centavos)
+    with etapa("serializacao"):
+        return dff.to_dict("records")
+
+
+def relatorio_passagens_completo(dff, filtros):
+    # Dados do PDF com o detalhamento por PCDP (na página ele vem da tabela)
+    dados_pdf = relatorio_passagens(dff, filtros)
+    dados_pdf["detalhe"] = detalhe_passagens(dff)
+    return dados_pdf
+
+
+# --------------------------------------------------
+# Pagamentos Efetivados
+# --------------------------------------------------
+COLUNAS_PAGAMENTOS = [
+    "DT ATESTE",
+    "DT PGTO",
+    "Valor",
+    "FONTE",
+    "LISTAS",
+    "RAZÃO SOCIAL",
+]
+
+
+@etapa("filtro")
+def filtrar_pagamentos(df, ano=None, mes=None, lista=None, fonte=None):
+    dff = df
+    if ano:
+        dff = dff[dff["Ano"] == ano]
+    if mes:
+        dff = dff[dff["Mes"] == mes]
+    if lista:
+        dff = dff[dff["LISTAS"] == lista]
+    if fonte:
+        dff = dff[dff["FONTE"].astype(str) == str(fonte)]
+    return dff
+
+
+def relatorio_pagamentos(dff, filtros):
+    with etapa("moeda"):
+        dff_display = dff[COLUNAS_PAGAMENTOS].copy()
+        dff_display["DT ATESTE"] = dff_display["DT ATESTE"].dt.strftime("%d/%m/%Y")
+        dff_display["DT PGTO"] = dff_display["DT PGTO"].dt.strftime("%d/%m/%Y")
+        dff_display["Valor"] = dff_display["Valor"].apply(fmt_centavos)
+    with etapa("serializacao"):
+        tabela = dff_display.to_dict("records")
+    with etapa("agregacao"):
+        total_geral = int(dff["Valor"].sum())
+
+    return {
+        "tabela": tabela,
+        "filtros": filtros,
+        "total_geral": total_geral,
+    }
+
+
+# --------------------------------------------------
+# Dotação Atualizada e Destaques Recebidos
+# --------------------------------------------------
+COLUNAS_DOTACAO = [
+    "GRUPO DA DESPESA",
+    "ANO",
+    "UNIDADE ORÇAMENTÁRIA",
+    "Fonte Recursos Detalhada",
+    "DOTACAO ATUALIZADA",
+    "DESTAQUE RECEBIDO",
+]
+
+
+def consultar_dotacao(df, grupo=None, ano=None, unidade=None, fonte=None):
+    return motores.consultar(
+        "dotacao",
+        df,
+        {
+            "ANO": ano,
+            "GRUPO DA DESPESA": grupo,
+            "UNIDADE ORÇAMENTÁRIA": unidade,
+            "Fonte Recursos Detalhada": fonte,
+        },
+    )
+
+
+def filtrar_dotacao(df, grupo=None, ano=None, unidade=None, fonte=None):
+    return consultar_dotacao(df, grupo, ano, unidade, fonte).linhas()
+
+
+def relatorio_dotacao(dff, filtros):
+    consulta = motores.consulta_de(dff)
+    dff = consulta.linhas()
+    with etapa("moeda"):
+        dff_display = dff[COLUNAS_DOTACAO].copy()
+        for col in ["DOTACAO ATUALIZADA", "DESTAQUE RECEBIDO"]:
+            dff_display[col] = dff_display[col].apply(fmt_centavos)
+    with etapa("serializacao"):
+        tabela = dff_display.to_dict("records")
+    totais = consulta.somar(["DOTACAO ATUALIZADA", "DESTAQUE RECEBIDO"])
+
+    return {
+        "tabela": tabela,
+        "total_dotacao": totais["DOTACAO ATUALIZADA"],
+        "total_destaque": totais["DESTAQUE RECEBIDO"],
+        "filtros": filtros,
+    }
+
+
+# --------------------------------------------------
+# Execução do Orçamento (UNIFEI, TED e consolidado; ver dados.execucao)
+# --------------------------------------------------
+def consultar_execucao_unifei(
+    df, ug_exec=None, mes=None, ano=None, fonte=None, grupo=None, nat=None
+):
+    return execucao.consultar(
+        "execucao_unifei",
+        df,
+        ug_exec=ug_exec,
+        mes=mes,
+        ano=ano,
+        fonte=fonte,
+        grupo=grupo,
+        nat=nat,
+    )
+
+
+def filtrar_execucao_unifei(
+    df, ug_exec=None, mes=None, ano=None, fonte=None, grupo=None, nat=None
+):
+    return consultar_execucao_unifei(
+        df, ug_exec, mes, ano, fonte, grupo, nat
+    ).linhas()
+
+
+def consultar_execucao_ted(
+    df,
+    uo=None,
+    ugexec=None,
+    ano=None,
+    mes=None,
+    fonte=None,
+    grupo=None,
+    nat=None,
+):
+    return execucao.consultar(
+        "execucao_ted",
+        df,
+        uo=uo,
+        ugexec=ugexec,
+        ano=ano,
+        mes=mes,
+        fonte=fonte,
+        grupo=grupo,
+        nat=nat,
+    )
+
+
+def filtrar_execucao_ted(
+    df,
+    uo=None,
+    ugexec=None,
+    ano=None,
+    mes=None,
+    fonte=None,
+    grupo=None,
+    nat=None,
+):
+    return consultar_execucao_ted(
+        df, uo, ugexec, ano, mes, fonte, grupo, nat
+    ).linhas()
+
+
+def consultar_execucao(
+    df,
+    origem=None,
+    ug_exec=None,
+    ano=None,
+    mes=None,
+    fonte=None,
+    grupo=None,
+    nat=None,
+):
+    # df é o consolidado UNIFEI + TED (dados.execucao.consolidado())
+    return execucao.consultar(
+        execucao.CONSOLIDADO,
+        df,
+        origem=origem,
+        ug_exec=ug_exec,
+        ano=ano,
+        mes=mes,
+        fonte=fonte,
+        grupo=grupo,
+        nat=nat,
+    )
+
+
+def filtrar_execucao(
+    df,
+    origem=None,
+    ug_exec=None,
+    ano=None,
+    mes=None,
+    fonte=None,
+    grupo=None,
+    nat=None,
+):
+    return consultar_execucao(
+        df, origem, ug_exec, ano, mes, fonte, grupo, nat
+    ).linhas()
+
+
+def relatorio_execucao_unifei(dff, filtros):
+    return execucao.relatorio("execucao_unifei", dff, filtros)
+
+
+def relatorio_execucao_ted(dff, filtros):
+    return execucao.relatorio("execucao_ted", dff, filtros)
+
+
+def relatorio_execucao(dff, filtros):
+    return execucao.relatorio(execucao.CONSOLIDADO, dff, filtros)
@@ -0,0 +1,202 @@
+# dados/cubos.py
+
+# Cubos de resumo dos painéis de dotação e execução.
+#
+# Um cubo guarda as somas dos valores (centavos; ver dados.moeda) e o número
+# de linhas do snapshot por combinação das dimensões de CUBOS, que são os
+# filtros mais usados de cada painel (ano, mês, fonte, grupo). Os motores
+# de consulta (dados.motores) respondem somar e somar_por pelo cubo quando
+# os filtros e o grupo são todos dimensões dele; as demais consultas (e
+# linhas(), sempre) vão ao snapshot.
+#
+# O cubo é montado na primeira soma que ele responde, e só o do snapshot em
+# uso (vigente(), chamado pelo registro) fica guardado.
+#
+# Quando o snapshot muda, o registro passa a diferença linha a linha
+# (dados.diferencas) para atualizar(): o cubo soma as linhas inseridas e as
+# novas versões das atualizadas e subtrai as removidas e as versões antigas,
+# sem percorrer o snapshot inteiro. Como os valores são inteiros, o cubo
+# atualizado é idêntico ao refeito do zero. Sem diferença (snapshots não
+# comparáveis) ou com mais de FRACAO_MAXIMA das linhas mudadas, o cubo é
+# descartado e refeito na próxima consulta.
+
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from dados import diferencas
+from dados.planilhas import COLUNAS_EXECUCAO
+
+# planilha -> (dimensões, valores)
+CUBOS = {
+    "dotacao": (
+        [
+            "ANO",
+            "GRUPO DA DESPESA",
+            "UNIDADE ORÇAMENTÁRIA",
+            "Fonte Recursos Detalhada",
+        ],
+        ["DOTACAO ATUALIZADA", "DESTAQUE RECEBIDO"],
+    ),
+    "execucao_unifei": (
+        ["Ano", "Mês", "Fonte Recursos Detalhada", "GRUPO DESP"],
+        COLUNAS_EXECUCAO,
+    ),
+    "execucao_ted": (
+        ["Ano", "Mês", "FRD", "GRUPO DESP"],
+        COLUNAS_EXECUCAO,
+    ),
+    # Consolidado das duas (dados.execucao)
+    "execucao": (
+        ["Origem", "Ano", "Mês", "Fonte Recursos Detalhada", "GRUPO DESP"],
+        COLUNAS_EXECUCAO,
+    ),
+}
+
+FRACAO_MAXIMA = 0.5
+
+LINHAS = "__linhas"
+
+
+def _agrupar(df, dimensoes, valores):
+    # Somas e contagem por combinação (inclusive com dimensões vazias, que
+    # contam nos totais sem filtro); dimensões como objetos, para juntar
+    # cubos de snapshots com categorias diferentes
+    grupos = df.groupby(dimensoes, observed=True, dropna=False, sort=False)
+    tabela = grupos[valores].sum()
+    tabela[LINHAS] = grupos.size()
+    tabela = tabela.reset_index()
+    for coluna in dimensoes:
+        if isinstance(tabela[coluna].dtype, pd.CategoricalDtype):
+            tabela[coluna] = tabela[coluna].astype(object)
+    return tabela
+
+
+class Cubo:
+    def __init__(self, dimensoes, valores, tabela, tipos):
+        self.dimensoes = dimensoes
+        self.valores = valores
+        self.tabela = tabela
+        self._tipos = tipos  # tipos das dimensões no snapshot
+
+    @classmethod
+    def montar(cls, df, dimensoes, valores):
+        return cls(
+            dimensoes,
+            valores,
+            _agrupar(df, dimensoes, valores),
+            df[dimensoes].dtypes.to_dict(),
+        )
+
+    def aplicar(self, antigo, novo, diferenca):
+        """Cubo de novo a partir deste (o de antigo) e da diferença."""
+        mais = novo.take(
+            np.concatenate([diferenca.inseridas, diferenca.atualizadas_novo])
+        )
+        menos = _agrupar(
+            antigo.take(
+                np.concatenate([diferenca.removidas, diferenca.atualizadas_antigo])
+            ),
+            self.dimensoes,
+            self.valores,
+        )
+        menos[[*self.valores, LINHAS]] *= -1
+        tabela = (
+            pd.concat(
+                [self.tabela, _agrupar(mais, self.dimensoes, self.valores), menos],
+                ignore_index=True,
+            )
+            .groupby(self.dimensoes, dropna=False, sort=False)[
+                [*self.valores, LINHAS]
+            ]
+            .sum()
+            .reset_index()
+        )
+        tabela = tabela[tabela[LINHAS] > 0].reset_index(drop=True)
+        return Cubo(
+            self.dimensoes,
+            self.valores,
+            tabela,
+            novo[self.dimensoes].dtypes.to_dict(),
+        )
+
+    def cobre(self, colunas):
+        return set(colunas) <= set(self.dimensoes)
+
+    def _filtrar(self, condicoes):
+        tabela = self.tabela
+        for coluna, valor in condicoes.items():
+            tabela = tabela[tabela[coluna] == valor]
+        return tabela
+
+    def somar(self, condicoes, colunas):
+        tabela = self._filtrar(condicoes)
+        return {c: int(tabela[c].sum()) for c in colunas}
+
+    def somar_por(self, condicoes, grupo, coluna):
+        # Como groupby(grupo, as_index=False, observed=True)[coluna].sum() no
+        # snapshot: só os grupos com linhas, em ordem, com o tipo do snapshot
+        tabela = self._filtrar(condicoes)
+        resultado = tabela.groupby(grupo, as_index=False)[coluna].sum()
+        resultado[grupo] = resultado[grupo].astype(self._tipos[grupo])
+        return resultado
+
+
+# --------------------------------------------------
+# Cubo de cada snapshot
+# --------------------------------------------------
+_cubos = {}  # nome -> (referência fraca ao snapshot, Cubo)
+_vigentes = {}  # nome -> referência fraca ao snapshot em uso
+_trava = threading.Lock()
+
+
+def cobre(nome, colunas):
+    """Se o cubo de nome responde filtros e grupos nessas colunas (sem
+    precisar montá-lo)."""
+    return set(colunas) <= set(CUBOS[nome][0])
+
+
+def vigente(nome, df):
+    """Marca df como o snapshot em uso de nome (o do registro): só o cubo
+    dele fica guardado."""
+    with _trava:
+        _vigentes[nome] = weakref.ref(df)
+
+
+def obter(nome, df):
+    """Cubo do snapshot df da planilha nome.
+
+    O do snapshot em uso é montado na primeira chamada e guardado; o de
+    outro DataFrame (um recorte por ano, nos relatórios em lote) é montado a
+    cada chamada e não toma o lugar dele.
+    """
+    with _trava:
+        atual = _cubos.get(nome)
+        em_uso = _vigentes.get(nome)
+    if atual is not None and atual[0]() is df:
+        return atual[1]
+    cubo = Cubo.montar(df, *CUBOS[nome])
+    if em_uso is not None and em_uso() is df:
+        with _trava:
+            _cubos[nome] = (weakref.ref(df), cubo)
+    return cubo
+
+
+def atualizar(nome, antigo, novo, diferenca):
+    """Leva o cubo de antigo para novo; diferenca vem de dados.diferencas."""
+    with _trava:
+        atual = _cubos.get(nome)
+    if atual is None or atual[0]() is not antigo:
+        return  # nenhum cubo em uso; será montado na próxima consulta
+    if (
+        diferenca is None
+        or diferencas.tamanho(diferenca) > FRACAO_MAXIMA * max(len(novo), 1)
+    ):
+        with _trava:
+            _cubos.pop(nome, None)
+        return
+    cubo = atual[1].aplicar(antigo, novo, diferenca)
+    with _trava:
+        _cubos[nome] = (weakref.ref(novo), cubo)
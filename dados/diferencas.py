@@ -0,0 +1,193 @@
+# dados/diferencas.py
+
+# Diferença linha a linha entre dois snapshots da mesma planilha.
+#
+# Cada linha é identificada por uma chave estável (CHAVES: colunas que não
+# mudam quando a linha é corrigida na planilha, como o Número da PCDP) e
+# comparada pelo conteúdo. diferenca(nome, antigo, novo) devolve as
+# posições das linhas inseridas, removidas e atualizadas (mesma chave,
+# conteúdo diferente), o que permite atualizar os derivados do snapshot
+# (cubos de dados.cubos, por exemplo) com só as linhas que mudaram.
+#
+# A comparação é feita em três etapas, cada uma só com as linhas que
+# sobraram da anterior:
+#   1. linha a linha, na mesma posição, coluna a coluna (sem hash): separa o
+#      caso comum, em que os anos fechados vêm do histórico (dados.historico)
+#      na mesma ordem e as linhas novas entram no fim;
+#   2. pelo hash da linha inteira (pd.util.hash_pandas_object, pelos valores
+#      e não pelas categorias): linhas iguais em outra posição;
+#   3. pelo hash da chave: mesma chave e conteúdo diferente é atualização; o
+#      resto é inserção ou remoção.
+# Linhas ou chaves repetidas (duas linhas de execução com a mesma UG,
+# natureza e mês, por exemplo) são numeradas na ordem da planilha.
+
+import collections
+
+import numpy as np
+import pandas as pd
+
+CHAVES = {
+    "passagens": ["Número da PCDP"],
+    "pagamentos": ["Ano", "Mes", "RAZÃO SOCIAL", "DT ATESTE", "DT PGTO"],
+    "dotacao": [
+        "ANO",
+        "UNIDADE ORÇAMENTÁRIA",
+        "Fonte Recursos Detalhada",
+        "GRUPO DA DESPESA",
+    ],
+    "execucao_unifei": [
+        "UG Executora",
+        "NAT DESP",
+        "Ano",
+        "Mês",
+        "Fonte Recursos Detalhada",
+    ],
+    "execucao_ted": [
+        "Unidade Orçamentária",
+        "UG EXEC",
+        "NAT DESP",
+        "Ano",
+        "Mês",
+        "FRD",
+    ],
+    "naturezas": ["ND SOF"],
+}
+
+# Posições (np.ndarray de int64): inseridas e atualizadas_novo no snapshot
+# novo; removidas e atualizadas_antigo no antigo, na mesma ordem das novas
+Diferenca = collections.namedtuple(
+    "Diferenca",
+    ["inseridas", "removidas", "atualizadas_antigo", "atualizadas_novo"],
+)
+
+
+def tamanho(diferenca):
+    """Número de linhas que mudaram."""
+    return (
+        len(diferenca.inseridas)
+        + len(diferenca.removidas)
+        + len(diferenca.atualizadas_novo)
+    )
+
+
+# --------------------------------------------------
+# Comparação
+# --------------------------------------------------
+def _hash(df):
+    # categorize=False: fatorar antes só compensa com muitos valores
+    # repetidos, e as linhas são quase todas únicas
+    return pd.util.hash_pandas_object(df, index=False, categorize=False).to_numpy()
+
+
+def _numerar(hashes):
+    # A 2ª, 3ª... ocorrência de um hash vira o hash de (hash, 1), (hash, 2),
+    # ..., para que cada repetição case com uma só linha do outro snapshot.
+    # A 1ª fica como está, tenha ou não repetições
+    repetidas = pd.Index(hashes).duplicated()
+    if not repetidas.any():
+        return hashes
+    valores = hashes[repetidas]
+    repeticao = pd.Series(valores).groupby(valores, sort=False).cumcount() + 1
+    hashes = hashes.copy()
+    hashes[repetidas] = _hash(
+        pd.DataFrame({"hash": valores, "repeticao": repeticao.to_numpy()})
+    )
+    return hashes
+
+
+def _comparaveis(antigo, novo):
+    # Mesmas colunas e tipos; as categorias podem mudar (uma fonte nova)
+    if list(antigo.columns) != list(novo.columns):
+        return False
+    for coluna in antigo.columns:
+        tipo_antigo, tipo_novo = antigo[coluna].dtype, novo[coluna].dtype
+        if isinstance(tipo_antigo, pd.CategoricalDtype):
+            if not isinstance(tipo_novo, pd.CategoricalDtype):
+                return False
+        elif tipo_antigo != tipo_novo:
+            return False
+    return True
+
+
+def _mesmos_valores(a, b):
+    # a[i] == b[i], com vazio igual a vazio
+    if isinstance(a, pd.Categorical):
+        if b.categories.equals(a.categories):
+            return a.codes == b.codes
+        # Pelos códigos, trazendo b para as categorias de a; um valor que a
+        # não tem vira vazio e é conferido à parte
+        iguais = a.codes == b.set_categories(a.categories).codes
+        suspeitas = np.flatnonzero(iguais & (a.codes == -1))
+        iguais[suspeitas] = pd.isna(np.asarray(b)[suspeitas])
+        return iguais
+    a, b = np.asarray(a), np.asarray(b)
+    iguais = np.asarray(a == b, dtype=bool)
+    # pd.isna só onde diferem (em texto, ele é mais lento que a comparação)
+    diferentes = np.flatnonzero(~iguais)
+    iguais[diferentes] = pd.isna(a[diferentes]) & pd.isna(b[diferentes])
+    return iguais
+
+
+def _iguais_na_posicao(antigo, novo):
+    # Linha i do antigo == linha i do novo, coluna a coluna, sem hash
+    n = min(len(antigo), len(novo))
+    iguais = np.ones(n, dtype=bool)
+    for coluna in antigo.columns:
+        iguais &= _mesmos_valores(antigo[coluna].array[:n], novo[coluna].array[:n])
+    return iguais
+
+
+def _sobras(tamanho, posicoes):
+    # Posições (de 0 a tamanho) que nenhuma linha casou
+    sobra = np.ones(tamanho, dtype=bool)
+    sobra[posicoes[posicoes >= 0]] = False
+    return np.flatnonzero(sobra)
+
+
+def _casar(antigo, novo, antigas, novas, colunas):
+    # Para cada linha de novas, a posição em antigas da linha com os mesmos
+    # valores em colunas (-1 se não tem); None se há colisão de hash
+    indice = pd.Index(_numerar(_hash(antigo.take(antigas)[colunas])))
+    if not indice.is_unique:
+        return None
+    return indice.get_indexer(_numerar(_hash(novo.take(novas)[colunas])))
+
+
+# --------------------------------------------------
+# Diferença
+# --------------------------------------------------
+def diferenca(nome, antigo, novo):
+    """Diferença entre os snapshots antigo e novo da planilha nome.
+
+    Retorna None quando eles não são comparáveis linha a linha (colunas ou
+    tipos diferentes, ou planilha sem chave): nesse caso, tudo mudou.
+    """
+    if nome not in CHAVES or not _comparaveis(antigo, novo):
+        return None
+    # 1. Na mesma posição: o caso comum (anos fechados, linhas acrescentadas
+    #    no fim), sem hash
+    iguais = _iguais_na_posicao(antigo, novo)
+    n = len(iguais)
+    antigas = np.concatenate(
+        [np.flatnonzero(~iguais), np.arange(n, len(antigo))]
+    )
+    novas = np.concatenate([np.flatnonzero(~iguais), np.arange(n, len(novo))])
+
+    # 2. A linha inteira em outra posição (depois de uma inserção no meio)
+    posicoes = _casar(antigo, novo, antigas, novas, list(antigo.columns))
+    if posicoes is None:
+        return None
+    antigas = antigas[_sobras(len(antigas), posicoes)]
+    novas = novas[posicoes < 0]
+
+    # 3. Das que sobraram, as de mesma chave são atualizações
+    posicoes = _casar(antigo, novo, antigas, novas, CHAVES[nome])
+    if posicoes is None:
+        return None
+    casadas = posicoes >= 0
+    return Diferenca(
+        inseridas=novas[~casadas],
+        removidas=antigas[_sobras(len(antigas), posicoes)],
+        atualizadas_antigo=antigas[posicoes[casadas]],
+        atualizadas_novo=novas[casadas],
+    )
@@ -0,0 +1,198 @@
+# dados/download.py
+
+# Download concorrente das planilhas.
+#
+# Todas as planilhas pedidas são baixadas ao mesmo tempo por um único
+# httpx.AsyncClient (pool de conexões compartilhado) e cada CSV é tratado
+# num pool de threads assim que chega, enquanto os outros downloads
+# continuam. O tempo total fica próximo ao da planilha mais lenta.
+#
+# Origens que não são URLs http(s) são tratadas como caminhos locais e
+# lidas direto pela função de tratamento.
+#
+# Cada requisição tem timeout de conexão e de leitura e é repetida em caso
+# de falha de rede ou de status 429/5xx, com espera exponencial aleatória
+# (full jitter). Cada planilha tem um disjuntor: depois de FALHAS_PARA_ABRIR
+# falhas seguidas, novas cargas falham na hora com CircuitoAberto durante
+# TEMPO_ABERTO segundos; passado esse prazo, uma tentativa é liberada e, se
+# falhar, o disjuntor abre de novo.
+#
+# ao_concluir roda no mesmo pool de threads, e uma exceção nele vira o
+# resultado daquela planilha, sem interromper as outras.
+#
+# A duração do download e do tratamento, as linhas e os bytes de cada
+# planilha vão para monitoramento.metricas.
+
+import asyncio
+import io
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+from monitoramento import metricas
+
+log = logging.getLogger(__name__)
+
+TIMEOUT = httpx.Timeout(20.0, connect=5.0)
+LIMITES = httpx.Limits(max_connections=10, max_keepalive_connections=10)
+
+TENTATIVAS = 3
+ESPERA_BASE = 0.5  # segundos
+ESPERA_MAXIMA = 8.0
+STATUS_REPETIR = {429, 500, 502, 503, 504}
+
+FALHAS_PARA_ABRIR = 3
+TEMPO_ABERTO = 5 * 60  # segundos
+
+
+class CircuitoAberto(Exception):
+    pass
+
+
+# --------------------------------------------------
+# Disjuntor por planilha
+# --------------------------------------------------
+class Disjuntor:
+    def __init__(self):
+        self.falhas = 0
+        self.aberto_ate = 0.0
+        self._lock = threading.Lock()
+
+    def aberto(self):
+        return time.monotonic() < self.aberto_ate
+
+    def sucesso(self):
+        with self._lock:
+            self.falhas = 0
+            self.aberto_ate = 0.0
+
+    def falha(self):
+        with self._lock:
+            self.falhas += 1
+            if self.falhas >= FALHAS_PARA_ABRIR:
+                self.aberto_ate = time.monotonic() + TEMPO_ABERTO
+
+
+_disjuntores = {}
+_lock_disjuntores = threading.Lock()
+
+
+def disjuntor(nome):
+    with _lock_disjuntores:
+        if nome not in _disjuntores:
+            _disjuntores[nome] = Disjuntor()
+        return _disjuntores[nome]
+
+
+# --------------------------------------------------
+# Download com repetição
+# --------------------------------------------------
+def _remota(origem):
+    return origem.startswith(("http://", "https://"))
+
+
+def _espera(tentativa):
+    return random.uniform(0, min(ESPERA_MAXIMA, ESPERA_BASE * 2**tentativa))
+
+
+async def _baixar(cliente, origem):
+    for tentativa in range(TENTATIVAS):
+        try:
+            resposta = await cliente.get(origem)
+            resposta.raise_for_status()
+            return resposta.content
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code not in STATUS_REPETIR:
+                raise
+            if tentativa == TENTATIVAS - 1:
+                raise
+        except httpx.TransportError:
+            if tentativa == TENTATIVAS - 1:
+                raise
+        await asyncio.sleep(_espera(tentativa))
+
+
+def _tratar_medindo(tratar, origem):
+    inicio = time.perf_counter()
+    df = tratar(origem)
+    return df, time.perf_counter() - inicio
+
+
+async def _baixar_e_tratar(cliente, executor, nome, origem, tratar):
+    estado = disjuntor(nome)
+    if estado.aberto():
+        raise CircuitoAberto(f"planilha {nome} suspensa após falhas seguidas")
+
+    loop = asyncio.get_running_loop()
+    try:
+        duracao_download = None
+        if _remota(origem):
+            inicio = time.perf_counter()
+            conteudo = await _baixar(cliente, origem)
+            duracao_download = time.perf_counter() - inicio
+            tamanho = len(conteudo)
+            origem = io.BytesIO(conteudo)
+        else:
+            tamanho = os.path.getsize(origem)
+        df, duracao_tratamento = await loop.run_in_executor(
+            executor, _tratar_medindo, tratar, origem
+        )
+    except Exception:
+        estado.falha()
+        metricas.registrar_falha_planilha(nome)
+        raise
+    estado.sucesso()
+    metricas.registrar_planilha(
+        nome, duracao_download, duracao_tratamento, len(df), tamanho
+    )
+    return df
+
+
+async def _carregar(tarefas, ao_concluir):
+    async def uma(nome, origem, tratar):
+        try:
+            resultado = await _baixar_e_tratar(
+                cliente, executor, nome, origem, tratar
+            )
+        except Exception as exc:
+            resultado = exc
+        if ao_concluir is not None:
+            # Fora do laço de eventos (troca o snapshot, com diferença e
+            # cubos); uma falha aqui vale só para esta planilha
+            try:
+                await asyncio.get_running_loop().run_in_executor(
+                    executor, ao_concluir, nome, resultado
+                )
+            except Exception as exc:
+                log.exception("falha ao concluir a carga da planilha %s", nome)
+                resultado = exc
+        return nome, resultado
+
+    workers = min(len(tarefas), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        async with httpx.AsyncClient(
+            timeout=TIMEOUT, limits=LIMITES, follow_redirects=True
+        ) as cliente:
+            resultados = await asyncio.gather(
+                *(uma(nome, *tarefa) for nome, tarefa in tarefas.items())
+            )
+    return dict(resultados)
+
+
+def carregar(tarefas, ao_concluir=None):
+    """Baixa e trata as planilhas em paralelo.
+
+    tarefas: {nome: (origem, tratar)}, onde tratar(buffer_ou_caminho)
+    devolve o DataFrame. ao_concluir(nome, resultado), se informado, é
+    chamado à medida que cada planilha termina, numa thread do pool.
+    Retorna {nome: DataFrame} com a exceção no lugar do DataFrame das
+    planilhas que falharam (também no tratamento ou em ao_concluir).
+    """
+    if not tarefas:
+        return {}
+    return asyncio.run(_carregar(tarefas, ao_concluir))
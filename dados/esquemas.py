@@ -0,0 +1,357 @@
+# dados/esquemas.py
+
+# Esquemas das planilhas: colunas esperadas, tipos e formatos.
+#
+# Cada planilha declara as colunas do CSV, com os nomes que o pandas daria
+# ao cabeçalho (sem espaços nas pontas; cabeçalho vazio vira
+# "Unnamed: <posição>"), e o tipo de cada uma:
+#   TEXTO:     texto livre (object);
+#   CATEGORIA: texto com poucos valores, muito repetidos (category, com as
+#              categorias em ordem alfabética);
+#   INT:       inteiro (int64; float64 se houver células vazias, como no
+#              pandas);
+#   FLOAT:     número (float64);
+#   MOEDA:     valor em reais ("R$ 1.234,56"), convertido na própria coluna
+#              para centavos inteiros (int64: 123456; ver dados.moeda); vazio
+#              ou "-" vira 0, e o texto original não fica no snapshot;
+#   DATA:      data no formato da planilha (datetime64[ns]); datas
+#              inválidas viram NaT.
+# E, quando preciso:
+#   renomear:     {nome no CSV: nome no snapshot};
+#   formato_data: formato das colunas DATA (padrão "%d/%m/%Y");
+#   ano:          coluna com o ano de cada linha (INT, ou DATA, de que se
+#                 tira o ano), para pular anos na leitura (ver ler_csv).
+#
+# ler_csv() lê o CSV com o pyarrow.csv já nos tipos declarados (sem
+# inferência), converte moeda e datas com o pyarrow.compute e devolve o
+# DataFrame do pandas. Com colunas (os nomes do snapshot que a página usa,
+# ver dados.registro), só essas são lidas do arquivo; as demais nem chegam a
+# ser convertidas. Com pular_anos, as linhas desses anos são descartadas
+# logo depois da leitura, antes das conversões de moeda e datas (os anos já
+# congelados em dados.historico). Mudanças na planilha aparecem como EsquemaInvalido
+# (coluna lida que sumiu do cabeçalho, valor que não cabe no tipo); colunas
+# novas, não declaradas, são descartadas com um aviso no log.
+
+import csv
+import io
+import logging
+import re
+import urllib.request
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+from dados.moeda import CENTAVOS_POR_REAL
+
+log = logging.getLogger(__name__)
+
+TEXTO = "texto"
+CATEGORIA = "categoria"
+INT = "int"
+FLOAT = "float"
+MOEDA = "moeda"
+DATA = "data"
+
+FORMATO_DATA = "%d/%m/%Y"
+
+# Valores lidos como ausentes (os mesmos do pandas.read_csv)
+NA_PANDAS = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+]
+
+
+class EsquemaInvalido(ValueError):
+    pass
+
+
+# --------------------------------------------------
+# Esquemas
+# --------------------------------------------------
+_EXECUCAO = {
+    "Ano": INT,
+    "Mês": CATEGORIA,
+    "Fonte Recursos Detalhada": CATEGORIA,
+    "FRD": CATEGORIA,
+    "GRUPO DESP": CATEGORIA,
+    "NAT DESP": INT,
+    "Natureza Despesa": CATEGORIA,
+    "DESPESAS INSCRITAS EM RP NAO PROCESSADOS": MOEDA,
+    "DESPESAS EMPENHADAS (CONTROLE EMPENHO)": MOEDA,
+    "DESPESAS LIQUIDADAS (CONTROLE EMPENHO)": MOEDA,
+    "DESPESAS LIQUIDADAS A PAGAR(CONTROLE EMPENHO)": MOEDA,
+    "DESPESAS PAGAS (CONTROLE EMPENHO)": MOEDA,
+}
+
+ESQUEMAS = {
+    "passagens": {
+        "colunas": {
+            "Unidade (Viagem)": CATEGORIA,
+            "Número da PCDP": TEXTO,
+            "Data Início da Viagem": DATA,
+            "Valor das Diárias": MOEDA,
+            "Valor da Viagem": MOEDA,
+            "Valor da Passagem": MOEDA,
+            "Valor Seguro Viagem": MOEDA,
+            "Valor Restituição": MOEDA,
+            "Custo com emissão de passagens dentro do prazo": MOEDA,
+            "Custo com emissão de passagens em caráter de urgência": MOEDA,
+        },
+        "ano": "Data Início da Viagem",
+    },
+    "pagamentos": {
+        "colunas": {
+            "ANO": INT,
+            "MÊS": CATEGORIA,
+            # As colunas de data vêm sem cabeçalho no export
+            "Unnamed: 2": DATA,
+            "Unnamed: 3": DATA,
+            "Valor": MOEDA,
+            "FONTE": CATEGORIA,
+            "LISTAS": CATEGORIA,
+            "RAZÃO SOCIAL": CATEGORIA,
+        },
+        "renomear": {"Unnamed: 2": "DT ATESTE", "Unnamed: 3": "DT PGTO"},
+        "ano": "ANO",
+    },
+    "dotacao": {
+        "colunas": {
+            "GRUPO DA DESPESA": CATEGORIA,
+            "ANO": INT,
+            "UNIDADE ORÇAMENTÁRIA": CATEGORIA,
+            "Fonte Recursos Detalhada": CATEGORIA,
+            "DOTACAO ATUALIZADA": MOEDA,
+            "DESTAQUE RECEBIDO": MOEDA,
+        },
+        "ano": "ANO",
+    },
+    "execucao_unifei": {
+        "colunas": {"UG Executora": CATEGORIA, **_EXECUCAO},
+        "ano": "Ano",
+    },
+    "execucao_ted": {
+        "colunas": {
+            "Unidade Orçamentária": CATEGORIA,
+            "UG EXEC": CATEGORIA,
+            **_EXECUCAO,
+        },
+        "ano": "Ano",
+    },
+    "naturezas": {
+        "colunas": {"ND SOF": INT, "TITULO": TEXTO},
+    },
+}
+
+
+# --------------------------------------------------
+# Leitura do CSV
+# --------------------------------------------------
+def conteudo(origem):
+    """Bytes do CSV de origem (URL, caminho ou buffer)."""
+    if hasattr(origem, "read"):
+        dados = origem.read()
+        return dados.encode("utf-8") if isinstance(dados, str) else dados
+    if str(origem).startswith(("http://", "https://")):
+        with urllib.request.urlopen(origem) as resposta:
+            return resposta.read()
+    with open(origem, "rb") as fh:
+        return fh.read()
+
+
+def cabecalho(dados):
+    """Nomes das colunas do CSV como o pandas.read_csv os daria (sem espaços
+    nas pontas)."""
+    primeira = dados.split(b"\n", 1)[0].decode("utf-8-sig").rstrip("\r")
+    nomes, vistos = [], {}
+    for i, nome in enumerate(next(csv.reader([primeira]), [])):
+        nome = nome or f"Unnamed: {i}"
+        if nome in vistos:
+            vistos[nome] += 1
+            nome = f"{nome}.{vistos[nome]}"
+        else:
+            vistos[nome] = 0
+        nomes.append(nome.strip())
+    return nomes
+
+
+def colunas_lidas(nome, nomes, colunas=None):
+    """Colunas declaradas de nome a ler do CSV, na ordem do arquivo.
+
+    colunas restringe a leitura a esses nomes do snapshot (os que não estão
+    no esquema, como as colunas derivadas, são ignorados). Levanta
+    EsquemaInvalido se faltar alguma das lidas; avisa das não declaradas.
+    """
+    esquema = ESQUEMAS[nome]
+    declaradas = esquema["colunas"]
+    if colunas is None:
+        lidas = list(declaradas)
+    else:
+        renomear = esquema.get("renomear", {})
+        lidas = [c for c in declaradas if renomear.get(c, c) in colunas]
+    ausentes = [c for c in lidas if c not in nomes]
+    if ausentes:
+        raise EsquemaInvalido(
+            f"planilha {nome}: colunas ausentes no CSV: {', '.join(ausentes)}"
+        )
+    novas = [c for c in nomes if c not in declaradas]
+    if novas:
+        log.warning(
+            "planilha %s: colunas não declaradas no esquema, descartadas: %s",
+            nome,
+            ", ".join(novas),
+        )
+    return [c for c in nomes if c in lidas]
+
+
+def colunas_moeda(nome):
+    """Colunas MOEDA de nome (em centavos), com os nomes do snapshot."""
+    esquema = ESQUEMAS[nome]
+    renomear = esquema.get("renomear", {})
+    return [renomear.get(c, c) for c, t in esquema["colunas"].items() if t == MOEDA]
+
+
+def colunas_mantidas(nome, existentes, colunas):
+    """Colunas de existentes que ficam no snapshot: as de colunas (todas, se
+    None), na ordem do DataFrame."""
+    if colunas is None:
+        return list(existentes)
+    faltando = [c for c in colunas if c not in existentes]
+    if faltando:
+        raise ValueError(
+            f"planilha {nome}: colunas pedidas que a carga não produz: "
+            + ", ".join(faltando)
+        )
+    return [c for c in existentes if c in colunas]
+
+
+_TIPOS_ARROW = {
+    TEXTO: pa.string(),
+    CATEGORIA: pa.dictionary(pa.int32(), pa.string()),
+    INT: pa.int64(),
+    FLOAT: pa.float64(),
+    MOEDA: pa.string(),
+    DATA: pa.string(),
+}
+
+
+def _moeda(valores):
+    texto = valores
+    for antigo, novo in (("R$", ""), (".", ""), (",", ".")):
+        texto = pc.replace_substring(texto, antigo, novo)
+    texto = pc.utf8_trim_whitespace(texto)
+    vazio = pc.is_in(texto, value_set=pa.array(["", "-"]))
+    texto = pc.if_else(vazio, pa.scalar(None, pa.string()), texto)
+    # Centavos arredondados do valor lido: exatos até ~90 trilhões de reais
+    centavos = pc.multiply(pc.cast(texto, pa.float64()), CENTAVOS_POR_REAL)
+    centavos = pc.round(centavos, round_mode="half_to_even")
+    return pc.fill_null(pc.cast(centavos, pa.int64()), 0)
+
+
+def _padrao_dia(formato):
+    # Expressão regular para o dia (%d) no texto da data: o trecho do
+    # formato antes dele e o separador seguinte
+    antes, depois = formato.split("%d", 1)
+    prefixo = "".join(
+        ".+?" if re.fullmatch("%[a-zA-Z]", p) else re.escape(p)
+        for p in re.split(r"(%[a-zA-Z])", antes)
+    )
+    if not depois:
+        fim = r"\s*$"
+    elif depois.startswith("%"):
+        fim = ""
+    else:
+        fim = re.escape(depois[0])
+    return r"^\s*" + prefixo + r"(?P<dia>\d{1,2})" + fim
+
+
+def _data(valores, formato):
+    datas = pc.strptime(valores, format=formato, unit="ns", error_is_null=True)
+    if "%d" not in formato:
+        return datas
+    # O strptime do Arrow aceita dias que não existem (31/02 vira 02/03),
+    # que o pandas marca como NaT. Nesses casos o dia da data lida sempre
+    # difere do dia escrito
+    dia = pc.struct_field(pc.extract_regex(valores, _padrao_dia(formato)), "dia")
+    confere = pc.equal(pc.day(datas), pc.cast(dia, pa.int64()))
+    return pc.if_else(confere, datas, pa.scalar(None, datas.type))
+
+
+def _sem_anos(tabela, esquema, formato, anos):
+    # Linhas fora dos anos pedidos (as sem ano ficam)
+    coluna = esquema["ano"]
+    valores = tabela[coluna]
+    if esquema["colunas"][coluna] == DATA:
+        valores = pc.year(_data(valores, formato))
+    fora = pc.is_in(valores, value_set=pa.array(sorted(anos), pa.int64()))
+    return tabela.filter(pc.invert(fora))
+
+
+def _erro(nome, erro, lidas):
+    # O Arrow cita a coluna pela posição; troca pelo nome
+    texto = re.sub(
+        r"In CSV column #(\d+)", lambda m: f"coluna {lidas[int(m[1])]!r}", str(erro)
+    )
+    return EsquemaInvalido(f"planilha {nome}: {texto}")
+
+
+def ler_csv(nome, origem, colunas=None, pular_anos=()):
+    """Lê o CSV de origem com o esquema de nome -> DataFrame do pandas.
+
+    Com colunas, lê só as do esquema que estão nela (ver colunas_lidas); com
+    pular_anos, descarta as linhas desses anos antes das conversões.
+    """
+    esquema = ESQUEMAS[nome]
+    tipos = esquema["colunas"]
+    formato = esquema.get("formato_data", FORMATO_DATA)
+    if pular_anos and colunas is not None:
+        colunas = [*colunas, esquema["ano"]]
+
+    dados = conteudo(origem)
+    nomes = cabecalho(dados)
+    lidas = colunas_lidas(nome, nomes, colunas)
+    try:
+        tabela = pa_csv.read_csv(
+            io.BytesIO(dados),
+            read_options=pa_csv.ReadOptions(column_names=nomes, skip_rows=1),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={c: _TIPOS_ARROW[tipos[c]] for c in lidas},
+                include_columns=lidas,
+                null_values=NA_PANDAS,
+                strings_can_be_null=True,
+            ),
+        )
+    except pa.ArrowInvalid as erro:
+        raise _erro(nome, erro, nomes) from None
+    if pular_anos:
+        tabela = _sem_anos(tabela, esquema, formato, pular_anos)
+
+    for coluna in lidas:
+        tipo = tipos[coluna]
+        if tipo not in (MOEDA, DATA):
+            continue
+        try:
+            if tipo == MOEDA:
+                valores = _moeda(tabela[coluna])
+            else:
+                valores = _data(tabela[coluna], formato)
+        except pa.ArrowInvalid as erro:
+            raise EsquemaInvalido(
+                f"planilha {nome}, coluna {coluna!r}: {erro}"
+            ) from None
+        posicao = tabela.column_names.index(coluna)
+        tabela = tabela.set_column(posicao, coluna, valores)
+
+    df = tabela.to_pandas()
+    for coluna in lidas:
+        if tipos[coluna] == CATEGORIA:
+            # Categorias em ordem alfabética: groupby e gráficos ficam na
+            # mesma ordem de quando a coluna era texto
+            categorias = df[coluna].cat.categories
+            df[coluna] = df[coluna].cat.reorder_categories(sorted(categorias))
+        elif tipos[coluna] == TEXTO:
+            # Ausentes como NaN (o Arrow dá None), como no pandas.read_csv
+            df[coluna] = df[coluna].where(df[coluna].notna(), np.nan)
+    return df.rename(columns=esquema.get("renomear", {}))
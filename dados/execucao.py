@@ -0,0 +1,201 @@
+# dados/execucao.py
+
+# Motor comum das planilhas de execução do orçamento (UNIFEI e TED).
+#
+# As duas planilhas têm os mesmos valores (COLUNAS_EXECUCAO) e quase as
+# mesmas dimensões, algumas com outro nome (a UG executora é "UG Executora"
+# numa e "UG EXEC" na outra; o filtro de fonte do TED usa o código, "FRD").
+# PLANILHAS descreve cada uma:
+#   filtros: {parâmetro: coluna}, na ordem dos filtros da página (os
+#            parâmetros são as chaves de "filtros" nos dados do PDF e na
+#            query string da exportação);
+#   tabela:  colunas de dimensão da tabela de detalhamento e do PDF;
+#   comuns:  {coluna comum: coluna da planilha}, para as colunas de
+#            DIMENSOES com outro nome na planilha;
+#   origem:  rótulo das linhas da planilha no consolidado.
+# Filtro, consulta e relatório são os mesmos para as duas: as consultas
+# passam pelos motores (dados.motores) e pelos cubos (dados.cubos) com o
+# nome da planilha, e as páginas, a exportação e os relatórios só dizem
+# qual planilha querem.
+#
+# consolidado() junta as duas planilhas num snapshot só, com as colunas de
+# DIMENSOES (nomes comuns), os valores e a planilha de cada linha em
+# "Origem". Ele é consultado como uma terceira planilha, CONSOLIDADO, com
+# motor (PAINEL_MOTOR_EXECUCAO) e cubo próprios, e é refeito quando o
+# snapshot de uma das duas muda.
+
+import collections
+import threading
+import weakref
+
+import pandas as pd
+
+from dados import cubos, historico, motores, registro
+from dados.moeda import fmt_centavos
+from dados.planilhas import COLUNAS_EXECUCAO
+from monitoramento.etapas import etapa
+
+CONSOLIDADO = "execucao"
+ORIGEM = "Origem"
+
+# Colunas de dimensão do consolidado, com os nomes da planilha da UNIFEI
+DIMENSOES = [
+    "UG Executora",
+    "Ano",
+    "Mês",
+    "Fonte Recursos Detalhada",
+    "GRUPO DESP",
+    "NAT DESP",
+    "Natureza Despesa",
+]
+
+Planilha = collections.namedtuple(
+    "Planilha", ["filtros", "tabela", "comuns", "origem"]
+)
+
+_TABELA = ["Fonte Recursos Detalhada", "GRUPO DESP", "Natureza Despesa"]
+
+PLANILHAS = {
+    "execucao_unifei": Planilha(
+        filtros={
+            "ug_exec": "UG Executora",
+            "mes": "Mês",
+            "ano": "Ano",
+            "fonte": "Fonte Recursos Detalhada",
+            "grupo": "GRUPO DESP",
+            "nat": "NAT DESP",
+        },
+        tabela=["UG Executora", *_TABELA],
+        comuns={},
+        origem="UNIFEI",
+    ),
+    "execucao_ted": Planilha(
+        filtros={
+            "uo": "Unidade Orçamentária",
+            "ugexec": "UG EXEC",
+            "ano": "Ano",
+            "mes": "Mês",
+            "fonte": "FRD",
+            "grupo": "GRUPO DESP",
+            "nat": "NAT DESP",
+        },
+        tabela=["Unidade Orçamentária", *_TABELA],
+        comuns={"UG Executora": "UG EXEC"},
+        origem="TED",
+    ),
+    CONSOLIDADO: Planilha(
+        filtros={
+            "origem": ORIGEM,
+            "ug_exec": "UG Executora",
+            "ano": "Ano",
+            "mes": "Mês",
+            "fonte": "Fonte Recursos Detalhada",
+            "grupo": "GRUPO DESP",
+            "nat": "NAT DESP",
+        },
+        tabela=[ORIGEM, "UG Executora", *_TABELA],
+        comuns={},
+        origem=None,
+    ),
+}
+
+ORIGENS = [nome for nome, planilha in PLANILHAS.items() if planilha.origem]
+
+
+# --------------------------------------------------
+# Consulta e relatório
+# --------------------------------------------------
+def consultar(nome, df, **filtros):
+    """Consulta (dados.motores) do snapshot df da planilha nome com os
+    filtros da página ({parâmetro: valor}; vazios não filtram)."""
+    colunas = PLANILHAS[nome].filtros
+    desconhecidos = set(filtros) - set(colunas)
+    if desconhecidos:
+        raise TypeError(
+            f"filtros desconhecidos para {nome}: {', '.join(sorted(desconhecidos))}"
+        )
+    return motores.consultar(
+        nome, df, {coluna: filtros.get(p) for p, coluna in colunas.items()}
+    )
+
+
+def filtrar(nome, df, **filtros):
+    return consultar(nome, df, **filtros).linhas()
+
+
+def relatorio(nome, dff, filtros):
+    """Tabela formatada e totais (centavos) da consulta ou das linhas já
+    filtradas de nome."""
+    colunas_tabela = PLANILHAS[nome].tabela + COLUNAS_EXECUCAO
+
+    consulta = motores.consulta_de(dff)
+    dff = consulta.linhas()
+    with etapa("moeda"):
+        dff_display = dff[colunas_tabela].copy()
+        for c in COLUNAS_EXECUCAO:
+            dff_display[c] = dff_display[c].apply(fmt_centavos)
+    with etapa("serializacao"):
+        tabela = dff_display.to_dict("records")
+    somas = consulta.somar(COLUNAS_EXECUCAO)
+    totais = [somas[c] for c in COLUNAS_EXECUCAO]
+
+    return {
+        "tabela": tabela,
+        "totais": dict(zip(["rp", "emp", "liq", "liq_pagar", "pagas"], totais)),
+        "filtros": filtros,
+    }
+
+
+# --------------------------------------------------
+# Consolidado (UNIFEI + TED)
+# --------------------------------------------------
+def juntar(snapshots):
+    """{planilha de ORIGENS: snapshot} -> snapshot consolidado."""
+    rotulos = sorted(PLANILHAS[nome].origem for nome in ORIGENS)
+    partes = []
+    for nome in ORIGENS:
+        planilha = PLANILHAS[nome]
+        df = snapshots[nome]
+        colunas = [planilha.comuns.get(c, c) for c in DIMENSOES]
+        parte = df[colunas + COLUNAS_EXECUCAO].set_axis(
+            DIMENSOES + COLUNAS_EXECUCAO, axis=1
+        )
+        parte.insert(
+            0,
+            ORIGEM,
+            pd.Categorical([planilha.origem] * len(df), categories=rotulos),
+        )
+        partes.append(parte)
+    return historico.juntar(partes)
+
+
+_consolidado = None  # (referências fracas aos snapshots, consolidado)
+_trava = threading.Lock()
+
+
+def consolidado():
+    """Snapshot consolidado atual (refeito quando uma das planilhas muda)."""
+    global _consolidado
+    snapshots = registro.obter_varias(ORIGENS)
+    with _trava:
+        atual = _consolidado
+    if atual is not None and all(
+        referencia() is snapshots[nome] for nome, referencia in atual[0].items()
+    ):
+        return atual[1]
+    with etapa("consolidacao"):
+        df = juntar(snapshots)
+    cubos.vigente(CONSOLIDADO, df)
+    with _trava:
+        _consolidado = (
+            {nome: weakref.ref(snapshots[nome]) for nome in ORIGENS},
+            df,
+        )
+    return df
+
+
+def obter(nome):
+    """Snapshot de uma planilha de PLANILHAS (o consolidado, para CONSOLIDADO)."""
+    if nome == CONSOLIDADO:
+        return consolidado()
+    return registro.obter(nome)
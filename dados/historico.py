@@ -0,0 +1,211 @@
+# dados/historico.py
+
+# Histórico local das planilhas, particionado por ano.
+#
+# Passagens, pagamentos, dotação e execução acumulam todos os anos, mas só o
+# ano corrente ainda muda: o mais recente da planilha (o ano_padrao das
+# páginas), sem passar do ano do calendário (ou de PAINEL_ANO_CORRENTE, se
+# definido). Na primeira carga de cada planilha, as linhas de cada ano
+# fechado (anterior ao corrente) são congeladas em Parquet, um por ano, em
+# PAINEL_HISTORICO_DIR/<planilha>-<assinatura>/<ano>.parquet. Nas cargas
+# seguintes, o leitor pula as linhas desses anos antes de converter moeda e
+# datas (pular_anos em dados.planilhas), e o snapshot é remontado com as
+# partições do disco, lidas e juntadas uma vez por processo (de novo só
+# quando um ano é congelado) e guardadas em memória. Assim uma atualização
+# só converte as linhas do ano corrente, e não o histórico inteiro; se elas
+# não mudaram, a carga devolve o mesmo snapshot, sem juntar nem comparar
+# nada. O CSV continua vindo inteiro, porque a exportação do Google Sheets
+# não filtra linhas.
+#
+# No snapshot remontado, as linhas dos anos fechados vêm primeiro, em ordem
+# de ano, e depois as do ano corrente, na ordem do CSV. As categorias são as
+# usadas, em ordem alfabética, como em dados.esquemas.
+#
+# A assinatura muda com o esquema da planilha, as colunas do snapshot, a URL
+# e FORMATO. Um histórico gravado com outra assinatura é ignorado. Um ano
+# fechado que ainda não tem partição é lido do CSV e congelado na mesma
+# carga. Para reler um ano fechado (uma correção tardia na planilha), basta
+# apagar o arquivo dele. Com PAINEL_HISTORICO_DIR vazio, o histórico fica
+# desligado e toda carga lê a planilha inteira.
+
+import datetime
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dados import esquemas
+
+log = logging.getLogger(__name__)
+
+DIRETORIO = os.environ.get(
+    "PAINEL_HISTORICO_DIR",
+    os.path.join(tempfile.gettempdir(), "painel-dcf-historico"),
+)
+
+# Versão do formato das partições; mudar quando o snapshot mudar de tipo
+# sem mudar o esquema (moeda em centavos, por exemplo)
+FORMATO = 1
+
+# planilha -> coluna do snapshot com o ano
+COLUNA_ANO = {
+    "passagens": "Ano",
+    "pagamentos": "Ano",
+    "dotacao": "ANO",
+    "execucao_unifei": "Ano",
+    "execucao_ted": "Ano",
+}
+
+# pasta -> (partições usadas, anos fechados já juntos, parte do ano
+#          corrente, snapshot montado com elas)
+_montados = {}
+_lock = threading.Lock()
+
+
+def ano_limite():
+    # Nenhum ano a partir deste é fechado
+    return int(os.environ.get("PAINEL_ANO_CORRENTE") or datetime.date.today().year)
+
+
+def _pasta(nome, url, colunas):
+    chave = repr((FORMATO, esquemas.ESQUEMAS[nome], sorted(colunas), str(url)))
+    assinatura = hashlib.sha1(chave.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(DIRETORIO, f"{nome}-{assinatura}")
+
+
+# --------------------------------------------------
+# Partições em disco
+# --------------------------------------------------
+def _congelados(pasta):
+    # {ano: caminho} das partições gravadas
+    if not os.path.isdir(pasta):
+        return {}
+    anos = {}
+    for arquivo in os.listdir(pasta):
+        ano, extensao = os.path.splitext(arquivo)
+        if extensao == ".parquet" and ano.isdigit():
+            anos[int(ano)] = os.path.join(pasta, arquivo)
+    return anos
+
+
+def _congelar(pasta, ano, df):
+    os.makedirs(pasta, exist_ok=True)
+    caminho = os.path.join(pasta, f"{ano}.parquet")
+    # Grava num temporário e troca: outro processo nunca lê um arquivo pela
+    # metade
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    df.to_parquet(temporario, index=False)
+    os.replace(temporario, caminho)
+    log.info("histórico: %s de %d congelado (%d linhas)", pasta, ano, len(df))
+    return caminho
+
+
+def _ler_particao(caminho):
+    df = pd.read_parquet(caminho)
+    for coluna in df.columns:
+        if df[coluna].dtype == object:
+            # Ausentes como NaN (o Parquet devolve None), como no leitor
+            df[coluna] = df[coluna].where(df[coluna].notna(), np.nan)
+    return df
+
+
+def _categoricas(df):
+    return [c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)]
+
+
+def _so_usadas(df):
+    # Cada parte guarda só as categorias que usa; assim a união delas já é
+    # o conjunto usado no snapshot remontado
+    df = df.copy(deep=False)
+    for coluna in _categoricas(df):
+        df[coluna] = df[coluna].cat.remove_unused_categories()
+    return df
+
+
+def juntar(partes):
+    """pd.concat das partes (mesmas colunas), mantendo as colunas category."""
+    # pd.concat só mantém category se as categorias forem as mesmas em todas
+    # as partes; une antes, em ordem alfabética
+    categoricas = _categoricas(partes[-1])
+    uniao = {
+        coluna: sorted(set().union(*(p[coluna].cat.categories for p in partes)))
+        for coluna in categoricas
+    }
+    uniformes = []
+    for parte in partes:
+        parte = parte.copy(deep=False)
+        for coluna in categoricas:
+            parte[coluna] = parte[coluna].cat.set_categories(uniao[coluna])
+        uniformes.append(parte)
+    return pd.concat(uniformes, ignore_index=True)
+
+
+def _montar(pasta, congelados, atual):
+    # Os anos fechados ficam juntos em memória enquanto as partições não
+    # mudam. Se a parte do ano corrente também não mudou, volta o mesmo
+    # snapshot (o registro nem compara); senão, só ela é juntada a eles
+    particoes = tuple(
+        (ano, congelados[ano], os.path.getmtime(congelados[ano]))
+        for ano in sorted(congelados)
+    )
+    with _lock:
+        anterior = _montados.get(pasta)
+    if anterior is not None and anterior[0] == particoes:
+        if anterior[2].equals(atual):
+            return anterior[3]
+        fechado = anterior[1]
+    else:
+        fechado = juntar([_ler_particao(caminho) for _, caminho, _ in particoes])
+    snapshot = juntar([fechado, atual])
+    with _lock:
+        _montados[pasta] = (particoes, fechado, atual, snapshot)
+    return snapshot
+
+
+# --------------------------------------------------
+# Carga
+# --------------------------------------------------
+def carregador(nome, url, carregar, colunas):
+    """carregar(origem, pular_anos=...) com o histórico de nome -> função que
+    recebe só a origem, como as de dados.registro.DATASETS.
+
+    Planilhas sem ano (ou com o histórico desligado) ficam como estão.
+    """
+    if not DIRETORIO or nome not in COLUNA_ANO:
+        return carregar
+    pasta = _pasta(nome, url, colunas)
+    coluna = COLUNA_ANO[nome]
+
+    def carregar_com_historico(origem):
+        limite = ano_limite()
+        congelados = {
+            ano: caminho
+            for ano, caminho in _congelados(pasta).items()
+            if ano < limite
+        }
+        df = carregar(origem, pular_anos=frozenset(congelados))
+
+        anos = list(congelados)
+        maior = df[coluna].max()
+        if pd.notna(maior):
+            anos.append(int(maior))
+        if not anos:
+            return df
+        corrente = min(limite, max(anos))
+        fechados = df[coluna].lt(corrente)
+        for ano in sorted(df.loc[fechados, coluna].unique()):
+            ano = int(ano)
+            congelados[ano] = _congelar(
+                pasta, ano, _so_usadas(df[df[coluna] == ano])
+            )
+        if not congelados:
+            return df
+        return _montar(
+            pasta, congelados, _so_usadas(df[~fechados]).reset_index(drop=True)
+        )
+
+    return carregar_com_historico
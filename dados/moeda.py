@@ -0,0 +1,42 @@
+# dados/moeda.py
+
+# Conversão e formatação de valores monetários no padrão pt-BR
+#
+# Nos snapshots, os valores em reais ficam em centavos inteiros (int64; ver
+# dados.esquemas): somas e agrupamentos são exatos, sem o erro de
+# arredondamento do float nos totais grandes. A conversão para reais só
+# acontece na saída: fmt_centavos para o texto da tela e dos PDFs, reais
+# para gráficos e exportações.
+
+import pandas as pd
+
+CENTAVOS_POR_REAL = 100
+
+
+def conv_moeda(valor):
+    if isinstance(valor, str):
+        v = (
+            valor.replace("R$", "")
+            .replace(".", "")
+            .replace(",", ".")
+            .strip()
+        )
+        return float(v) if v not in ["", "-"] else 0.0
+    return float(valor) if pd.notna(valor) else 0.0
+
+
+def fmt_moeda(v):
+    return f"R$ {v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def fmt_centavos(c):
+    """Valor em centavos (inteiro) -> "R$ 1.234,56", sem passar por float."""
+    c = int(c)
+    reais_, centavos = divmod(abs(c), CENTAVOS_POR_REAL)
+    sinal = "-" if c < 0 else ""
+    return f"R$ {sinal}{reais_:,}".replace(",", ".") + f",{centavos:02d}"
+
+
+def reais(centavos):
+    """Centavos -> reais (float); aceita número, Series ou array."""
+    return centavos / CENTAVOS_POR_REAL
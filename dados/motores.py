@@ -0,0 +1,298 @@
+# dados/motores.py
+
+# Motores de consulta dos painéis de dotação e execução.
+#
+# consultar(nome, df, condicoes) devolve uma consulta sobre o snapshot df
+# da planilha nome, com os filtros de igualdade de condicoes ({coluna:
+# valor}; valores vazios não filtram, como nos filtros das páginas):
+#   linhas():                 linhas filtradas (DataFrame do pandas);
+#   somar(colunas):           {coluna: soma} das linhas filtradas (as
+#                             colunas são de valores em centavos, int64, e
+#                             as somas são int);
+#   somar_por(grupo, coluna): DataFrame [grupo, coluna] com a soma por
+#                             grupo, ordenado pelo grupo, como
+#                             groupby(grupo, as_index=False,
+#                             observed=True)[coluna].sum().
+#
+# O motor de cada planilha vem de PAINEL_MOTOR_<NOME> (por exemplo,
+# PAINEL_MOTOR_EXECUCAO_TED=duckdb):
+#   pandas (padrão): máscaras e groupby sobre o DataFrame;
+#   duckdb:          o snapshot é convertido uma vez para uma tabela Arrow e
+#                    lido por um DuckDB em memória sem cópia; filtros e somas
+#                    rodam como SQL parametrizado, em várias threads. Para
+#                    linhas(), o DuckDB só devolve as posições das linhas
+#                    filtradas, tiradas do próprio snapshot com take (sem
+#                    converter texto de volta para objetos Python; o resultado
+#                    é idêntico ao do pandas). A tabela Arrow é uma segunda
+#                    cópia do snapshot na memória.
+#   polars:          o snapshot é convertido uma vez para um DataFrame do
+#                    Polars, e filtros e somas rodam no motor lazy dele, em
+#                    várias threads. Como no DuckDB, linhas() só pega as
+#                    posições e tira as linhas do snapshot com take.
+# Como os valores são centavos inteiros, as somas dos três motores são
+# idênticas, em qualquer ordem.
+# Nas planilhas com cubo (dados.cubos), somar e somar_por saem do cubo
+# quando os filtros e o grupo são dimensões dele, em qualquer motor; quem só
+# pede linhas() não monta cubo.
+# Sem o duckdb ou o polars instalado, a planilha fica no pandas (com um aviso
+# no log).
+
+import importlib.util
+import logging
+import os
+import threading
+import weakref
+
+import numpy as np
+
+from dados import cubos
+from monitoramento.etapas import etapa
+
+log = logging.getLogger(__name__)
+
+
+def motor(nome):
+    return os.environ.get(f"PAINEL_MOTOR_{nome.upper()}", "pandas")
+
+
+def consultar(nome, df, condicoes):
+    condicoes = {coluna: valor for coluna, valor in condicoes.items() if valor}
+    escolhido = motor(nome)
+    if escolhido not in MOTORES:
+        raise ValueError(f"motor de consulta desconhecido para {nome}: {escolhido}")
+    if escolhido != "pandas" and _disponivel(escolhido):
+        consulta = MOTORES[escolhido](nome, df, condicoes)
+    else:
+        consulta = ConsultaPandas(df, condicoes)
+    if nome in cubos.CUBOS:
+        return ConsultaCubo(consulta, nome, df, condicoes)
+    return consulta
+
+
+def consulta_de(dados):
+    """dados já filtrados (DataFrame) ou uma consulta -> consulta."""
+    if isinstance(
+        dados, (ConsultaPandas, ConsultaDuckDB, ConsultaPolars, ConsultaCubo)
+    ):
+        return dados
+    return ConsultaPandas(dados, {})
+
+
+_avisados = set()
+
+
+def _disponivel(escolhido):
+    if importlib.util.find_spec(escolhido) is not None:
+        return True
+    if escolhido not in _avisados:
+        log.warning("%s não instalado; consultas continuam no pandas", escolhido)
+        _avisados.add(escolhido)
+    return False
+
+
+# --------------------------------------------------
+# pandas
+# --------------------------------------------------
+class ConsultaPandas:
+    def __init__(self, df, condicoes):
+        self._df = df
+        self._condicoes = condicoes
+        self._linhas = None
+
+    def linhas(self):
+        if self._linhas is None:
+            with etapa("filtro"):
+                dff = self._df
+                for coluna, valor in self._condicoes.items():
+                    dff = dff[dff[coluna] == valor]
+                self._linhas = dff
+        return self._linhas
+
+    def somar(self, colunas):
+        dff = self.linhas()
+        with etapa("agregacao"):
+            return {c: int(dff[c].sum()) for c in colunas}
+
+    def somar_por(self, grupo, coluna):
+        dff = self.linhas()
+        with etapa("agregacao"):
+            return dff.groupby(grupo, as_index=False, observed=True)[coluna].sum()
+
+
+# --------------------------------------------------
+# DuckDB
+# --------------------------------------------------
+_tabelas = {}  # nome -> (referência fraca ao snapshot, tabela Arrow, conexão)
+_trava = threading.Lock()
+
+
+def _cursor(nome, df):
+    # Uma tabela Arrow e uma conexão por planilha, refeitas quando o snapshot
+    # muda. Cada consulta usa um cursor próprio (as conexões do DuckDB não
+    # são compartilháveis entre threads), e a tabela registrada num cursor
+    # só vale para ele.
+    import duckdb
+    import pyarrow as pa
+
+    with _trava:
+        atual = _tabelas.get(nome)
+        if atual is None or atual[0]() is not df:
+            tabela = pa.Table.from_pandas(df, preserve_index=False).append_column(
+                "__linha", pa.array(np.arange(len(df)))
+            )
+            atual = (weakref.ref(df), tabela, duckdb.connect())
+            _tabelas[nome] = atual
+    cursor = atual[2].cursor()
+    cursor.register("snapshot", atual[1])
+    return cursor
+
+
+def _coluna(nome):
+    return '"' + nome.replace('"', '""') + '"'
+
+
+class ConsultaDuckDB:
+    def __init__(self, nome, df, condicoes):
+        self._nome = nome
+        self._df = df
+        self._onde = " AND ".join(f"{_coluna(c)} = ?" for c in condicoes) or "TRUE"
+        self._parametros = list(condicoes.values())
+        self._linhas = None if condicoes else df
+
+    def _executar(self, sql):
+        cursor = _cursor(self._nome, self._df)
+        try:
+            return cursor.execute(sql, self._parametros).df()
+        finally:
+            cursor.close()
+
+    def linhas(self):
+        if self._linhas is None:
+            with etapa("filtro"):
+                posicoes = self._executar(
+                    f"SELECT __linha FROM snapshot WHERE {self._onde} "
+                    "ORDER BY __linha"
+                )["__linha"].to_numpy()
+                self._linhas = self._df.take(posicoes)
+        return self._linhas
+
+    def somar(self, colunas):
+        with etapa("agregacao"):
+            somas = ", ".join(
+                # SUM de BIGINT dá HUGEINT, que viria como float para o pandas
+                f"COALESCE(SUM({_coluna(c)}), 0)::BIGINT AS {_coluna(c)}"
+                for c in colunas
+            )
+            resultado = self._executar(
+                f"SELECT {somas} FROM snapshot WHERE {self._onde}"
+            )
+        return {c: int(resultado[c].iloc[0]) for c in colunas}
+
+    def somar_por(self, grupo, coluna):
+        g, c = _coluna(grupo), _coluna(coluna)
+        with etapa("agregacao"):
+            return self._executar(
+                f"SELECT {g}, COALESCE(SUM({c}), 0)::BIGINT AS {c} FROM snapshot "
+                f"WHERE {self._onde} AND {g} IS NOT NULL "
+                f"GROUP BY {g} ORDER BY {g}"
+            )
+
+
+# --------------------------------------------------
+# Polars
+# --------------------------------------------------
+_quadros = {}  # nome -> (referência fraca ao snapshot, DataFrame do Polars)
+
+
+def _quadro(nome, df):
+    import polars as pl
+
+    with _trava:
+        atual = _quadros.get(nome)
+        if atual is None or atual[0]() is not df:
+            quadro = pl.from_pandas(df).with_row_index("__linha")
+            atual = (weakref.ref(df), quadro)
+            _quadros[nome] = atual
+    return atual[1].lazy()
+
+
+class ConsultaPolars:
+    def __init__(self, nome, df, condicoes):
+        import polars as pl
+
+        self._nome = nome
+        self._df = df
+        self._onde = pl.lit(True)
+        for coluna, valor in condicoes.items():
+            self._onde &= pl.col(coluna) == valor
+        self._linhas = None if condicoes else df
+
+    def _filtrado(self):
+        return _quadro(self._nome, self._df).filter(self._onde)
+
+    def linhas(self):
+        if self._linhas is None:
+            with etapa("filtro"):
+                posicoes = (
+                    self._filtrado().select("__linha").collect()["__linha"].to_numpy()
+                )
+                self._linhas = self._df.take(posicoes)
+        return self._linhas
+
+    def somar(self, colunas):
+        import polars as pl
+
+        with etapa("agregacao"):
+            resultado = self._filtrado().select(pl.col(colunas).sum()).collect()
+        return {c: int(resultado[c][0]) for c in colunas}
+
+    def somar_por(self, grupo, coluna):
+        import polars as pl
+
+        with etapa("agregacao"):
+            return (
+                self._filtrado()
+                .filter(pl.col(grupo).is_not_null())
+                .group_by(grupo)
+                .agg(pl.col(coluna).sum())
+                .sort(grupo)
+                .collect()
+                .to_pandas()
+            )
+
+
+# --------------------------------------------------
+# Cubo
+# --------------------------------------------------
+class ConsultaCubo:
+    # Somas pelo cubo quando ele cobre a consulta; o resto vai ao motor. O
+    # cubo só é obtido (e montado, se preciso) na primeira soma que ele cobre
+    def __init__(self, consulta, nome, df, condicoes):
+        self._consulta = consulta
+        self._nome = nome
+        self._df = df
+        self._condicoes = condicoes
+
+    def linhas(self):
+        return self._consulta.linhas()
+
+    def somar(self, colunas):
+        if not cubos.cobre(self._nome, self._condicoes):
+            return self._consulta.somar(colunas)
+        with etapa("agregacao"):
+            cubo = cubos.obter(self._nome, self._df)
+            return cubo.somar(self._condicoes, colunas)
+
+    def somar_por(self, grupo, coluna):
+        if not cubos.cobre(self._nome, [*self._condicoes, grupo]):
+            return self._consulta.somar_por(grupo, coluna)
+        with etapa("agregacao"):
+            cubo = cubos.obter(self._nome, self._df)
+            return cubo.somar_por(self._condicoes, grupo, coluna)
+
+
+MOTORES = {
+    "pandas": ConsultaPandas,
+    "duckdb": ConsultaDuckDB,
+    "polars": ConsultaPolars,
+}
@@ -0,0 +1,249 @@
+# dados/planilhas.py
+
+# Carga e tratamento das planilhas (Google Sheets exportadas em CSV)
+#
+# Cada função carregar_* lê a planilha da URL correspondente, ou de origem
+# (caminho ou buffer com o CSV já baixado), com os tipos declarados em
+# dados.esquemas, e acrescenta as colunas derivadas (ano e mês). Com
+# colunas (a lista de dados.registro.COLUNAS), o snapshot fica só com elas:
+# o CSV é lido só com essas colunas e as usadas para derivar as demais, que
+# são descartadas depois. pular_anos (das planilhas com ano; ver
+# dados.historico) descarta as linhas desses anos antes das conversões.
+#
+# O leitor de cada planilha vem de PAINEL_LEITOR_<NOME> (por exemplo,
+# PAINEL_LEITOR_PAGAMENTOS=polars):
+#   pandas (padrão): dados.esquemas.ler_csv (pyarrow.csv), como abaixo;
+#   polars:          dados.planilhas_polars, com o mesmo resultado (um
+#                    DataFrame do pandas idêntico), em várias threads.
+# Sem o polars instalado, a planilha fica no pandas (com um aviso no log).
+
+import importlib.util
+import logging
+import os
+from urllib.parse import quote
+
+from dados import esquemas
+
+log = logging.getLogger(__name__)
+
+
+# --------------------------------------------------
+# URLs das planilhas
+# --------------------------------------------------
+# nome -> (id da planilha no Google Sheets, aba)
+PLANILHAS = {
+    "passagens": (
+        "1QJFSLpVO0bI-bsNdgiTWl8rOh1_h6_B7Q8F_SW66_yc",
+        "Passagens - DCF",
+    ),
+    "pagamentos": (
+        "1KEEohPamH36URHpPjFjpVmSNOoK3429erayoPv6fcDo",
+        "Pagamentos Efetivados",
+    ),
+    "dotacao": (
+        "1MkiWDH-MBnLeSUlqV91qjzCVRTlTAVh9xYooENJ151o",
+        "Dotacao Atualizada e Destaques Recebidos",
+    ),
+    "execucao_unifei": (
+        "1MkiWDH-MBnLeSUlqV91qjzCVRTlTAVh9xYooENJ151o",
+        "Execucao do Orcamento Unifei",
+    ),
+    "execucao_ted": (
+        "1MkiWDH-MBnLeSUlqV91qjzCVRTlTAVh9xYooENJ151o",
+        "Execucao do Orcamento TED",
+    ),
+    "naturezas": (
+        "1ofT3KdBLI26nDp2SsYePjAgaDIObHT3WDZRwb34g2EU",
+        "TODOS201",
+    ),
+}
+
+# O endereço do Google Sheets pode ser trocado por ambiente com
+# PAINEL_SHEETS_BASE (por exemplo, pelo servidor local de
+# ferramentas/servidor_planilhas.py), e cada URL pode ser trocada inteira
+# com PAINEL_URL_<NOME> (PAINEL_URL_PASSAGENS, PAINEL_URL_DOTACAO, ...).
+BASE_SHEETS = os.environ.get("PAINEL_SHEETS_BASE", "https://docs.google.com")
+
+
+def url_gviz(planilha, aba, base=BASE_SHEETS):
+    return (
+        f"{base.rstrip('/')}/spreadsheets/d/{planilha}/"
+        f"gviz/tq?tqx=out:csv&sheet={quote(aba)}"
+    )
+
+
+def _url(nome):
+    padrao = url_gviz(*PLANILHAS[nome])
+    return os.environ.get(f"PAINEL_URL_{nome.upper()}", padrao)
+
+
+URL_PASSAGENS = _url("passagens")
+URL_PAGAMENTOS = _url("pagamentos")
+URL_DOTACAO = _url("dotacao")
+URL_EXECUCAO_UNIFEI = _url("execucao_unifei")
+URL_EXECUCAO_TED = _url("execucao_ted")
+URL_NATUREZAS = _url("naturezas")
+
+
+def urls():
+    """URL de cada planilha, pelo nome usado em dados.registro."""
+    return {
+        "passagens": URL_PASSAGENS,
+        "pagamentos": URL_PAGAMENTOS,
+        "dotacao": URL_DOTACAO,
+        "execucao_unifei": URL_EXECUCAO_UNIFEI,
+        "execucao_ted": URL_EXECUCAO_TED,
+        "naturezas": URL_NATUREZAS,
+    }
+
+
+# --------------------------------------------------
+# Leitor (pandas ou polars)
+# --------------------------------------------------
+_avisado = False
+
+
+def leitor(nome):
+    global _avisado
+    escolhido = os.environ.get(f"PAINEL_LEITOR_{nome.upper()}", "pandas")
+    if escolhido not in ("pandas", "polars"):
+        raise ValueError(f"leitor desconhecido para {nome}: {escolhido}")
+    if escolhido == "polars" and importlib.util.find_spec("polars") is None:
+        if not _avisado:
+            log.warning("polars não instalado; planilhas continuam no pandas")
+            _avisado = True
+        return "pandas"
+    return escolhido
+
+
+def _polars(nome):
+    # Módulo do leitor polars, importado só quando escolhido
+    if leitor(nome) != "polars":
+        return None
+    from dados import planilhas_polars
+
+    return planilhas_polars
+
+
+# --------------------------------------------------
+# Colunas do snapshot
+# --------------------------------------------------
+def _com_origens(colunas, *origens):
+    # Colunas a ler: as pedidas e as usadas para derivar as demais
+    return None if colunas is None else [*colunas, *origens]
+
+
+def _podar(nome, df, colunas):
+    # Descarta as colunas lidas só para derivar outras
+    mantidas = esquemas.colunas_mantidas(nome, df.columns, colunas)
+    if len(mantidas) == len(df.columns):
+        return df
+    return df[mantidas]
+
+
+# Colunas monetárias comuns às planilhas de execução (UNIFEI e TED)
+COLUNAS_EXECUCAO = [
+    "DESPESAS INSCRITAS EM RP NAO PROCESSADOS",
+    "DESPESAS EMPENHADAS (CONTROLE EMPENHO)",
+    "DESPESAS LIQUIDADAS (CONTROLE EMPENHO)",
+    "DESPESAS LIQUIDADAS A PAGAR(CONTROLE EMPENHO)",
+    "DESPESAS PAGAS (CONTROLE EMPENHO)",
+]
+
+MAPA_MESES = {
+    "JANEIRO": 1,
+    "FEVEREIRO": 2,
+    "MARÇO": 3,
+    "MARCO": 3,
+    "ABRIL": 4,
+    "MAIO": 5,
+    "JUNHO": 6,
+    "JULHO": 7,
+    "AGOSTO": 8,
+    "SETEMBRO": 9,
+    "OUTUBRO": 10,
+    "NOVEMBRO": 11,
+    "DEZEMBRO": 12,
+}
+
+
+# --------------------------------------------------
+# Passagens DCF
+# --------------------------------------------------
+def carregar_passagens(origem=None, colunas=None, pular_anos=()):
+    origem = URL_PASSAGENS if origem is None else origem
+    if rapido := _polars("passagens"):
+        return rapido.carregar_passagens(origem, colunas, pular_anos)
+    df = esquemas.ler_csv(
+        "passagens",
+        origem,
+        _com_origens(colunas, "Data Início da Viagem"),
+        pular_anos,
+    )
+    df["Ano"] = df["Data Início da Viagem"].dt.year
+    df["Mes"] = df["Data Início da Viagem"].dt.month
+    return _podar("passagens", df, colunas)
+
+
+# --------------------------------------------------
+# Pagamentos Efetivados
+# --------------------------------------------------
+def carregar_pagamentos(origem=None, colunas=None, pular_anos=()):
+    origem = URL_PAGAMENTOS if origem is None else origem
+    if rapido := _polars("pagamentos"):
+        return rapido.carregar_pagamentos(origem, colunas, pular_anos)
+    df = esquemas.ler_csv(
+        "pagamentos", origem, _com_origens(colunas, "ANO", "MÊS"), pular_anos
+    )
+    df["Ano"] = df["ANO"].astype(int)
+    df["Mes"] = df["MÊS"].astype(str).str.upper().map(MAPA_MESES)
+    return _podar("pagamentos", df, colunas)
+
+
+# --------------------------------------------------
+# Dotação Atualizada e Destaques Recebidos
+# --------------------------------------------------
+def carregar_dotacao(origem=None, colunas=None, pular_anos=()):
+    origem = URL_DOTACAO if origem is None else origem
+    if rapido := _polars("dotacao"):
+        return rapido.carregar_dotacao(origem, colunas, pular_anos)
+    df = esquemas.ler_csv("dotacao", origem, colunas, pular_anos)
+    return _podar("dotacao", df, colunas)
+
+
+# --------------------------------------------------
+# Execução do Orçamento (UNIFEI e TED)
+# --------------------------------------------------
+def _carregar_execucao(nome, origem, colunas, pular_anos):
+    if rapido := _polars(nome):
+        return rapido.carregar_execucao(nome, origem, colunas, pular_anos)
+    df = esquemas.ler_csv(nome, origem, colunas, pular_anos)
+    return _podar(nome, df, colunas)
+
+
+def carregar_execucao_unifei(origem=None, colunas=None, pular_anos=()):
+    return _carregar_execucao(
+        "execucao_unifei",
+        URL_EXECUCAO_UNIFEI if origem is None else origem,
+        colunas,
+        pular_anos,
+    )
+
+
+def carregar_execucao_ted(origem=None, colunas=None, pular_anos=()):
+    return _carregar_execucao(
+        "execucao_ted",
+        URL_EXECUCAO_TED if origem is None else origem,
+        colunas,
+        pular_anos,
+    )
+
+
+# --------------------------------------------------
+# Naturezas de Despesa
+# --------------------------------------------------
+def carregar_naturezas(origem=None, colunas=None):
+    origem = URL_NATUREZAS if origem is None else origem
+    if rapido := _polars("naturezas"):
+        return rapido.carregar_naturezas(origem, colunas)
+    return _podar("naturezas", esquemas.ler_csv("naturezas", origem, colunas), colunas)
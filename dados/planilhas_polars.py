@@ -0,0 +1,189 @@
+# dados/planilhas_polars.py
+
+# Carga e tratamento das planilhas com o Polars (ver dados.planilhas.leitor).
+#
+# Cada função carregar_* faz o mesmo que a de dados.planilhas (leitura do
+# CSV com o esquema de dados.esquemas, conversão dos valores em reais e das
+# datas, colunas derivadas), mas com expressões do Polars, que rodam em
+# várias threads, e devolve o mesmo DataFrame do pandas. Para isso:
+#   - o CSV é lido todo como texto, com os mesmos nomes de colunas e valores
+#     ausentes, e cada coluna é convertida para o tipo declarado;
+#   - ausentes em colunas de texto viram NaN (e não None), e as categorias
+#     ficam em ordem alfabética, como em dados.esquemas.
+
+import io
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from dados import esquemas
+from dados.esquemas import CATEGORIA, DATA, FLOAT, INT, MOEDA, TEXTO
+from dados.moeda import CENTAVOS_POR_REAL
+from dados.planilhas import MAPA_MESES
+
+
+# --------------------------------------------------
+# Conversões (as mesmas de dados.esquemas)
+# --------------------------------------------------
+def _moeda(coluna):
+    texto = (
+        pl.col(coluna)
+        .str.replace_all("R$", "", literal=True)
+        .str.replace_all(".", "", literal=True)
+        .str.replace_all(",", ".", literal=True)
+        .str.strip_chars()
+    )
+    return (
+        pl.when(texto.is_in(["", "-"]))
+        .then(None)
+        .otherwise(texto)
+        .cast(pl.Float64)
+        .mul(CENTAVOS_POR_REAL)
+        .round(0, mode="half_to_even")
+        .cast(pl.Int64)
+        .fill_null(0)
+    )
+
+
+def _data(coluna, formato):
+    # Diferente do Arrow, o Polars já dá nulo para dias que não existem. Mas
+    # ele aceita anos com menos de 4 dígitos ("5/5/24" é o ano 24), que
+    # estouram o datetime64[ns]; o pandas dá NaT para datas fora dele
+    datas = pl.col(coluna).str.to_datetime(formato, strict=False, time_unit="us")
+    return (
+        pl.when(datas.is_between(pd.Timestamp.min, pd.Timestamp.max))
+        .then(datas)
+        .otherwise(None)
+        .cast(pl.Datetime("ns"))
+    )
+
+
+def _converter(coluna, tipo, formato):
+    if tipo == INT:
+        return pl.col(coluna).cast(pl.Int64)
+    if tipo == FLOAT:
+        return pl.col(coluna).cast(pl.Float64)
+    if tipo == MOEDA:
+        return _moeda(coluna)
+    if tipo == DATA:
+        return _data(coluna, formato)
+    return None
+
+
+# --------------------------------------------------
+# Leitura
+# --------------------------------------------------
+def _ler(nome, origem, colunas, pular_anos=()):
+    # DataFrame do Polars com os tipos do esquema (categorias ainda como
+    # texto; ver _pandas)
+    esquema = esquemas.ESQUEMAS[nome]
+    tipos = esquema["colunas"]
+    formato = esquema.get("formato_data", esquemas.FORMATO_DATA)
+    if pular_anos and colunas is not None:
+        colunas = [*colunas, esquema["ano"]]
+
+    dados = esquemas.conteudo(origem)
+    nomes = esquemas.cabecalho(dados)
+    lidas = esquemas.colunas_lidas(nome, nomes, colunas)
+    df = pl.read_csv(
+        io.BytesIO(dados),
+        new_columns=nomes,
+        columns=lidas,
+        null_values=esquemas.NA_PANDAS,
+        infer_schema_length=0,  # tudo como texto
+    )
+    if pular_anos:
+        # Como em dados.esquemas: descarta os anos antes das conversões
+        coluna = esquema["ano"]
+        if tipos[coluna] == DATA:
+            ano = _data(coluna, formato).dt.year()
+        else:
+            ano = pl.col(coluna).cast(pl.Int64, strict=False)
+        df = df.filter(~ano.is_in(sorted(pular_anos)).fill_null(False))
+    for coluna in lidas:
+        expressao = _converter(coluna, tipos[coluna], formato)
+        if expressao is None:
+            continue
+        expressao = expressao.alias(coluna)
+        try:
+            df = df.with_columns(expressao)
+        except pl.exceptions.InvalidOperationError as erro:
+            raise esquemas.EsquemaInvalido(
+                # Só a primeira linha (o resto é a expressão inteira)
+                f"planilha {nome}, coluna {coluna!r}: {str(erro).splitlines()[0]}"
+            ) from None
+    return df.rename(esquema.get("renomear", {}))
+
+
+def _categoria(serie):
+    # Categorias em ordem alfabética, como em dados.esquemas
+    valores = serie.unique().drop_nulls().sort()
+    codigos = (
+        serie.replace_strict(
+            valores, pl.int_range(len(valores), eager=True), default=-1
+        )
+        .fill_null(-1)
+        .to_numpy()
+    )
+    return pd.Categorical.from_codes(codigos, valores.to_list())
+
+
+def _pandas(nome, df, colunas):
+    df = df.select(esquemas.colunas_mantidas(nome, df.columns, colunas))
+    esquema = esquemas.ESQUEMAS[nome]
+    renomear = esquema.get("renomear", {})
+    tipos = {renomear.get(c, c): t for c, t in esquema["colunas"].items()}
+
+    categorias = [c for c in df.columns if tipos.get(c) == CATEGORIA]
+    pdf = df.drop(categorias).to_pandas()
+    for coluna in categorias:
+        pdf.insert(df.columns.index(coluna), coluna, _categoria(df[coluna]))
+    for coluna in pdf.columns:
+        if tipos.get(coluna) == TEXTO:
+            pdf[coluna] = pdf[coluna].where(pdf[coluna].notna(), np.nan)
+    return pdf
+
+
+# --------------------------------------------------
+# Planilhas
+# --------------------------------------------------
+def carregar_passagens(origem, colunas=None, pular_anos=()):
+    lidas = None if colunas is None else [*colunas, "Data Início da Viagem"]
+    df = _ler("passagens", origem, lidas, pular_anos)
+    df = df.with_columns(
+        # int32, como o .dt do pandas (o Polars dá int8 para o mês)
+        pl.col("Data Início da Viagem").dt.year().cast(pl.Int32).alias("Ano"),
+        pl.col("Data Início da Viagem").dt.month().cast(pl.Int32).alias("Mes"),
+    )
+    return _pandas("passagens", df, colunas)
+
+
+def carregar_pagamentos(origem, colunas=None, pular_anos=()):
+    lidas = None if colunas is None else [*colunas, "ANO", "MÊS"]
+    df = _ler("pagamentos", origem, lidas, pular_anos)
+    if df["ANO"].null_count():
+        # O pandas falha em astype(int) com anos vazios; aqui também
+        raise ValueError("coluna ANO com valores vazios")
+    df = df.with_columns(
+        pl.col("ANO").alias("Ano"),
+        pl.col("MÊS")
+        .fill_null("nan")
+        .str.to_uppercase()
+        .replace_strict(MAPA_MESES, default=None, return_dtype=pl.Int64)
+        .alias("Mes"),
+    )
+    return _pandas("pagamentos", df, colunas)
+
+
+def carregar_dotacao(origem, colunas=None, pular_anos=()):
+    df = _ler("dotacao", origem, colunas, pular_anos)
+    return _pandas("dotacao", df, colunas)
+
+
+def carregar_execucao(nome, origem, colunas=None, pular_anos=()):
+    return _pandas(nome, _ler(nome, origem, colunas, pular_anos), colunas)
+
+
+def carregar_naturezas(origem, colunas=None):
+    return _pandas("naturezas", _ler("naturezas", origem, colunas), colunas)
@@ -0,0 +1,345 @@
+# dados/registro.py
+
+# Registro das planilhas do painel e cache dos snapshots carregados.
+#
+# Cada planilha tem um nome curto, uma função de carga e as colunas que o
+# painel usa (COLUNAS). O snapshot atual fica em memória (um por processo)
+# e pode ser salvo/restaurado em disco, o que permite a scripts de linha de
+# comando baixar as planilhas uma vez e reaproveitá-las em várias
+# execuções. A versão de cada planilha só muda
+# quando um snapshot com conteúdo diferente é definido, e serve de chave
+# para caches derivados (layouts, por exemplo).
+#
+# As planilhas são baixadas em paralelo (dados.download). O app não baixa
+# nada no import: carregar_em_segundo_plano() dispara a carga numa thread e
+# as páginas mostram um aviso de "carregando" enquanto pronto(nome) for
+# falso. Depois da primeira carga, revalidar() atualiza os snapshots velhos
+# em segundo plano, sem bloquear quem está usando o snapshot atual. Os anos
+# fechados de cada planilha ficam congelados em disco (dados.historico) e não
+# são convertidos de novo a cada atualização. Um snapshot novo é comparado
+# linha a linha com o atual (dados.diferencas): sem mudanças, a versão fica
+# a mesma; com poucas, os cubos (dados.cubos) são atualizados só com elas.
+
+import functools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from dados import cubos, diferencas, download, historico, planilhas
+
+
+# Colunas que as páginas, relatórios e exportações usam de cada planilha (já
+# com os nomes do snapshot, incluindo as derivadas). Só elas são lidas do
+# CSV e ficam em memória; uma coluna nova numa página precisa entrar aqui.
+_EXECUCAO = [
+    "Ano",
+    "Mês",
+    "Fonte Recursos Detalhada",
+    "GRUPO DESP",
+    "NAT DESP",
+    "Natureza Despesa",
+    *planilhas.COLUNAS_EXECUCAO,
+]
+
+COLUNAS = {
+    "passagens": [
+        "Unidade (Viagem)",
+        "Número da PCDP",
+        "Data Início da Viagem",
+        "Valor das Diárias",
+        "Valor da Viagem",
+        "Valor da Passagem",
+        "Valor Seguro Viagem",
+        "Valor Restituição",
+        "Custo com emissão de passagens dentro do prazo",
+        "Custo com emissão de passagens em caráter de urgência",
+        "Ano",
+        "Mes",
+    ],
+    "pagamentos": [
+        "DT ATESTE",
+        "DT PGTO",
+        "Valor",
+        "FONTE",
+        "LISTAS",
+        "RAZÃO SOCIAL",
+        "Ano",
+        "Mes",
+    ],
+    "dotacao": [
+        "GRUPO DA DESPESA",
+        "ANO",
+        "UNIDADE ORÇAMENTÁRIA",
+        "Fonte Recursos Detalhada",
+        "DOTACAO ATUALIZADA",
+        "DESTAQUE RECEBIDO",
+    ],
+    "execucao_unifei": ["UG Executora", *_EXECUCAO],
+    "execucao_ted": ["Unidade Orçamentária", "UG EXEC", "FRD", *_EXECUCAO],
+    "naturezas": ["ND SOF", "TITULO"],
+}
+
+DATASETS = {
+    nome: functools.partial(carregar, colunas=COLUNAS[nome])
+    for nome, carregar in [
+        ("passagens", planilhas.carregar_passagens),
+        ("pagamentos", planilhas.carregar_pagamentos),
+        ("dotacao", planilhas.carregar_dotacao),
+        ("execucao_unifei", planilhas.carregar_execucao_unifei),
+        ("execucao_ted", planilhas.carregar_execucao_ted),
+        ("naturezas", planilhas.carregar_naturezas),
+    ]
+}
+
+# Idade a partir da qual revalidar() agenda uma nova carga
+IDADE_MAXIMA = 5 * 60  # segundos
+
+_snapshots = {}
+_versoes = {}
+_atualizados = {}
+_erros = {}
+_carregando = {}
+_lock = threading.Lock()
+
+log = logging.getLogger(__name__)
+
+
+# --------------------------------------------------
+# Snapshots em memória
+# --------------------------------------------------
+def obter(nome):
+    """Snapshot atual da planilha, carregado na primeira chamada."""
+    df = _snapshots.get(nome)
+    if df is None:
+        df = recarregar(nome)
+    return df
+
+
+def obter_varias(nomes):
+    """Como obter(), mas baixa as planilhas que faltam todas de uma vez."""
+    faltando = [nome for nome in nomes if nome not in _snapshots]
+    if faltando:
+        for resultado in recarregar_varias(faltando).values():
+            if isinstance(resultado, Exception):
+                raise resultado
+    return {nome: obter(nome) for nome in nomes}
+
+
+def recarregar(nome):
+    resultado = recarregar_varias([nome])[nome]
+    if isinstance(resultado, Exception):
+        raise resultado
+    return resultado
+
+
+def recarregar_varias(nomes=None, ao_concluir=None):
+    """Baixa as planilhas em paralelo e atualiza os snapshots.
+
+    Retorna {nome: DataFrame}, com a exceção no lugar das que falharam (uma
+    falha não impede as demais). ao_concluir(nome, resultado) é chamado à
+    medida que cada planilha termina.
+    """
+    urls = planilhas.urls()
+    tarefas = {
+        nome: (
+            urls[nome],
+            historico.carregador(nome, urls[nome], DATASETS[nome], COLUNAS[nome]),
+        )
+        for nome in nomes or DATASETS
+    }
+
+    def concluir(nome, resultado):
+        try:
+            if isinstance(resultado, Exception):
+                with _lock:
+                    _erros[nome] = resultado
+            else:
+                definir(nome, resultado)
+                with _lock:
+                    _erros.pop(nome, None)
+        except Exception as exc:
+            # Fica o snapshot anterior; download.carregar devolve a exceção
+            with _lock:
+                _erros[nome] = exc
+            resultado = exc
+            raise
+        finally:
+            if ao_concluir is not None:
+                ao_concluir(nome, resultado)
+
+    return download.carregar(tarefas, concluir)
+
+
+def definir(nome, df, atualizado_em=None):
+    with _lock:
+        _atualizados[nome] = atualizado_em or time.time()
+        atual = _snapshots.get(nome)
+    if atual is df:
+        return  # o mesmo snapshot (dados.historico, sem mudança no ano corrente)
+    if atual is not None:
+        diferenca = diferencas.diferenca(nome, atual, df)
+        if diferenca is None:
+            if atual.equals(df):
+                return
+        elif not diferencas.tamanho(diferenca):
+            # As mesmas linhas (talvez em outra ordem): fica o atual
+            return
+        else:
+            log.info(
+                "planilha %s: %d inseridas, %d removidas, %d atualizadas",
+                nome,
+                len(diferenca.inseridas),
+                len(diferenca.removidas),
+                len(diferenca.atualizadas_novo),
+            )
+        cubos.atualizar(nome, atual, df, diferenca)
+    cubos.vigente(nome, df)
+    with _lock:
+        _snapshots[nome] = df
+        _versoes[nome] = _versoes.get(nome, 0) + 1
+
+
+def carregados():
+    """{nome: snapshot} das planilhas já carregadas (sem disparar cargas)."""
+    with _lock:
+        return dict(_snapshots)
+
+
+def versao(nome=None):
+    """Contador que muda sempre que o conteúdo do snapshot muda.
+
+    Sem nome, retorna a versão de todas as planilhas (para caches que
+    dependem de mais de uma).
+    """
+    if nome is None:
+        return tuple(_versoes.get(n, 0) for n in DATASETS)
+    return _versoes.get(nome, 0)
+
+
+# --------------------------------------------------
+# Carga em segundo plano
+# --------------------------------------------------
+_executor = None
+
+
+def _concluir_carga(nome, resultado):
+    if isinstance(resultado, Exception):
+        log.warning("falha ao carregar a planilha %s: %s", nome, resultado)
+    with _lock:
+        _carregando.pop(nome, None)
+
+
+def _carregar_lote(nomes):
+    try:
+        recarregar_varias(nomes, _concluir_carga)
+    except Exception as exc:
+        for nome in nomes:
+            with _lock:
+                _erros[nome] = exc
+            _concluir_carga(nome, exc)
+
+
+def _agendar(nomes, precisa):
+    # Agenda numa thread a carga das planilhas em que precisa(nome) é
+    # verdadeiro e que não estão sendo carregadas
+    global _executor
+    with _lock:
+        pendentes = [n for n in nomes if n not in _carregando and precisa(n)]
+        if pendentes:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="registro"
+                )
+            futuro = _executor.submit(_carregar_lote, pendentes)
+            for nome in pendentes:
+                _carregando[nome] = futuro
+        return dict(_carregando)
+
+
+def carregar_em_segundo_plano(nomes=None):
+    """Dispara a carga das planilhas ainda sem snapshot.
+
+    Não bloqueia: as pendentes são baixadas juntas numa thread; planilhas já
+    carregadas ou em carga são ignoradas, e uma planilha que falhou é
+    tentada de novo na próxima chamada.
+    """
+    return _agendar(nomes or DATASETS, lambda nome: nome not in _snapshots)
+
+
+def revalidar(nomes, idade_maxima=IDADE_MAXIMA):
+    """Agenda a recarga das planilhas com snapshot mais velho que idade_maxima.
+
+    Não bloqueia (stale-while-revalidate): quem chama continua usando o
+    snapshot atual, que é trocado quando a nova carga termina. Se a carga
+    falhar, o snapshot anterior segue em uso.
+    """
+    if isinstance(nomes, str):
+        nomes = [nomes]
+
+    def precisa(nome):
+        idade_atual = idade(nome)
+        return idade_atual is None or idade_atual > idade_maxima
+
+    return _agendar(nomes, precisa)
+
+
+def pronto(nome):
+    return nome in _snapshots
+
+
+def estado(nome):
+    """"pronto", "carregando", "erro" ou None (carga não iniciada)."""
+    if nome in _snapshots:
+        return "pronto"
+    if nome in _carregando:
+        return "carregando"
+    if nome in _erros:
+        return "erro"
+    return None
+
+
+def idade(nome):
+    """Segundos desde a última carga bem-sucedida (None se nunca carregou)."""
+    atualizado_em = _atualizados.get(nome)
+    if atualizado_em is None:
+        return None
+    return time.time() - atualizado_em
+
+
+def ultimo_erro(nome):
+    """Exceção da última tentativa de carga, se ela falhou."""
+    return _erros.get(nome)
+
+
+# --------------------------------------------------
+# Snapshots em disco
+# --------------------------------------------------
+def _caminho(diretorio, nome):
+    return os.path.join(diretorio, f"{nome}.pkl")
+
+
+def salvar_snapshots(diretorio, nomes=None):
+    os.makedirs(diretorio, exist_ok=True)
+    for nome in nomes or DATASETS:
+        obter(nome).to_pickle(_caminho(diretorio, nome))
+
+
+def restaurar_snapshots(diretorio, nomes=None):
+    """Carrega os snapshots salvos em disco; retorna os nomes restaurados."""
+    restaurados = []
+    for nome in nomes or DATASETS:
+        caminho = _caminho(diretorio, nome)
+        if not os.path.exists(caminho):
+            continue
+        df = pd.read_pickle(caminho)
+        if set(df.columns) != set(COLUNAS[nome]):
+            # Salvo por uma versão com outras colunas: carrega de novo
+            log.info("snapshot %s em disco com outras colunas; ignorado", nome)
+            continue
+        definir(nome, df, os.path.getmtime(caminho))
+        restaurados.append(nome)
+    return restaurados
@@ -0,0 +1,4 @@
+# ferramentas/__init__.py
+
+# Ferramentas de desenvolvimento: servidor local das planilhas e gerador de
+# dados sintéticos, usados para testar e medir o painel sem acesso à rede.
@@ -0,0 +1,368 @@
+# ferramentas/gerar_planilhas.py
+
+# Gerador de planilhas sintéticas no formato das planilhas do painel.
+#
+# Uso:
+#   python -m ferramentas.gerar_planilhas --saida fixtures/ --linhas 50000
+#   python -m ferramentas.gerar_planilhas --saida fixtures/ --linhas 1000 \
+#       --linhas-planilha execucao_ted=200000 --anos 2020-2025 --unidades 40
+#
+# Grava <saida>/<nome>.csv para cada planilha de dados.planilhas.PLANILHAS,
+# com os mesmos cabeçalhos e formatos do export do Google Sheets: datas
+# dd/mm/aaaa, meses por extenso, valores monetários como "R$ 1.234,56"
+# (com algumas células vazias ou "-"). Os arquivos servem direto ao
+# ferramentas.servidor_planilhas e aos benchmarks.
+#
+# As categorias (unidades, fontes, naturezas, ...) seguem uma distribuição
+# concentrada (poucas categorias com a maior parte das linhas), e os valores
+# uma lognormal, como nas planilhas reais. A mesma semente gera os mesmos
+# arquivos.
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from dados.moeda import fmt_moeda
+from dados.planilhas import COLUNAS_EXECUCAO
+
+CARDINALIDADES = {
+    "unidades": 12,
+    "ugs": 20,
+    "fontes": 8,
+    "naturezas": 60,
+    "listas": 6,
+    "fornecedores": 500,
+}
+
+PROPORCAO_VAZIOS = 0.02
+
+MESES = [
+    "JANEIRO",
+    "FEVEREIRO",
+    "MARÇO",
+    "ABRIL",
+    "MAIO",
+    "JUNHO",
+    "JULHO",
+    "AGOSTO",
+    "SETEMBRO",
+    "OUTUBRO",
+    "NOVEMBRO",
+    "DEZEMBRO",
+]
+
+GRUPOS = [
+    "3 - OUTRAS DESPESAS CORRENTES",
+    "4 - INVESTIMENTOS",
+    "1 - PESSOAL E ENCARGOS SOCIAIS",
+]
+
+_UNIDADES = [
+    "DCF",
+    "PRPPI",
+    "PROGRAD",
+    "PROEX",
+    "PRAE",
+    "PRGP",
+    "IEST",
+    "IEM",
+    "IEPG",
+    "IRN",
+    "IFQ",
+    "ICE",
+    "CAMPUS ITABIRA",
+]
+
+_NATUREZAS = [
+    "MATERIAL DE CONSUMO",
+    "DIÁRIAS - CIVIL",
+    "PASSAGENS E DESPESAS COM LOCOMOÇÃO",
+    "SERVIÇOS DE TERCEIROS - PESSOA JURÍDICA",
+    "EQUIPAMENTOS E MATERIAL PERMANENTE",
+    "AUXÍLIO FINANCEIRO A ESTUDANTES",
+    "LOCAÇÃO DE MÃO-DE-OBRA",
+    "OBRIGAÇÕES TRIBUTÁRIAS E CONTRIBUTIVAS",
+]
+
+
+# --------------------------------------------------
+# Auxiliares
+# --------------------------------------------------
+def _categorias(base, n, prefixo):
+    nomes = list(base[:n])
+    nomes += [f"{prefixo} {i:03d}" for i in range(len(nomes) + 1, n + 1)]
+    return np.array(nomes, dtype=object)
+
+
+def _sortear(rng, categorias, linhas):
+    # Pesos 1/k: poucas categorias concentram a maior parte das linhas
+    pesos = 1.0 / np.arange(1, len(categorias) + 1)
+    return rng.choice(categorias, size=linhas, p=pesos / pesos.sum())
+
+
+def _valores(rng, linhas, mediana):
+    return np.round(rng.lognormal(np.log(mediana), 1.0, size=linhas), 2)
+
+
+def _moeda(rng, valores):
+    texto = np.array([fmt_moeda(v) for v in valores], dtype=object)
+    vazios = rng.random(len(texto)) < PROPORCAO_VAZIOS
+    texto[vazios] = rng.choice(["", "-"], size=vazios.sum())
+    return texto
+
+
+def _datas(rng, anos, linhas):
+    inicio = np.array([np.datetime64(f"{a}-01-01") for a in anos])
+    ano = rng.integers(0, len(anos), size=linhas)
+    dias = rng.integers(0, 365, size=linhas)
+    return pd.to_datetime(inicio[ano] + dias.astype("timedelta64[D]"))
+
+
+def _naturezas(card):
+    codigos = np.array(
+        [f"3390{i:02d}" for i in range(1, card["naturezas"] + 1)], dtype=object
+    )
+    titulos = _categorias(_NATUREZAS, card["naturezas"], "NATUREZA")
+    return codigos, titulos
+
+
+# --------------------------------------------------
+# Planilhas
+# --------------------------------------------------
+def gerar_passagens(rng, linhas, anos, card):
+    datas = _datas(rng, anos, linhas)
+    df = pd.DataFrame(
+        {
+            "Unidade (Viagem)": _sortear(
+                rng, _categorias(_UNIDADES, card["unidades"], "UNIDADE"), linhas
+            ),
+            "Número da PCDP": [
+                f"{i:06d}/{d.year % 100:02d}"
+                for i, d in zip(range(1, linhas + 1), datas)
+            ],
+            "Data Início da Viagem": datas.strftime("%d/%m/%Y"),
+        }
+    )
+    diarias = _valores(rng, linhas, 400)
+    passagem = _valores(rng, linhas, 900)
+    seguro = _valores(rng, linhas, 30)
+    restituicao = np.where(rng.random(linhas) < 0.1, _valores(rng, linhas, 80), 0)
+    urgente = rng.random(linhas) < 0.2
+
+    df["Valor das Diárias"] = _moeda(rng, diarias)
+    df["Valor da Viagem"] = _moeda(rng, diarias + passagem + seguro)
+    df["Valor da Passagem"] = _moeda(rng, passagem)
+    df["Valor Seguro Viagem"] = _moeda(rng, seguro)
+    df["Valor Restituição"] = _moeda(rng, restituicao)
+    df["Custo com emissão de passagens dentro do prazo"] = _moeda(
+        rng, np.where(urgente, 0, passagem)
+    )
+    df["Custo com emissão de passagens em caráter de urgência"] = _moeda(
+        rng, np.where(urgente, passagem, 0)
+    )
+    return df
+
+
+def gerar_pagamentos(rng, linhas, anos, card):
+    ateste = _datas(rng, anos, linhas)
+    pagamento = ateste + pd.to_timedelta(rng.integers(0, 30, linhas), unit="D")
+    fontes = np.array(
+        [f"{1000 + 100 * i}" for i in range(card["fontes"])], dtype=object
+    )
+    df = pd.DataFrame(
+        {
+            "ANO": ateste.year,
+            "MÊS": np.array(MESES, dtype=object)[ateste.month - 1],
+            "DT ATESTE": ateste.strftime("%d/%m/%Y"),
+            "DT PGTO": pagamento.strftime("%d/%m/%Y"),
+            "Valor": _moeda(rng, _valores(rng, linhas, 3000)),
+            "FONTE": _sortear(rng, fontes, linhas),
+            "LISTAS": _sortear(
+                rng, _categorias([], card["listas"], "LISTA"), linhas
+            ),
+            "RAZÃO SOCIAL": _sortear(
+                rng, _categorias([], card["fornecedores"], "FORNECEDOR"), linhas
+            ),
+        }
+    )
+    # As colunas de data vêm sem cabeçalho no export (viram "Unnamed: 2/3")
+    df.columns = ["ANO", "MÊS", "", ""] + list(df.columns[4:])
+    return df
+
+
+def gerar_dotacao(rng, linhas, anos, card):
+    return pd.DataFrame(
+        {
+            "GRUPO DA DESPESA": _sortear(rng, np.array(GRUPOS, dtype=object), linhas),
+            "ANO": rng.choice(anos, size=linhas),
+            "UNIDADE ORÇAMENTÁRIA": _sortear(
+                rng, _categorias(_UNIDADES, card["unidades"], "UNIDADE"), linhas
+            ),
+            "Fonte Recursos Detalhada": _sortear(
+                rng, _categorias([], card["fontes"], "FONTE"), linhas
+            ),
+            "DOTACAO ATUALIZADA": _moeda(rng, _valores(rng, linhas, 150_000)),
+            "DESTAQUE RECEBIDO": _moeda(rng, _valores(rng, linhas, 20_000)),
+        }
+    )
+
+
+def _gerar_execucao(rng, linhas, anos, card, colunas_unidade):
+    codigos, titulos = _naturezas(card)
+    natureza = rng.choice(len(codigos), size=linhas)
+    fontes = _categorias([], card["fontes"], "FONTE")
+    fonte = rng.choice(len(fontes), size=linhas)
+
+    df = pd.DataFrame(
+        {
+            coluna: _sortear(rng, _categorias(base, card[chave], prefixo), linhas)
+            for coluna, (base, chave, prefixo) in colunas_unidade.items()
+        }
+    )
+    df["Ano"] = rng.choice(anos, size=linhas)
+    df["Mês"] = np.array(MESES, dtype=object)[rng.integers(0, 12, linhas)]
+    df["Fonte Recursos Detalhada"] = fontes[fonte]
+    df["FRD"] = np.array([f"F{i:02d}" for i in fonte], dtype=object)
+    df["GRUPO DESP"] = _sortear(rng, np.array(GRUPOS, dtype=object), linhas)
+    df["NAT DESP"] = codigos[natureza]
+    df["Natureza Despesa"] = titulos[natureza]
+
+    empenhado = _valores(rng, linhas, 25_000)
+    liquidado = np.round(empenhado * rng.uniform(0.3, 1.0, linhas), 2)
+    pago = np.round(liquidado * rng.uniform(0.5, 1.0, linhas), 2)
+    rp = np.where(rng.random(linhas) < 0.3, _valores(rng, linhas, 5_000), 0)
+    for coluna, valores in zip(
+        COLUNAS_EXECUCAO, [rp, empenhado, liquidado, liquidado - pago, pago]
+    ):
+        df[coluna] = _moeda(rng, valores)
+    return df
+
+
+def gerar_execucao_unifei(rng, linhas, anos, card):
+    return _gerar_execucao(
+        rng,
+        linhas,
+        anos,
+        card,
+        {"UG Executora": ([], "ugs", "UG")},
+    )
+
+
+def gerar_execucao_ted(rng, linhas, anos, card):
+    return _gerar_execucao(
+        rng,
+        linhas,
+        anos,
+        card,
+        {
+            "Unidade Orçamentária": ([], "unidades", "UO"),
+            "UG EXEC": ([], "ugs", "UG"),
+        },
+    )
+
+
+def gerar_naturezas(rng, linhas, anos, card):
+    codigos, titulos = _naturezas({**card, "naturezas": linhas})
+    return pd.DataFrame({"ND SOF": codigos, "TITULO": titulos})
+
+
+GERADORES = {
+    "passagens": gerar_passagens,
+    "pagamentos": gerar_pagamentos,
+    "dotacao": gerar_dotacao,
+    "execucao_unifei": gerar_execucao_unifei,
+    "execucao_ted": gerar_execucao_ted,
+    "naturezas": gerar_naturezas,
+}
+
+
+def gerar(nome, linhas, anos, semente=0, cardinalidades=None):
+    """DataFrame sintético da planilha nome, já no formato do CSV."""
+    card = {**CARDINALIDADES, **(cardinalidades or {})}
+    rng = np.random.default_rng([semente, list(GERADORES).index(nome)])
+    return GERADORES[nome](rng, linhas, list(anos), card)
+
+
+def gerar_todas(saida, linhas, anos, semente=0, cardinalidades=None, nomes=None):
+    """Grava <saida>/<nome>.csv; linhas é um int ou {nome: linhas}."""
+    os.makedirs(saida, exist_ok=True)
+    caminhos = {}
+    for nome in nomes or GERADORES:
+        n = linhas.get(nome, 0) if isinstance(linhas, dict) else linhas
+        df = gerar(nome, n, anos, semente, cardinalidades)
+        caminhos[nome] = os.path.join(saida, f"{nome}.csv")
+        df.to_csv(caminhos[nome], index=False)
+    return caminhos
+
+
+# --------------------------------------------------
+# Linha de comando
+# --------------------------------------------------
+def _anos(texto):
+    if "-" in texto:
+        inicio, fim = texto.split("-")
+        return list(range(int(inicio), int(fim) + 1))
+    return [int(a) for a in texto.split(",")]
+
+
+def _pares(valores, tipo=int):
+    pares = {}
+    for valor in valores or []:
+        chave, _, numero = valor.partition("=")
+        pares[chave] = tipo(numero)
+    return pares
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Gera planilhas sintéticas no formato do painel."
+    )
+    parser.add_argument("--saida", required=True, help="diretório de destino")
+    parser.add_argument(
+        "--linhas", type=int, default=1000, help="linhas por planilha"
+    )
+    parser.add_argument(
+        "--linhas-planilha",
+        action="append",
+        metavar="NOME=N",
+        help="linhas de uma planilha específica (pode repetir)",
+    )
+    parser.add_argument(
+        "--anos", type=_anos, default=[2023, 2024, 2025], help="ex.: 2020-2025"
+    )
+    parser.add_argument("--semente", type=int, default=0)
+    for chave, valor in CARDINALIDADES.items():
+        parser.add_argument(
+            f"--{chave}",
+            type=int,
+            default=valor,
+            help=f"quantidade de {chave} distintas (padrão: {valor})",
+        )
+    args = parser.parse_args(argv)
+
+    especificas = _pares(args.linhas_planilha)
+    desconhecidas = set(especificas) - set(GERADORES)
+    if desconhecidas:
+        parser.error(f"planilha desconhecida: {', '.join(sorted(desconhecidas))}")
+
+    linhas = {nome: especificas.get(nome, args.linhas) for nome in GERADORES}
+    linhas["naturezas"] = especificas.get(
+        "naturezas", min(args.naturezas, args.linhas)
+    )
+    caminhos = gerar_todas(
+        args.saida,
+        linhas,
+        args.anos,
+        args.semente,
+        {chave: getattr(args, chave) for chave in CARDINALIDADES},
+    )
+    for nome, caminho in caminhos.items():
+        print(f"{caminho}: {linhas[nome]} linhas", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
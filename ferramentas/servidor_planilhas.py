@@ -0,0 +1,242 @@
+# ferramentas/servidor_planilhas.py
+
+# Servidor local que imita o export CSV do Google Sheets (gviz).
+#
+# Uso:
+#   python -m ferramentas.servidor_planilhas --diretorio fixtures/ --latencia 0.3
+#   PAINEL_SHEETS_BASE=http://127.0.0.1:8765 gunicorn app:server
+#
+# Atende as mesmas URLs do painel
+#
+#   GET /spreadsheets/d/<id>/gviz/tq?tqx=out:csv&sheet=<aba>
+#
+# devolvendo <diretorio>/<nome>.csv, onde nome é a chave da planilha em
+# dados.planilhas.PLANILHAS. Para reproduzir o comportamento da rede, cada
+# resposta pode ter:
+#   latencia/jitter: espera fixa + aleatória antes de responder (s);
+#   taxa:            limite de envio em bytes/s (0 = sem limite);
+#   falha:           probabilidade de responder com status_falha;
+#   parcial:         probabilidade de enviar só metade do corpo e fechar;
+#   travar:          probabilidade de não responder por tempo_travado (s).
+#
+# A configuração vale para todas as planilhas e pode ser sobrescrita por
+# planilha em tempo de execução:
+#
+#   POST /_controle  {"planilhas": {"dotacao": {"falha": 1.0}}}
+#   GET  /_controle  -> configuração atual e requisições por planilha
+#
+# Com --semente os sorteios são reprodutíveis.
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from dados.planilhas import PLANILHAS
+
+PADRAO = {
+    "latencia": 0.0,
+    "jitter": 0.0,
+    "taxa": 0,
+    "falha": 0.0,
+    "status_falha": 503,
+    "parcial": 0.0,
+    "travar": 0.0,
+    "tempo_travado": 60.0,
+}
+
+TAMANHO_PARTE = 16 * 1024
+
+_POR_ABA = {(planilha, aba): nome for nome, (planilha, aba) in PLANILHAS.items()}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, formato, *args):
+        if not self.server.silencioso:
+            super().log_message(formato, *args)
+
+    def _json(self, dados, status=200):
+        corpo = json.dumps(dados, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _planilha(self, url):
+        partes = url.path.strip("/").split("/")
+        if len(partes) != 5 or partes[:2] != ["spreadsheets", "d"]:
+            return None
+        if partes[3:] != ["gviz", "tq"]:
+            return None
+        aba = parse_qs(url.query).get("sheet", [""])[0]
+        return _POR_ABA.get((partes[2], aba))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/_controle":
+            return self._json(self.server.situacao())
+
+        nome = self._planilha(url)
+        caminho = nome and os.path.join(self.server.diretorio, f"{nome}.csv")
+        if not caminho or not os.path.exists(caminho):
+            return self._json({"erro": "planilha não encontrada"}, 404)
+
+        config = self.server.registrar_requisicao(nome)
+        sortear = self.server.sortear
+
+        time.sleep(config["latencia"] + sortear() * config["jitter"])
+
+        if sortear() < config["travar"]:
+            time.sleep(config["tempo_travado"])
+            self.close_connection = True
+            return
+
+        if sortear() < config["falha"]:
+            return self._json({"erro": "falha injetada"}, config["status_falha"])
+
+        with open(caminho, "rb") as fh:
+            corpo = fh.read()
+
+        parcial = sortear() < config["parcial"]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+
+        if parcial:
+            corpo = corpo[: len(corpo) // 2]
+            self.close_connection = True
+        self._enviar(corpo, config["taxa"])
+
+    def _enviar(self, corpo, taxa):
+        for inicio in range(0, len(corpo), TAMANHO_PARTE):
+            parte = corpo[inicio:inicio + TAMANHO_PARTE]
+            self.wfile.write(parte)
+            if taxa:
+                time.sleep(len(parte) / taxa)
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/_controle":
+            return self._json({"erro": "rota não encontrada"}, 404)
+        tamanho = int(self.headers.get("Content-Length") or 0)
+        try:
+            dados = json.loads(self.rfile.read(tamanho) or b"{}")
+            self.server.configurar(**dados)
+        except (ValueError, TypeError, KeyError) as exc:
+            return self._json({"erro": str(exc)}, 400)
+        return self._json(self.server.situacao())
+
+
+class ServidorPlanilhas(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, diretorio, porta=0, semente=None, silencioso=True, **config):
+        super().__init__(("127.0.0.1", porta), _Handler)
+        self.diretorio = diretorio
+        self.silencioso = silencioso
+        self.padrao = {**PADRAO}
+        self.por_planilha = {}
+        self.requisicoes = {}
+        self._aleatorio = random.Random(semente)
+        self._lock = threading.Lock()
+        self.configurar(padrao=config)
+
+    @property
+    def base_url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def configurar(self, padrao=None, planilhas=None, zerar=False):
+        with self._lock:
+            for chave in padrao or {}:
+                if chave not in PADRAO:
+                    raise KeyError(f"opção desconhecida: {chave}")
+            self.padrao.update(padrao or {})
+            for nome, opcoes in (planilhas or {}).items():
+                if nome not in PLANILHAS:
+                    raise KeyError(f"planilha desconhecida: {nome}")
+                if opcoes is None:
+                    self.por_planilha.pop(nome, None)
+                else:
+                    self.por_planilha.setdefault(nome, {}).update(opcoes)
+            if zerar:
+                self.requisicoes = {}
+
+    def registrar_requisicao(self, nome):
+        with self._lock:
+            self.requisicoes[nome] = self.requisicoes.get(nome, 0) + 1
+            return {**self.padrao, **self.por_planilha.get(nome, {})}
+
+    def sortear(self):
+        with self._lock:
+            return self._aleatorio.random()
+
+    def situacao(self):
+        with self._lock:
+            return {
+                "padrao": dict(self.padrao),
+                "planilhas": {n: dict(o) for n, o in self.por_planilha.items()},
+                "requisicoes": dict(self.requisicoes),
+            }
+
+
+def iniciar(diretorio, porta=0, semente=None, **config):
+    """Sobe o servidor numa thread; retorna o ServidorPlanilhas.
+
+    Use servidor.base_url como PAINEL_SHEETS_BASE (ou em
+    dados.planilhas.url_gviz) e servidor.shutdown() para parar.
+    """
+    servidor = ServidorPlanilhas(diretorio, porta, semente, **config)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Servidor local que imita o export CSV do Google Sheets."
+    )
+    parser.add_argument(
+        "--diretorio",
+        required=True,
+        help="diretório com <nome>.csv de cada planilha",
+    )
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--semente", type=int)
+    parser.add_argument("--verboso", action="store_true")
+    for opcao, valor in PADRAO.items():
+        parser.add_argument(
+            "--" + opcao.replace("_", "-"),
+            dest=opcao,
+            type=type(valor),
+            default=valor,
+        )
+    args = parser.parse_args(argv)
+
+    servidor = ServidorPlanilhas(
+        args.diretorio,
+        args.porta,
+        args.semente,
+        silencioso=not args.verboso,
+        **{opcao: getattr(args, opcao) for opcao in PADRAO},
+    )
+    print(
+        f"Planilhas em {servidor.base_url} "
+        f"(PAINEL_SHEETS_BASE={servidor.base_url})",
+        file=sys.stderr,
+    )
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
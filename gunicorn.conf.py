@@ -0,0 +1,27 @@
+# gunicorn.conf.py
+
+# Configuração lida pelo gunicorn ao subir o painel (gunicorn app:server),
+# quando executado a partir deste diretório.
+#
+# As métricas de /metrics (monitoramento.metricas) são somadas entre os
+# workers pelo modo multiprocesso do prometheus_client: cada worker grava
+# seus valores em PROMETHEUS_MULTIPROC_DIR. O diretório é limpo ao subir o
+# servidor, e os arquivos de um worker que sai são marcados como mortos.
+
+import glob
+import os
+import tempfile
+
+_diretorio = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR",
+    os.path.join(tempfile.gettempdir(), "painel-dcf-metricas"),
+)
+os.makedirs(_diretorio, exist_ok=True)
+for _arquivo in glob.glob(os.path.join(_diretorio, "*.db")):
+    os.remove(_arquivo)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
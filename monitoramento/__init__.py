@@ -0,0 +1,4 @@
+# monitoramento/__init__.py
+
+# Instrumentação do painel (métricas, etapas dos callbacks, perfis sob
+# demanda e memória) para diagnóstico em produção.
@@ -0,0 +1,33 @@
+# monitoramento/admin.py
+
+# Acesso às ferramentas de diagnóstico (perfil de callbacks e memória).
+#
+# Só ficam disponíveis com PAINEL_ADMIN_TOKEN definido. As requisições se
+# identificam com o token no cabeçalho X-Painel-Admin ou no parâmetro
+# ?token=; sem o token (ou sem PAINEL_ADMIN_TOKEN), as rotas respondem 404,
+# como se não existissem.
+
+import hmac
+import os
+
+import flask
+
+TOKEN = os.environ.get("PAINEL_ADMIN_TOKEN")
+
+
+def autorizado(valor):
+    # Compara bytes: com str, compare_digest recusa (TypeError) texto não ASCII
+    return (
+        bool(TOKEN)
+        and bool(valor)
+        and hmac.compare_digest(valor.encode(), TOKEN.encode())
+    )
+
+
+def exigir():
+    """Interrompe a requisição com 404 se ela não trouxer o token."""
+    valor = flask.request.headers.get("X-Painel-Admin") or flask.request.args.get(
+        "token"
+    )
+    if not autorizado(valor):
+        flask.abort(404)
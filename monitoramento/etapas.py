@@ -0,0 +1,133 @@
+# monitoramento/etapas.py
+
+# Tempo por etapa dentro dos callbacks.
+#
+# Cada requisição de callback abre um rastro (ver PainelDash.dispatch em
+# app.py). Dentro dele, os trechos marcados com etapa(nome) acumulam seu
+# tempo próprio, descontadas as etapas internas. As etapas do painel são:
+#   filtro:       dados.consultas.filtrar_*;
+#   agregacao:    groupby e totais;
+#   moeda:        formatação das colunas de valores e datas das tabelas;
+#   serializacao: to_dict("records") das tabelas;
+#   figuras:      o restante dos callbacks marcados com @rastreado, na
+#                 prática a montagem das figuras do plotly.express e dos cards;
+#   json:         o tempo da requisição depois que o callback retorna
+#                 (serialização da resposta pelo Dash).
+# Fora de um rastro, etapa() não mede nada.
+#
+# Cada requisição gera:
+#   - o cabeçalho Server-Timing, que aparece na aba Rede do navegador;
+#   - a métrica painel_callback_etapa_segundos em /metrics;
+#   - uma linha de log em JSON com as etapas e a mais lenta, sempre que a
+#     requisição passar de LIMITE_LENTO, ou para todas com PAINEL_LOG_ETAPAS=1.
+
+import contextvars
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from monitoramento import metricas
+
+LIMITE_LENTO = float(os.environ.get("PAINEL_LIMITE_LENTO", "1.0"))  # segundos
+LOG_TODAS = os.environ.get("PAINEL_LOG_ETAPAS") == "1"
+
+log = logging.getLogger(__name__)
+if LOG_TODAS and not log.handlers:
+    log.addHandler(logging.StreamHandler())
+    log.setLevel(logging.INFO)
+
+_rastro = contextvars.ContextVar("rastro_etapas", default=None)
+
+
+class _Rastro:
+    def __init__(self):
+        self.etapas = {}
+        # Tempo das etapas internas de cada etapa aberta (a base é o callback)
+        self.pilha = [0.0]
+        self.callback = None
+
+
+@contextmanager
+def etapa(nome):
+    """Mede o trecho como etapa nome; também serve de decorador."""
+    rastro = _rastro.get()
+    if rastro is None:
+        yield
+        return
+
+    rastro.pilha.append(0.0)
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        duracao = time.perf_counter() - inicio
+        internas = rastro.pilha.pop()
+        rastro.pilha[-1] += duracao
+        rastro.etapas[nome] = rastro.etapas.get(nome, 0.0) + duracao - internas
+
+
+def rastreado(funcao):
+    """Marca o corpo de um callback: o tempo fora das etapas vira "figuras"."""
+
+    @wraps(funcao)
+    def executar(*args, **kwargs):
+        rastro = _rastro.get()
+        if rastro is None:
+            return funcao(*args, **kwargs)
+        inicio = time.perf_counter()
+        try:
+            with etapa("figuras"):
+                return funcao(*args, **kwargs)
+        finally:
+            rastro.callback = time.perf_counter() - inicio
+
+    return executar
+
+
+def rastrear(nome, executar):
+    """Executa a requisição do callback nome num rastro e publica as etapas."""
+    rastro = _Rastro()
+    token = _rastro.set(rastro)
+    inicio = time.perf_counter()
+    try:
+        resposta = executar()
+    finally:
+        _rastro.reset(token)
+    total = time.perf_counter() - inicio
+
+    etapas = dict(rastro.etapas)
+    if rastro.callback is not None:
+        etapas["json"] = total - rastro.callback
+    _publicar(nome, total, etapas, resposta)
+    return resposta
+
+
+def _publicar(nome, total, etapas, resposta):
+    for etapa_, duracao in etapas.items():
+        metricas.registrar_etapa(nome, etapa_, duracao)
+
+    resposta.headers["Server-Timing"] = ", ".join(
+        [f"{e};dur={d * 1000:.1f}" for e, d in etapas.items()]
+        + [f"total;dur={total * 1000:.1f}"]
+    )
+
+    lenta = total >= LIMITE_LENTO
+    if etapas and (lenta or LOG_TODAS):
+        log.log(
+            logging.WARNING if lenta else logging.INFO,
+            json.dumps(
+                {
+                    "callback": nome,
+                    "total_ms": round(total * 1000, 1),
+                    "mais_lenta": max(etapas, key=etapas.get),
+                    "etapas_ms": {
+                        e: round(d * 1000, 1)
+                        for e, d in sorted(etapas.items(), key=lambda i: -i[1])
+                    },
+                },
+                ensure_ascii=False,
+            ),
+        )
@@ -0,0 +1,282 @@
+# monitoramento/memoria.py
+
+# Uso de memória do processo, para investigar workers que crescem ao longo
+# do dia (ver rotas.memoria).
+#
+#   snapshots():      memória de cada snapshot do registro, por coluna
+#                     (memory_usage com deep=True);
+#   caches():         caches lru_cache dos módulos do painel (layouts das
+#                     páginas, estilos dos relatórios) e os registrados com
+#                     registrar_cache(), com entradas e tamanho aproximado
+#                     (medido sem chamar as funções cacheadas);
+#   linha_do_tempo(): RSS do processo a cada INTERVALO segundos nas últimas
+#                     AMOSTRAS amostras, com as versões dos snapshots (para
+#                     ligar saltos de memória a recargas das planilhas). O
+#                     RSS e a memória dos snapshots também vão para /metrics;
+#   marcar() e diferenca(): tracemalloc sob demanda. A primeira marca liga o
+#                     tracemalloc (que deixa as alocações bem mais lentas) e
+#                     só as alocações feitas depois dela são vistas; parar()
+#                     desliga e descarta as marcas.
+#
+# Cada worker do gunicorn tem sua própria memória, marcas e linha do tempo;
+# as respostas de rotas.memoria trazem o pid de quem respondeu.
+
+import collections
+import functools
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import types
+
+import pandas as pd
+
+from dados import registro
+from monitoramento import metricas
+
+INTERVALO = 60  # segundos
+AMOSTRAS = 24 * 60  # um dia com INTERVALO de um minuto
+MAXIMO_MARCAS = 10
+QUADROS = 10  # profundidade das pilhas guardadas pelo tracemalloc
+
+# Módulos do painel onde procurar caches lru_cache
+PACOTES = ("pages.", "relatorios.", "componentes.", "dados.", "rotas.")
+
+_linha_do_tempo = collections.deque(maxlen=AMOSTRAS)
+_amostrador = None
+_medidos = {}  # nome -> (versao, memória por coluna)
+_caches = {}
+_marcas = collections.OrderedDict()
+_trava = threading.Lock()
+
+
+def rss():
+    """Memória residente do processo em bytes (None fora do Linux)."""
+    try:
+        with open("/proc/self/statm") as fh:
+            paginas = int(fh.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return paginas * os.sysconf("SC_PAGE_SIZE")
+
+
+# --------------------------------------------------
+# Tamanho de objetos
+# --------------------------------------------------
+_SEM_TAMANHO = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+)
+
+
+def tamanho_profundo(objeto):
+    """Bytes de objeto e do que ele referencia (DataFrames por memory_usage).
+
+    Classes, módulos e funções não entram na conta, para não somar o
+    interpretador inteiro.
+    """
+    vistos = set()
+    total = 0
+    pendentes = [objeto]
+    while pendentes:
+        atual = pendentes.pop()
+        if id(atual) in vistos or isinstance(atual, _SEM_TAMANHO):
+            continue
+        vistos.add(id(atual))
+        if isinstance(atual, pd.DataFrame):
+            total += int(atual.memory_usage(deep=True).sum())
+        elif isinstance(atual, (pd.Series, pd.Index)):
+            total += int(atual.memory_usage(deep=True))
+        else:
+            total += sys.getsizeof(atual)
+            pendentes.extend(gc.get_referents(atual))
+    return total
+
+
+# --------------------------------------------------
+# Snapshots e caches
+# --------------------------------------------------
+def snapshots():
+    """{planilha: {versao, linhas, bytes, colunas}} dos snapshots carregados."""
+    resultado = {}
+    for nome, df in registro.carregados().items():
+        versao = registro.versao(nome)
+        medido = _medidos.get(nome)
+        if medido is None or medido[0] != versao:
+            colunas = df.memory_usage(deep=True)
+            medido = (versao, {str(c): int(b) for c, b in colunas.items()})
+            _medidos[nome] = medido
+        resultado[nome] = {
+            "versao": versao,
+            "linhas": len(df),
+            "bytes": sum(medido[1].values()),
+            "colunas": medido[1],
+        }
+    return resultado
+
+
+def registrar_cache(nome, obter):
+    """Inclui em caches() o valor devolvido por obter() (None se vazio)."""
+    _caches[nome] = obter
+
+
+def _caches_lru():
+    for modulo in list(sys.modules.values()):
+        nome_modulo = getattr(modulo, "__name__", "")
+        if not nome_modulo.startswith(PACOTES):
+            continue
+        for nome, valor in list(vars(modulo).items()):
+            if (
+                isinstance(valor, functools._lru_cache_wrapper)
+                and valor.__module__ == nome_modulo
+            ):
+                yield f"{nome_modulo}.{nome}", valor
+
+
+def _tamanho_lru(funcao):
+    # O lru_cache não expõe os valores guardados, e a função nunca é chamada
+    # de novo para obtê-los (com a versão mudando entre a leitura das chaves
+    # e a chamada, isso refaria um layout e tiraria o atual do cache). O
+    # dicionário interno (que o gc enxerga) guarda os valores direto sem
+    # maxsize; com maxsize, guarda os elos da lista LRU, que são listas
+    # [anterior, próximo, chave, valor] na versão em Python e opacos na
+    # versão em C. Com elos opacos, o tamanho fica None.
+    internos = [
+        r
+        for r in gc.get_referents(funcao)
+        if isinstance(r, dict) and r is not funcao.__dict__
+    ]
+    if not internos:
+        return None
+    valores = list(internos[0].values())
+    if funcao.cache_parameters()["maxsize"] is not None:
+        if not all(isinstance(elo, list) and len(elo) == 4 for elo in valores):
+            return None
+        valores = [elo[3] for elo in valores]
+    return sum(tamanho_profundo(valor) for valor in valores)
+
+
+def caches():
+    """{cache: {entradas, bytes}}; bytes é None quando não dá para medir."""
+    resultado = {}
+    for nome, funcao in _caches_lru():
+        info = funcao.cache_info()
+        resultado[nome] = {
+            "entradas": info.currsize,
+            "acertos": info.hits,
+            "faltas": info.misses,
+            "bytes": _tamanho_lru(funcao),
+        }
+    for nome, obter in _caches.items():
+        valor = obter()
+        resultado[nome] = {
+            "entradas": 0 if valor is None else 1,
+            "bytes": 0 if valor is None else tamanho_profundo(valor),
+        }
+    return resultado
+
+
+# --------------------------------------------------
+# Linha do tempo
+# --------------------------------------------------
+def amostrar():
+    atual = rss()
+    memoria = {nome: info["bytes"] for nome, info in snapshots().items()}
+    _linha_do_tempo.append(
+        {
+            "hora": time.time(),
+            "rss": atual,
+            "snapshots": sum(memoria.values()),
+            "versoes": {n: registro.versao(n) for n in registro.DATASETS},
+        }
+    )
+    metricas.registrar_memoria(atual, memoria)
+
+
+def _amostrar_sempre():
+    while True:
+        try:
+            amostrar()
+        except Exception:
+            pass  # uma amostra perdida não deve parar as próximas
+        time.sleep(INTERVALO)
+
+
+def iniciar_linha_do_tempo():
+    """Liga a amostragem periódica (uma thread por processo)."""
+    global _amostrador
+    with _trava:
+        if _amostrador is not None:
+            return
+        _amostrador = threading.Thread(
+            target=_amostrar_sempre, name="painel-memoria", daemon=True
+        )
+        _amostrador.start()
+
+
+def linha_do_tempo():
+    return list(_linha_do_tempo)
+
+
+# --------------------------------------------------
+# tracemalloc
+# --------------------------------------------------
+def estado_rastreamento():
+    ativo = tracemalloc.is_tracing()
+    return {
+        "ativo": ativo,
+        "marcas": list(_marcas),
+        "bytes_rastreamento": tracemalloc.get_tracemalloc_memory() if ativo else 0,
+    }
+
+
+def _foto():
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)]
+    )
+
+
+def marcar(nome=None):
+    """Guarda a memória alocada agora com o nome dado (liga o tracemalloc)."""
+    with _trava:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(QUADROS)
+        nome = nome or time.strftime("%H:%M:%S")
+        _marcas.pop(nome, None)
+        _marcas[nome] = _foto()
+        while len(_marcas) > MAXIMO_MARCAS:
+            _marcas.popitem(last=False)
+    return estado_rastreamento()
+
+
+def diferenca(de, ate=None, limite=20, agrupar="lineno"):
+    """As limite maiores variações de memória entre as marcas de e ate.
+
+    Sem ate, compara com a memória alocada agora. Levanta KeyError se uma
+    das marcas não existir neste processo.
+    """
+    antes = _marcas[de]
+    depois = _marcas[ate] if ate else _foto()
+    return [
+        {
+            "local": e.traceback.format(limit=1)[0].strip(),
+            "bytes": e.size,
+            "diferenca_bytes": e.size_diff,
+            "blocos": e.count,
+            "diferenca_blocos": e.count_diff,
+            "pilha": e.traceback.format(),
+        }
+        for e in depois.compare_to(antes, agrupar)[:limite]
+    ]
+
+
+def parar():
+    with _trava:
+        _marcas.clear()
+        tracemalloc.stop()
+    return estado_rastreamento()
@@ -0,0 +1,174 @@
+# monitoramento/metricas.py
+
+# Métricas do painel no formato do Prometheus (prometheus_client).
+#
+# Callbacks: tempo de parede, tempo de CPU, bytes da resposta e erros, por
+# callback (rotulado pela primeira saída, como "tabela_dotacao.data").
+# Medidos em volta do dispatch do Dash (ver PainelDash em app.py), o que
+# inclui a serialização da resposta em JSON.
+#
+# Etapas: tempo de cada etapa dos callbacks (ver monitoramento.etapas).
+#
+# Planilhas: duração do download e do tratamento, linhas e bytes de cada
+# planilha, e falhas de carga (ver dados.download).
+#
+# Memória: RSS de cada worker e memória dos snapshots em uso, amostrados
+# periodicamente (ver monitoramento.memoria).
+#
+# Sob gunicorn, cada worker tem seus próprios contadores. Com a variável
+# PROMETHEUS_MULTIPROC_DIR definida (o gunicorn.conf.py define), cada worker
+# grava os valores em arquivos nesse diretório e /metrics soma os de todos
+# os workers (modo multiprocesso do prometheus_client). Sem ela, /metrics
+# mostra só o processo atual.
+
+import os
+import time
+
+from dash.exceptions import PreventUpdate
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+BUCKETS_SEGUNDOS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BUCKETS_BYTES = tuple(1024 * 4**i for i in range(8))  # 1 KiB a 16 MiB
+
+CALLBACK_SEGUNDOS = Histogram(
+    "painel_callback_segundos",
+    "Tempo de parede dos callbacks, incluindo a serialização da resposta",
+    ["callback"],
+    buckets=BUCKETS_SEGUNDOS,
+)
+CALLBACK_CPU_SEGUNDOS = Counter(
+    "painel_callback_cpu_segundos",
+    "Tempo de CPU da thread que atendeu o callback",
+    ["callback"],
+)
+CALLBACK_BYTES = Histogram(
+    "painel_callback_resposta_bytes",
+    "Tamanho da resposta dos callbacks",
+    ["callback"],
+    buckets=BUCKETS_BYTES,
+)
+CALLBACK_ERROS = Counter(
+    "painel_callback_erros",
+    "Callbacks que terminaram com exceção",
+    ["callback"],
+)
+CALLBACK_ETAPA_SEGUNDOS = Histogram(
+    "painel_callback_etapa_segundos",
+    "Tempo próprio de cada etapa dos callbacks",
+    ["callback", "etapa"],
+    buckets=BUCKETS_SEGUNDOS,
+)
+
+PLANILHA_DOWNLOAD_SEGUNDOS = Histogram(
+    "painel_planilha_download_segundos",
+    "Duração do download de cada planilha",
+    ["planilha"],
+    buckets=BUCKETS_SEGUNDOS,
+)
+PLANILHA_TRATAMENTO_SEGUNDOS = Histogram(
+    "painel_planilha_tratamento_segundos",
+    "Duração da leitura e do tratamento do CSV de cada planilha",
+    ["planilha"],
+    buckets=BUCKETS_SEGUNDOS,
+)
+PLANILHA_LINHAS = Gauge(
+    "painel_planilha_linhas",
+    "Linhas do último snapshot carregado",
+    ["planilha"],
+    multiprocess_mode="mostrecent",
+)
+PLANILHA_BYTES = Gauge(
+    "painel_planilha_bytes",
+    "Bytes do último CSV carregado",
+    ["planilha"],
+    multiprocess_mode="mostrecent",
+)
+PLANILHA_FALHAS = Counter(
+    "painel_planilha_falhas",
+    "Cargas de planilha que falharam",
+    ["planilha"],
+)
+PLANILHA_MEMORIA_BYTES = Gauge(
+    "painel_planilha_memoria_bytes",
+    "Memória do snapshot em uso (memory_usage com deep=True)",
+    ["planilha"],
+    multiprocess_mode="mostrecent",
+)
+PROCESSO_RSS_BYTES = Gauge(
+    "painel_processo_rss_bytes",
+    "Memória residente do processo",
+    multiprocess_mode="liveall",
+)
+
+
+# --------------------------------------------------
+# Registro
+# --------------------------------------------------
+def nome_callback(output):
+    """"..a.children...b.figure.." -> "a.children" (primeira saída)."""
+    if output.startswith(".."):
+        return output[2:].split("...")[0].rstrip(".")
+    return output
+
+
+def medir_callback(nome, executar):
+    """Executa o callback (executar() devolve a resposta Flask) e registra."""
+    inicio, cpu = time.perf_counter(), time.thread_time()
+    try:
+        resposta = executar()
+    except PreventUpdate:
+        raise
+    except Exception:
+        CALLBACK_ERROS.labels(nome).inc()
+        raise
+    finally:
+        CALLBACK_SEGUNDOS.labels(nome).observe(time.perf_counter() - inicio)
+        CALLBACK_CPU_SEGUNDOS.labels(nome).inc(time.thread_time() - cpu)
+    CALLBACK_BYTES.labels(nome).observe(resposta.calculate_content_length() or 0)
+    return resposta
+
+
+def registrar_etapa(nome, etapa, duracao):
+    CALLBACK_ETAPA_SEGUNDOS.labels(nome, etapa).observe(duracao)
+
+
+def registrar_planilha(nome, download, tratamento, linhas, tamanho):
+    if download is not None:
+        PLANILHA_DOWNLOAD_SEGUNDOS.labels(nome).observe(download)
+    PLANILHA_TRATAMENTO_SEGUNDOS.labels(nome).observe(tratamento)
+    PLANILHA_LINHAS.labels(nome).set(linhas)
+    PLANILHA_BYTES.labels(nome).set(tamanho)
+
+
+def registrar_falha_planilha(nome):
+    PLANILHA_FALHAS.labels(nome).inc()
+
+
+def registrar_memoria(rss, planilhas):
+    """rss do processo (ou None) e {planilha: bytes} dos snapshots."""
+    if rss is not None:
+        PROCESSO_RSS_BYTES.set(rss)
+    for nome, tamanho in planilhas.items():
+        PLANILHA_MEMORIA_BYTES.labels(nome).set(tamanho)
+
+
+# --------------------------------------------------
+# Exposição
+# --------------------------------------------------
+def exportar():
+    """(corpo, content-type) no formato texto do Prometheus."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registro = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registro)
+    else:
+        registro = REGISTRY
+    return generate_latest(registro), CONTENT_TYPE_LATEST
@@ -0,0 +1,138 @@
+# monitoramento/perfil.py
+
+# Perfil de uma requisição de callback, sob demanda.
+#
+# Quando alguém relata que uma página está lenta, o administrador repete o
+# acesso com o token de admin (monitoramento.admin) de uma destas formas:
+#   - cabeçalho X-Painel-Perfil: <token> na requisição do callback;
+#   - ?perfil=<token> na URL do callback;
+#   - ?perfil=<token> na URL da página (o navegador a envia no Referer das
+#     requisições de callback), por exemplo
+#     /execucao-orcamento-unifei?perfil=<token>.
+# Cada requisição marcada roda sob o pyinstrument (relatório HTML) ou, se ele
+# não estiver instalado, sob o cProfile (arquivo .pstats). O relatório fica
+# em DIRETORIO, junto com um contexto.json com o callback, as entradas e a
+# versão dos snapshots. A resposta traz no cabeçalho X-Painel-Perfil o
+# endereço do relatório (ver rotas.perfis). São guardados os MAXIMO perfis
+# mais recentes.
+#
+# Sem PAINEL_ADMIN_TOKEN, solicitado() retorna antes de olhar a requisição,
+# e as requisições comuns não passam por nada daqui.
+
+import cProfile
+import json
+import os
+import secrets
+import shutil
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import flask
+
+from dados import registro
+from monitoramento import admin
+
+DIRETORIO = os.environ.get(
+    "PAINEL_PERFIS_DIR",
+    os.path.join(tempfile.gettempdir(), "painel-dcf-perfis"),
+)
+MAXIMO = 50
+
+# Um perfil por vez em cada processo: os perfiladores não medem bem duas
+# threads ao mesmo tempo, e o cProfile do Python 3.12+ recusa um segundo
+# perfil ativo. Requisições marcadas que chegam durante outro perfil rodam
+# normalmente, sem perfil.
+_trava = threading.Lock()
+
+
+def solicitado():
+    if not admin.TOKEN:
+        return False
+    request = flask.request
+    valor = request.headers.get("X-Painel-Perfil") or request.args.get("perfil")
+    if not valor and request.referrer:
+        valor = parse_qs(urlsplit(request.referrer).query).get("perfil", [None])[0]
+    return admin.autorizado(valor)
+
+
+def perfilar(nome, executar):
+    """Executa a requisição do callback nome sob o perfilador."""
+    if not _trava.acquire(blocking=False):
+        return executar()
+    try:
+        return _perfilar(nome, executar)
+    finally:
+        _trava.release()
+
+
+def _perfilar(nome, executar):
+    corpo = flask.request.get_json(silent=True) or {}
+    identificador = f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(4)}"
+    pasta = os.path.join(DIRETORIO, identificador)
+    os.makedirs(pasta)
+    contexto = {
+        "id": identificador,
+        "callback": nome,
+        "inicio": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "versoes": {n: registro.versao(n) for n in registro.DATASETS},
+        "entradas": corpo.get("inputs"),
+        "estados": corpo.get("state"),
+    }
+
+    inicio = time.perf_counter()
+    try:
+        resposta = _executar(executar, pasta)
+    except BaseException as erro:
+        contexto["erro"] = type(erro).__name__
+        raise
+    finally:
+        contexto["duracao_s"] = round(time.perf_counter() - inicio, 4)
+        with open(os.path.join(pasta, "contexto.json"), "w", encoding="utf-8") as fh:
+            json.dump(contexto, fh, indent=2, ensure_ascii=False, default=str)
+        _limpar_antigos()
+
+    resposta.headers["X-Painel-Perfil"] = f"/admin/perfis/{identificador}"
+    return resposta
+
+
+def _executar(executar, pasta):
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        perfil = cProfile.Profile()
+        try:
+            return perfil.runcall(executar)
+        finally:
+            perfil.dump_stats(os.path.join(pasta, "perfil.pstats"))
+
+    perfil = Profiler(interval=0.001)
+    perfil.start()
+    try:
+        return executar()
+    finally:
+        perfil.stop()
+        with open(os.path.join(pasta, "perfil.html"), "w", encoding="utf-8") as fh:
+            fh.write(perfil.output_html())
+
+
+def _limpar_antigos():
+    # Os identificadores começam pela data, então a ordem alfabética é a
+    # cronológica
+    for antigo in listar()[MAXIMO:]:
+        shutil.rmtree(os.path.join(DIRETORIO, antigo), ignore_errors=True)
+
+
+def listar():
+    """Identificadores dos perfis guardados, do mais recente ao mais antigo."""
+    if not os.path.isdir(DIRETORIO):
+        return []
+    return sorted(os.listdir(DIRETORIO), reverse=True)
+
+
+def contexto(identificador):
+    with open(
+        os.path.join(DIRETORIO, identificador, "contexto.json"), encoding="utf-8"
+    ) as fh:
+        return json.load(fh)
@@ -4,16 +4,16 @@
 
 import dash
 from dash import html, dcc, Input, Output, State, dash_table
-import pandas as pd
-import plotly.express as px
-from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER
-from reportlab.lib import colors
 import datetime as dt
+from functools import lru_cache
+
+from componentes.carregando import layout_carregando
+from componentes.idade_dados import indicador_idade
+from dados import consultas, registro
+from dados.moeda import fmt_centavos, reais
+from monitoramento.etapas import rastreado
+from rotas import downloads
+from rotas.exportacao import links_exportacao
 
 
 # --------------------------------------------------
@@ -30,235 +30,224 @@ dash.register_page(
 # --------------------------------------------------
 # 1. Dados
 # --------------------------------------------------
-URL = (
-    "https://docs.google.com/spreadsheets/d/"
-    "1MkiWDH-MBnLeSUlqV91qjzCVRTlTAVh9xYooENJ151o/"
-    "gviz/tq?tqx=out:csv&sheet=Dotacao%20Atualizada%20e%20Destaques%20Recebidos"
-)
-
-
-def carregar_dados():
-    df = pd.read_csv(URL)
-    df.columns = [c.strip() for c in df.columns]
-
-    def conv_moeda(valor):
-        if isinstance(valor, str):
-            v = (
-                valor.replace("R$", "")
-                .replace(".", "")
-                .replace(",", ".")
-                .strip()
-            )
-            return float(v) if v not in ["", "-"] else 0.0
-        return float(valor) if pd.notna(valor) else 0.0
+DATASET = "dotacao"
 
-    df["DOTACAO ATUALIZADA_VAL"] = df["DOTACAO ATUALIZADA"].apply(conv_moeda)
-    df["DESTAQUE RECEBIDO_VAL"] = df["DESTAQUE RECEBIDO"].apply(conv_moeda)
-    return df
-
-
-# >>> DF base em vez de df global
-df_base = carregar_dados()
-ANO_PADRAO = int(sorted(df_base["ANO"].dropna().unique())[-1])
+# >>> DF base (snapshot compartilhado do registro)
 
 
 # --------------------------------------------------
 # 2. Layout da página (só conteúdo principal)
 # --------------------------------------------------
-layout = html.Div(
-    children=[
-        html.H2(
-            "Dotação Atualizada e Destaques Recebidos",
-            style={"textAlign": "center"},
-        ),
-        html.Div(
-            style={"marginBottom": "20px"},
-            children=[
-                html.H3("Filtros", className="sidebar-title"),
-                html.Div(
-                    style={"display": "flex", "flexWrap": "wrap", "gap": "10px"},
-                    children=[
-                        html.Div(
-                            style={"minWidth": "220px", "flex": "1"},
-                            children=[
-                                html.Label("Grupo da Despesa"),
-                                dcc.Dropdown(
-                                    id="filtro_grupo_dotacao",
-                                    options=[
-                                        {"label": g, "value": g}
-                                        for g in sorted(
-                                            df_base["GRUPO DA DESPESA"]
-                                            .dropna()
-                                            .unique()
-                                        )
-                                    ],
-                                    value=None,
-                                    placeholder="Todos",
-                                    clearable=True,
-                                    style={
-                                        "color": "black",
-                                        "marginBottom": "10px",
-                                        "whiteSpace": "normal",
-                                    },
-                                ),
-                            ],
-                        ),
-                        html.Div(
-                            style={"minWidth": "120px", "flex": "0 0 150px"},
-                            children=[
-                                html.Label("Ano"),
-                                dcc.Dropdown(
-                                    id="filtro_ano_dotacao",
-                                    options=[
-                                        {"label": int(a), "value": int(a)}
-                                        for a in sorted(
-                                            df_base["ANO"].dropna().unique()
-                                        )
-                                    ],
-                                    value=ANO_PADRAO,
-                                    clearable=False,
-                                    style={
-                                        "color": "black",
-                                        "marginBottom": "10px",
-                                        "whiteSpace": "normal",
-                                    },
-                                ),
-                            ],
-                        ),
-                        html.Div(
-                            style={"minWidth": "220px", "flex": "1"},
-                            children=[
-                                html.Label("Unidade Orçamentária"),
-                                dcc.Dropdown(
-                                    id="filtro_unidade_dotacao",
-                                    options=[
-                                        {"label": u, "value": u}
-                                        for u in sorted(
-                                            df_base["UNIDADE ORÇAMENTÁRIA"]
-                                            .dropna()
-                                            .unique()
-                                        )
-                                    ],
-                                    value=None,
-                                    placeholder="Todas",
-                                    clearable=True,
-                                    style={
-                                        "color": "black",
-                                        "marginBottom": "10px",
-                                        "whiteSpace": "normal",
-                                    },
-                                ),
-                            ],
-                        ),
-                        html.Div(
-                            style={"minWidth": "220px", "flex": "1"},
-                            children=[
-                                html.Label("Fonte Recursos Detalhada"),
-                                dcc.Dropdown(
-                                    id="filtro_fonte_dotacao",
-                                    options=[
-                                        {"label": f, "value": f}
-                                        for f in sorted(
-                                            df_base["Fonte Recursos Detalhada"]
-                                            .dropna()
-                                            .unique()
-                                        )
-                                    ],
-                                    value=None,
-                                    placeholder="Todas",
-                                    clearable=True,
-                                    style={
-                                        "color": "black",
-                                        "marginBottom": "10px",
-                                        "whiteSpace": "normal",
-                                    },
-                                ),
-                            ],
-                        ),
-                    ],
-                ),
-                html.Div(
-                    style={"marginTop": "10px"},
-                    children=[
-                        html.Button(
-                            "Limpar filtros",
-                            id="btn_limpar_filtros_dotacao",
-                            n_clicks=0,
-                            className="filtros-button",
-                        ),
-                        html.Button(
-                            "Baixar Relatório PDF",
-                            id="btn_download_relatorio_dotacao",
-                            n_clicks=0,
-                            className="filtros-button",
-                            style={"marginLeft": "10px"},
-                        ),
-                        dcc.Download(id="download_relatorio_dotacao"),
-                    ],
-                ),
-            ],
-        ),
-        html.Div(
-            id="cards_container_dotacao",
-            className="cards-container",
-        ),
-        html.Div(
-            className="charts-row",
-            children=[
-                dcc.Graph(id="grafico_pizza_dotacao", style={"width": "50%"}),
-                dcc.Graph(id="grafico_pizza_destaque", style={"width": "50%"}),
-            ],
-        ),
-        html.Div(
-            className="charts-row",
-            children=[
-                dcc.Graph(
-                    id="grafico_barra_dotacao_fonte", style={"width": "50%"}
-                ),
-                dcc.Graph(
-                    id="grafico_barra_destaque_fonte", style={"width": "50%"}
-                ),
-            ],
-        ),
-        html.H4("Detalhamento"),
-        dash_table.DataTable(
-            id="tabela_dotacao",
-            columns=[
-                {"name": "GRUPO DA DESPESA", "id": "GRUPO DA DESPESA"},
-                {"name": "ANO", "id": "ANO"},
-                {
-                    "name": "UNIDADE ORÇAMENTÁRIA",
-                    "id": "UNIDADE ORÇAMENTÁRIA",
+def layout(**kwargs):
+    if not registro.pronto(DATASET):
+        return layout_carregando(__name__, [DATASET])
+    return _montar_layout(registro.versao(DATASET))
+
+
+@lru_cache(maxsize=1)
+def _montar_layout(versao):
+    df_base = registro.obter(DATASET)
+    ano_padrao = consultas.ano_mais_recente(df_base["ANO"])
+
+    return html.Div(
+        children=[
+            html.H2(
+                "Dotação Atualizada e Destaques Recebidos",
+                style={"textAlign": "center"},
+            ),
+            indicador_idade([DATASET]),
+            html.Div(
+                style={"marginBottom": "20px"},
+                children=[
+                    html.H3("Filtros", className="sidebar-title"),
+                    html.Div(
+                        style={"display": "flex", "flexWrap": "wrap", "gap": "10px"},
+                        children=[
+                            html.Div(
+                                style={"minWidth": "220px", "flex": "1"},
+                                children=[
+                                    html.Label("Grupo da Despesa"),
+                                    dcc.Dropdown(
+                                        id="filtro_grupo_dotacao",
+                                        options=[
+                                            {"label": g, "value": g}
+                                            for g in sorted(
+                                                df_base["GRUPO DA DESPESA"]
+                                                .dropna()
+                                                .unique()
+                                            )
+                                        ],
+                                        value=None,
+                                        placeholder="Todos",
+                                        clearable=True,
+                                        style={
+                                            "color": "black",
+                                            "marginBottom": "10px",
+                                            "whiteSpace": "normal",
+                                        },
+                                    ),
+                                ],
+                            ),
+                            html.Div(
+                                style={"minWidth": "120px", "flex": "0 0 150px"},
+                                children=[
+                                    html.Label("Ano"),
+                                    dcc.Dropdown(
+                                        id="filtro_ano_dotacao",
+                                        options=[
+                                            {"label": int(a), "value": int(a)}
+                                            for a in sorted(
+                                                df_base["ANO"].dropna().unique()
+                                            )
+                                        ],
+                                        value=ano_padrao,
+                                        clearable=False,
+                                        style={
+                                            "color": "black",
+                                            "marginBottom": "10px",
+                                            "whiteSpace": "normal",
+                                        },
+                                    ),
+                                ],
+                            ),
+                            html.Div(
+                                style={"minWidth": "220px", "flex": "1"},
+                                children=[
+                                    html.Label("Unidade Orçamentária"),
+                                    dcc.Dropdown(
+                                        id="filtro_unidade_dotacao",
+                                        options=[
+                                            {"label": u, "value": u}
+                                            for u in sorted(
+                                                df_base["UNIDADE ORÇAMENTÁRIA"]
+                                                .dropna()
+                                                .unique()
+                                            )
+                                        ],
+                                        value=None,
+                                        placeholder="Todas",
+                                        clearable=True,
+                                        style={
+                                            "color": "black",
+                                            "marginBottom": "10px",
+                                            "whiteSpace": "normal",
+                                        },
+                                    ),
+                                ],
+                            ),
+                            html.Div(
+                                style={"minWidth": "220px", "flex": "1"},
+                                children=[
+                                    html.Label("Fonte Recursos Detalhada"),
+                                    dcc.Dropdown(
+                                        id="filtro_fonte_dotacao",
+                                        options=[
+                                            {"label": f, "value": f}
+                                            for f in sorted(
+                                                df_base["Fonte Recursos Detalhada"]
+                                                .dropna()
+                                                .unique()
+                                            )
+                                        ],
+                                        value=None,
+                                        placeholder="Todas",
+                                        clearable=True,
+                                        style={
+                                            "color": "black",
+                                            "marginBottom": "10px",
+                                            "whiteSpace": "normal",
+                                        },
+                                    ),
+                                ],
+                            ),
+                        ],
+                    ),
+                    html.Div(
+                        style={"marginTop": "10px"},
+                        children=[
+                            html.Button(
+                                "Limpar filtros",
+                                id="btn_limpar_filtros_dotacao",
+                                n_clicks=0,
+                                className="filtros-button",
+                            ),
+                            html.Button(
+                                "Baixar Relatório PDF",
+                                id="btn_download_relatorio_dotacao",
+                                n_clicks=0,
+                                className="filtros-button",
+                                style={"marginLeft": "10px"},
+                            ),
+                            dcc.Location(id="download_relatorio_dotacao", refresh=True),
+                            html.Div(
+                                id="links_exportacao_dotacao",
+                                style={"marginTop": "6px", "fontSize": "13px"},
+                            ),
+                        ],
+                    ),
+                ],
+            ),
+            html.Div(
+                id="cards_container_dotacao",
+                className="cards-container",
+            ),
+            html.Div(
+                className="charts-row",
+                children=[
+                    dcc.Graph(id="grafico_pizza_dotacao", style={"width": "50%"}),
+                    dcc.Graph(id="grafico_pizza_destaque", style={"width": "50%"}),
+                ],
+            ),
+            html.Div(
+                className="charts-row",
+                children=[
+                    dcc.Graph(
+                        id="grafico_barra_dotacao_fonte", style={"width": "50%"}
+                    ),
+                    dcc.Graph(
+                        id="grafico_barra_destaque_fonte", style={"width": "50%"}
+                    ),
+                ],
+            ),
+            html.H4("Detalhamento"),
+            dash_table.DataTable(
+                id="tabela_dotacao",
+                columns=[
+                    {"name": "GRUPO DA DESPESA", "id": "GRUPO DA DESPESA"},
+                    {"name": "ANO", "id": "ANO"},
+                    {
+                        "name": "UNIDADE ORÇAMENTÁRIA",
+                        "id": "UNIDADE ORÇAMENTÁRIA",
+                    },
+                    {
+                        "name": "Fonte Recursos Detalhada",
+                        "id": "Fonte Recursos Detalhada",
+                    },
+                    {"name": "DOTACAO ATUALIZADA", "id": "DOTACAO ATUALIZADA"},
+                    {"name": "DESTAQUE RECEBIDO", "id": "DESTAQUE RECEBIDO"},
+                ],
+                data=[],
+                style_table={"overflowX": "auto"},
+                style_cell={
+                    "textAlign": "center",
+                    "padding": "6px",
+                    "fontSize": "12px",
                 },
-                {
-                    "name": "Fonte Recursos Detalhada",
-                    "id": "Fonte Recursos Detalhada",
+                style_header={
+                    "fontWeight": "bold",
+                    "backgroundColor": "#0b2b57",
+                    "color": "white",
                 },
-                {"name": "DOTACAO ATUALIZADA", "id": "DOTACAO ATUALIZADA"},
-                {"name": "DESTAQUE RECEBIDO", "id": "DESTAQUE RECEBIDO"},
-            ],
-            data=[],
-            style_table={"overflowX": "auto"},
-            style_cell={
-                "textAlign": "center",
-                "padding": "6px",
-                "fontSize": "12px",
-            },
-            style_header={
-                "fontWeight": "bold",
-                "backgroundColor": "#0b2b57",
-                "color": "white",
-            },
-        ),
-        # Intervalo para atualização periódica dos dados
-       # dcc.Interval(
-       #     id="interval-atualizacao",
-       #     interval=5 * 60 * 1000,  # a cada 5 minutos
-       #     n_intervals=0,
-       # ),
-        dcc.Store(id="store_pdf_dotacao"),
-    ],
-)
+            ),
+            # Intervalo para atualização periódica dos dados
+           # dcc.Interval(
+           #     id="interval-atualizacao",
+           #     interval=5 * 60 * 1000,  # a cada 5 minutos
+           #     n_intervals=0,
+           # ),
+            dcc.Store(id="store_pdf_dotacao"),
+        ],
+    )
 
 
 # --------------------------------------------------
@@ -278,75 +267,53 @@ layout = html.Div(
     Input("filtro_fonte_dotacao", "value"),
     Input("interval-atualizacao", "n_intervals"),  # novo Input
 )
+@rastreado
 def atualizar_painel(grupo, ano, unidade, fonte, n_intervals):
-    global df_base
+    import plotly.express as px
 
-    # Atualiza df_base somente em horário permitido (exemplo: 08h–20h)
+    # Atualiza o snapshot somente em horário permitido (exemplo: 08h–20h)
     agora = dt.datetime.now().time()
     if dt.time(8, 0) <= agora <= dt.time(20, 0):
         if n_intervals is not None:
-            df_base = carregar_dados()
-
-    dff = df_base.copy()
-
-    if ano:
-        dff = dff[dff["ANO"] == ano]
-    if grupo:
-        dff = dff[dff["GRUPO DA DESPESA"] == grupo]
-    if unidade:
-        dff = dff[dff["UNIDADE ORÇAMENTÁRIA"] == unidade]
-    if fonte:
-        dff = dff[dff["Fonte Recursos Detalhada"] == fonte]
+            registro.revalidar(DATASET)
 
-    def fmt(v):
-        return f"R$ {v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    filtros = {
+        "grupo": grupo,
+        "ano": ano,
+        "unidade": unidade,
+        "fonte": fonte,
+    }
+    consulta = consultas.consultar_dotacao(registro.obter(DATASET), **filtros)
+    dff = consulta.linhas()
+    dados_pdf = consultas.relatorio_dotacao(consulta, filtros)
 
-    total_dotacao = dff["DOTACAO ATUALIZADA_VAL"].sum()
-    total_destaque = dff["DESTAQUE RECEBIDO_VAL"].sum()
+    total_dotacao = dados_pdf["total_dotacao"]
+    total_destaque = dados_pdf["total_destaque"]
 
     cards = [
         html.Div(
             className="card",
             children=[
                 html.Div("Dotação Atualizada", className="card-title"),
-                html.Div(fmt(total_dotacao), className="card-value"),
+                html.Div(fmt_centavos(total_dotacao), className="card-value"),
             ],
         ),
         html.Div(
             className="card",
             children=[
                 html.Div("Destaques Recebidos", className="card-title"),
-                html.Div(fmt(total_destaque), className="card-value"),
+                html.Div(fmt_centavos(total_destaque), className="card-value"),
             ],
         ),
     ]
 
-    dff_display = dff.copy()
-    dff_display["DOTACAO ATUALIZADA"] = dff_display[
-        "DOTACAO ATUALIZADA_VAL"
-    ].apply(fmt)
-    dff_display["DESTAQUE RECEBIDO"] = dff_display[
-        "DESTAQUE RECEBIDO_VAL"
-    ].apply(fmt)
-
-    colunas = [
-        "GRUPO DA DESPESA",
-        "ANO",
-        "UNIDADE ORÇAMENTÁRIA",
-        "Fonte Recursos Detalhada",
-        "DOTACAO ATUALIZADA",
-        "DESTAQUE RECEBIDO",
-    ]
-    dff_display = dff_display[colunas]
-
     if not dff.empty:
-        grp_dot_grupo = dff.groupby(
-            "GRUPO DA DESPESA", as_index=False
-        )["DOTACAO ATUALIZADA_VAL"].sum()
+        grp_dot_grupo = consulta.somar_por("GRUPO DA DESPESA", "DOTACAO ATUALIZADA")
+        grp_dot_grupo["DOTACAO ATUALIZADA"] = reais(grp_dot_grupo["DOTACAO ATUALIZADA"])
         fig_pizza_dot = px.pie(
             grp_dot_grupo,
             names="GRUPO DA DESPESA",
-            values="DOTACAO ATUALIZADA_VAL",
+            values="DOTACAO ATUALIZADA",
             title="Dotação Atualizada por Grupo de Despesa",
         )
         fig_pizza_dot.update_traces(
@@ -366,13 +333,12 @@ def atualizar_painel(grupo, ano, unidade, fonte, n_intervals):
         )
 
     if not dff.empty:
-        grp_des_grupo = dff.groupby(
-            "GRUPO DA DESPESA", as_index=False
-        )["DESTAQUE RECEBIDO_VAL"].sum()
+        grp_des_grupo = consulta.somar_por("GRUPO DA DESPESA", "DESTAQUE RECEBIDO")
+        grp_des_grupo["DESTAQUE RECEBIDO"] = reais(grp_des_grupo["DESTAQUE RECEBIDO"])
         fig_pizza_des = px.pie(
             grp_des_grupo,
             names="GRUPO DA DESPESA",
-            values="DESTAQUE RECEBIDO_VAL",
+            values="DESTAQUE RECEBIDO",
             title="Destaques Recebidos por Grupo de Despesa",
         )
         fig_pizza_des.update_traces(
@@ -402,22 +368,23 @@ def atualizar_painel(grupo, ano, unidade, fonte, n_intervals):
         return posicoes
 
     if not dff.empty:
-        grp_dot_fonte = dff.groupby(
-            "Fonte Recursos Detalhada", as_index=False
-        )["DOTACAO ATUALIZADA_VAL"].sum()
+        grp_dot_fonte = consulta.somar_por(
+            "Fonte Recursos Detalhada", "DOTACAO ATUALIZADA"
+        )
+        valores = grp_dot_fonte["DOTACAO ATUALIZADA"].tolist()
+        grp_dot_fonte["DOTACAO ATUALIZADA"] = reais(grp_dot_fonte["DOTACAO ATUALIZADA"])
         fig_bar_dot = px.bar(
             grp_dot_fonte,
-            x="DOTACAO ATUALIZADA_VAL",
+            x="DOTACAO ATUALIZADA",
             y="Fonte Recursos Detalhada",
             orientation="h",
             title="Dotação Atualizada por Fonte de Recursos Detalhada",
         )
-        valores = grp_dot_fonte["DOTACAO ATUALIZADA_VAL"].tolist()
         posicoes = texto_posicoes(valores)
         fig_bar_dot.update_traces(
             marker_color="#003A70",
             hovertemplate="Fonte=%{y}<br>Dotação=R$ %{x:,.2f}",
-            text=[fmt(v) for v in valores],
+            text=[fmt_centavos(v) for v in valores],
             textposition=posicoes,
             textfont_color="white",
         )
@@ -438,22 +405,23 @@ def atualizar_painel(grupo, ano, unidade, fonte, n_intervals):
         )
 
     if not dff.empty:
-        grp_des_fonte = dff.groupby(
-            "Fonte Recursos Detalhada", as_index=False
-        )["DESTAQUE RECEBIDO_VAL"].sum()
+        grp_des_fonte = consulta.somar_por(
+            "Fonte Recursos Detalhada", "DESTAQUE RECEBIDO"
+        )
+        valores_des = grp_des_fonte["DESTAQUE RECEBIDO"].tolist()
+        grp_des_fonte["DESTAQUE RECEBIDO"] = reais(grp_des_fonte["DESTAQUE RECEBIDO"])
         fig_bar_des = px.bar(
             grp_des_fonte,
-            x="DESTAQUE RECEBIDO_VAL",
+            x="DESTAQUE RECEBIDO",
             y="Fonte Recursos Detalhada",
             orientation="h",
             title="Destaques Recebidos por Fonte de Recursos Detalhada",
         )
-        valores_des = grp_des_fonte["DESTAQUE RECEBIDO_VAL"].tolist()
         posicoes_des = texto_posicoes(valores_des)
         fig_bar_des.update_traces(
             marker_color="#DA291C",
             hovertemplate="Fonte=%{y}<br>Destaque=R$ %{x:,.2f}",
-            text=[fmt(v) for v in valores_des],
+            text=[fmt_centavos(v) for v in valores_des],
             textposition=posicoes_des,
             textfont_color="white",
         )
@@ -473,20 +441,8 @@ def atualizar_painel(grupo, ano, unidade, fonte, n_intervals):
             title="Sem dados para os filtros selecionados"
         )
 
-    dados_pdf = {
-        "tabela": dff_display.to_dict("records"),
-        "total_dotacao": float(total_dotacao),
-        "total_destaque": float(total_destaque),
-        "filtros": {
-            "grupo": grupo,
-            "ano": ano,
-            "unidade": unidade,
-            "fonte": fonte,
-        },
-    }
-
     return (
-        dff_display.to_dict("records"),
+        dados_pdf["tabela"],
         cards,
         fig_pizza_dot,
         fig_pizza_des,
@@ -508,123 +464,47 @@ def atualizar_painel(grupo, ano, unidade, fonte, n_intervals):
     prevent_initial_call=True,
 )
 def limpar_filtros(n):
-    return ANO_PADRAO, None, None, None
+    ano_padrao = consultas.ano_mais_recente(registro.obter(DATASET)["ANO"])
+    return ano_padrao, None, None, None
 
 
 # --------------------------------------------------
 # 5. PDF (cards + tabela)
 # --------------------------------------------------
-wrap_style = ParagraphStyle(
-    name="wrap",
-    fontSize=8,
-    leading=10,
-    spaceAfter=4,
-)
-
-
-def wrap(text):
-    return Paragraph(str(text), wrap_style)
-
-
 @dash.callback(
-    Output("download_relatorio_dotacao", "data"),
+    Output("download_relatorio_dotacao", "href"),
     Input("btn_download_relatorio_dotacao", "n_clicks"),
     State("store_pdf_dotacao", "data"),
     prevent_initial_call=True,
 )
 def gerar_pdf(n, dados_pdf):
-    if not n or not dados_pdf:
-        return None
+    from relatorios import dotacao as relatorio
 
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    styles = getSampleStyleSheet()
-    story = []
+    if not n or not dados_pdf:
+        return dash.no_update
 
-    titulo = Paragraph(
-        "Relatório de Dotação e Destaques",
-        ParagraphStyle(
-            "titulo", fontSize=20, alignment=TA_CENTER, textColor="#0b2b57"
-        ),
+    return downloads.gravar_relatorio(
+        relatorio.montar_pdf, dados_pdf, relatorio.NOME_ARQUIVO
     )
-    story.append(titulo)
-    story.append(Spacer(1, 0.25 * inch))
-
-    f = dados_pdf["filtros"]
-    story.append(
-        Paragraph(
-            f"Ano: {f['ano'] if f['ano'] else 'Todos'} — "
-            f"Grupo: {f['grupo'] if f['grupo'] else 'Todos'} — "
-            f"Unidade: {f['unidade'] if f['unidade'] else 'Todas'} — "
-            f"Fonte: {f['fonte'] if f['fonte'] else 'Todas'}",
-            styles["Normal"],
-        )
-    )
-    story.append(Spacer(1, 0.25 * inch))
-
-    def fmt(v):
-        return f"R$ {v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
 
-    cards_data = [
-        ["Dotação Atualizada", fmt(dados_pdf["total_dotacao"])],
-        ["Destaques Recebidos", fmt(dados_pdf["total_destaque"])],
-    ]
-
-    tbl_cards = Table(cards_data, colWidths=[3.0 * inch, 3.0 * inch])
-    tbl_cards.setStyle(
-        TableStyle(
-            [
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                ("BACKGROUND", (0, 0), (-1, -1), colors.whitesmoke),
-                ("TEXTCOLOR", (0, 0), (-1, -1), colors.HexColor("#0b2b57")),
-                ("FONTSIZE", (0, 0), (-1, -1), 10),
-            ]
-        )
-    )
-    story.append(tbl_cards)
-    story.append(Spacer(1, 0.35 * inch))
-
-    table_data = [["GRUPO", "ANO", "UNIDADE", "FONTE", "DOTACAO", "DESTAQUE"]]
-    for r in dados_pdf["tabela"]:
-        table_data.append(
-            [
-                wrap(r["GRUPO DA DESPESA"]),
-                wrap(r["ANO"]),
-                wrap(r["UNIDADE ORÇAMENTÁRIA"]),
-                wrap(r["Fonte Recursos Detalhada"]),
-                wrap(r["DOTACAO ATUALIZADA"]),
-                wrap(r["DESTAQUE RECEBIDO"]),
-            ]
-        )
 
-    col_widths = [
-        1.2 * inch,
-        0.6 * inch,
-        2.0 * inch,
-        2.5 * inch,
-        1.0 * inch,
-        1.0 * inch,
-    ]
-    tbl = Table(table_data, colWidths=col_widths)
-    tbl.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#0b2b57")),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ("WORDWRAP", (0, 0), (-1, -1), True),
-                ("FONTSIZE", (0, 0), (-1, -1), 8),
-            ]
-        )
+# --------------------------------------------------
+# 6. Links de exportação (CSV / XLSX / Parquet)
+# --------------------------------------------------
+@dash.callback(
+    Output("links_exportacao_dotacao", "children"),
+    Input("filtro_grupo_dotacao", "value"),
+    Input("filtro_ano_dotacao", "value"),
+    Input("filtro_unidade_dotacao", "value"),
+    Input("filtro_fonte_dotacao", "value"),
+)
+def atualizar_links_exportacao(grupo, ano, unidade, fonte):
+    return links_exportacao(
+        "dotacao",
+        {
+            "grupo": grupo,
+            "ano": ano,
+            "unidade": unidade,
+            "fonte": fonte,
+        },
     )
-
-    story.append(tbl)
-    doc.build(story)
-    buffer.seek(0)
-
-    from dash import dcc
-    return dcc.send_bytes(buffer.getvalue(), "dotacao_destaques.pdf")
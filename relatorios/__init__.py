@@ -0,0 +1,8 @@
+# relatorios/__init__.py
+
+# Montagem dos relatórios em PDF de cada painel, independente do Dash.
+#
+# Cada módulo expõe montar_pdf(dados_pdf, destino=None), recebendo o mesmo
+# dicionário que as páginas guardam no dcc.Store do relatório; sem destino
+# retorna os bytes do PDF. Os módulos importam o reportlab no topo, por isso
+# as páginas só os importam dentro do callback de download.
@@ -0,0 +1,274 @@
+# relatorios/consolidado.py
+
+# Relatório consolidado mensal: Passagens, Pagamentos, Dotação, Execução
+# UNIFEI e Execução TED num único PDF, com sumário compartilhado.
+#
+# Uso:
+#   python -m relatorios.consolidado --ano 2025 --mes 10 --saida consolidado.pdf
+#
+# Cada seção é renderizada em paralelo num processo de trabalho, a partir
+# dos snapshots carregados uma vez no processo principal; o tempo total fica
+# próximo ao da seção mais lenta. Depois as seções são unidas com pypdf,
+# precedidas pelo sumário e marcadas como itens do índice (outline) do PDF.
+
+import argparse
+import importlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from pypdf import PdfReader, PdfWriter
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from dados import consultas, registro
+from dados.planilhas import MAPA_MESES
+from relatorios.estilos import ESTILOS, estilo_titulo
+
+# Como o mês (--mes) filtra cada seção:
+MES_NUMERO = "numero"  # coluna "Mes" com o número (Passagens e Pagamentos)
+MES_NOME = "nome"  # coluna "Mês" com o nome, como em MAPA_MESES (Execução)
+# A Dotação não tem mês: com --mes, a seção sai com o ano inteiro, e o
+# título dela no sumário diz isso.
+
+# (chave, título, dataset, coluna do ano, filtrar, resumir, módulo, mês)
+SECOES = [
+    (
+        "passagens",
+        "Passagens DCF",
+        "passagens",
+        "Ano",
+        consultas.filtrar_passagens,
+        consultas.relatorio_passagens_completo,
+        "relatorios.passagens",
+        MES_NUMERO,
+    ),
+    (
+        "pagamentos",
+        "Pagamentos Efetivados",
+        "pagamentos",
+        "Ano",
+        consultas.filtrar_pagamentos,
+        consultas.relatorio_pagamentos,
+        "relatorios.pagamentos",
+        MES_NUMERO,
+    ),
+    (
+        "dotacao",
+        "Dotação Atualizada e Destaques Recebidos",
+        "dotacao",
+        "ANO",
+        consultas.filtrar_dotacao,
+        consultas.relatorio_dotacao,
+        "relatorios.dotacao",
+        None,
+    ),
+    (
+        "execucao_unifei",
+        "Execução do Orçamento - UNIFEI",
+        "execucao_unifei",
+        "Ano",
+        consultas.filtrar_execucao_unifei,
+        consultas.relatorio_execucao_unifei,
+        "relatorios.execucao_unifei",
+        MES_NOME,
+    ),
+    (
+        "execucao_ted",
+        "Execução do Orçamento - TED",
+        "execucao_ted",
+        "Ano",
+        consultas.filtrar_execucao_ted,
+        consultas.relatorio_execucao_ted,
+        "relatorios.execucao_ted",
+        MES_NOME,
+    ),
+]
+
+_SECOES = {s[0]: s for s in SECOES}
+
+
+# --------------------------------------------------
+# Processo de trabalho
+# --------------------------------------------------
+_frames = {}
+
+
+def _inicializar(frames):
+    global _frames
+    _frames = frames
+    for secao in SECOES:
+        importlib.import_module(secao[6])
+
+
+def _nome_do_mes(serie, mes):
+    # Valor da coluna "Mês" da planilha para o mês de número mes; sem linhas
+    # desse mês, o nome em MAPA_MESES (que então não filtra nenhuma linha)
+    for valor in serie.dropna().unique():
+        if MAPA_MESES.get(str(valor).strip().upper()) == mes:
+            return valor
+    return next(nome for nome, numero in MAPA_MESES.items() if numero == mes)
+
+
+def _renderizar_secao(tarefa):
+    chave, ano, mes = tarefa
+    _, _, _, _, filtrar, resumir, modulo, tipo_mes = _SECOES[chave]
+    df = _frames[chave]
+
+    filtros = consultas.filtros_vazios(filtrar)
+    filtros["ano"] = ano
+    if mes and tipo_mes == MES_NUMERO:
+        filtros["mes"] = mes
+    elif mes and tipo_mes == MES_NOME:
+        filtros["mes"] = _nome_do_mes(df["Mês"], mes)
+
+    dff = filtrar(df, **filtros)
+    dados_pdf = resumir(dff, filtros)
+    return chave, importlib.import_module(modulo).montar_pdf(dados_pdf)
+
+
+# --------------------------------------------------
+# Sumário e junção
+# --------------------------------------------------
+def _montar_sumario(titulo, entradas):
+    story = [
+        Paragraph(titulo, estilo_titulo(20)),
+        Spacer(1, 0.4 * inch),
+        Paragraph("Sumário", ESTILOS["Heading2"]),
+        Spacer(1, 0.1 * inch),
+    ]
+
+    tbl = Table(
+        [[nome, str(pagina)] for nome, pagina in entradas],
+        colWidths=[5.5 * inch, 0.8 * inch],
+    )
+    tbl.setStyle(
+        TableStyle(
+            [
+                ("ALIGN", (1, 0), (1, -1), "RIGHT"),
+                ("LINEBELOW", (0, 0), (-1, -1), 0.3, colors.grey),
+                ("TEXTCOLOR", (0, 0), (-1, -1), colors.HexColor("#0b2b57")),
+                ("FONTSIZE", (0, 0), (-1, -1), 11),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+            ]
+        )
+    )
+    story.append(tbl)
+
+    buffer = BytesIO()
+    SimpleDocTemplate(buffer, pagesize=letter).build(story)
+    return buffer.getvalue()
+
+
+def juntar_secoes(titulo, secoes):
+    """Une [(título, pdf_bytes)] num único PDF precedido pelo sumário."""
+    leitores = [(nome, PdfReader(BytesIO(pdf))) for nome, pdf in secoes]
+
+    def entradas(paginas_sumario):
+        pagina = paginas_sumario + 1
+        for nome, leitor in leitores:
+            yield nome, pagina
+            pagina += len(leitor.pages)
+
+    # As páginas do sumário deslocam a numeração; o sumário é refeito
+    # com o deslocamento correto (o texto só muda nos números).
+    sumario = _montar_sumario(titulo, entradas(1))
+    paginas_sumario = len(PdfReader(BytesIO(sumario)).pages)
+    if paginas_sumario != 1:
+        sumario = _montar_sumario(titulo, entradas(paginas_sumario))
+
+    writer = PdfWriter()
+    writer.append(BytesIO(sumario), outline_item="Sumário")
+    for nome, leitor in leitores:
+        writer.append(leitor, outline_item=nome)
+
+    buffer = BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+# --------------------------------------------------
+# Processo principal
+# --------------------------------------------------
+def carregar_frames(ano):
+    datasets = registro.obter_varias([secao[2] for secao in SECOES])
+
+    frames = {}
+    for chave, _, dataset, coluna_ano, *_ in SECOES:
+        df = datasets[dataset]
+        frames[chave] = df[df[coluna_ano] == ano]
+    return frames
+
+
+def gerar_consolidado(ano, mes=None, processos=None):
+    frames = carregar_frames(ano)
+    tarefas = [(secao[0], ano, mes) for secao in SECOES]
+
+    with ProcessPoolExecutor(
+        max_workers=processos or min(len(tarefas), os.cpu_count() or 1),
+        initializer=_inicializar,
+        initargs=(frames,),
+    ) as pool:
+        renderizadas = dict(pool.map(_renderizar_secao, tarefas))
+
+    periodo = f"{mes:02d}/{ano}" if mes else str(ano)
+    return juntar_secoes(
+        f"Relatório Consolidado — {periodo}",
+        [(_titulo(secao, mes), renderizadas[secao[0]]) for secao in SECOES],
+    )
+
+
+def _titulo(secao, mes):
+    # Seções sem mês saem com o ano inteiro mesmo com --mes
+    if mes and secao[7] is None:
+        return f"{secao[1]} (ano inteiro)"
+    return secao[1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Gera o relatório consolidado de todos os painéis."
+    )
+    parser.add_argument("--ano", type=int, required=True)
+    parser.add_argument(
+        "--mes",
+        type=int,
+        choices=range(1, 13),
+        help="mês (aplicado a Passagens, Pagamentos e Execução; a Dotação "
+        "sai com o ano inteiro)",
+    )
+    parser.add_argument("--saida", required=True, help="arquivo PDF de destino")
+    parser.add_argument(
+        "--snapshots",
+        help="diretório de snapshots em disco (lidos se existirem, "
+        "gravados após a carga)",
+    )
+    parser.add_argument("--processos", type=int)
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    datasets = [secao[2] for secao in SECOES]
+    if args.snapshots:
+        registro.restaurar_snapshots(args.snapshots, datasets)
+
+    pdf = gerar_consolidado(args.ano, args.mes, args.processos)
+
+    if args.snapshots:
+        registro.salvar_snapshots(args.snapshots, datasets)
+    with open(args.saida, "wb") as fh:
+        fh.write(pdf)
+
+    print(
+        f"Relatório consolidado gravado em {args.saida} "
+        f"({time.perf_counter() - inicio:.1f}s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
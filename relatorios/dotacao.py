@@ -0,0 +1,116 @@
+# relatorios/dotacao.py
+
+# Relatório: Dotação Atualizada e Destaques Recebidos (cards + tabela)
+
+from io import BytesIO
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from dados.moeda import fmt_centavos
+from relatorios.estilos import ESTILOS, estilo_titulo
+
+NOME_ARQUIVO = "dotacao_destaques.pdf"
+
+wrap_style = ParagraphStyle(
+    name="wrap",
+    fontSize=8,
+    leading=10,
+    spaceAfter=4,
+)
+
+
+def wrap(text):
+    return Paragraph(str(text), wrap_style)
+
+
+def montar_story(dados_pdf):
+    story = []
+
+    titulo = Paragraph("Relatório de Dotação e Destaques", estilo_titulo(20))
+    story.append(titulo)
+    story.append(Spacer(1, 0.25 * inch))
+
+    f = dados_pdf["filtros"]
+    story.append(
+        Paragraph(
+            f"Ano: {f['ano'] if f['ano'] else 'Todos'} — "
+            f"Grupo: {f['grupo'] if f['grupo'] else 'Todos'} — "
+            f"Unidade: {f['unidade'] if f['unidade'] else 'Todas'} — "
+            f"Fonte: {f['fonte'] if f['fonte'] else 'Todas'}",
+            ESTILOS["Normal"],
+        )
+    )
+    story.append(Spacer(1, 0.25 * inch))
+
+    cards_data = [
+        ["Dotação Atualizada", fmt_centavos(dados_pdf["total_dotacao"])],
+        ["Destaques Recebidos", fmt_centavos(dados_pdf["total_destaque"])],
+    ]
+
+    tbl_cards = Table(cards_data, colWidths=[3.0 * inch, 3.0 * inch])
+    tbl_cards.setStyle(
+        TableStyle(
+            [
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("BACKGROUND", (0, 0), (-1, -1), colors.whitesmoke),
+                ("TEXTCOLOR", (0, 0), (-1, -1), colors.HexColor("#0b2b57")),
+                ("FONTSIZE", (0, 0), (-1, -1), 10),
+            ]
+        )
+    )
+    story.append(tbl_cards)
+    story.append(Spacer(1, 0.35 * inch))
+
+    table_data = [["GRUPO", "ANO", "UNIDADE", "FONTE", "DOTACAO", "DESTAQUE"]]
+    for r in dados_pdf["tabela"]:
+        table_data.append(
+            [
+                wrap(r["GRUPO DA DESPESA"]),
+                wrap(r["ANO"]),
+                wrap(r["UNIDADE ORÇAMENTÁRIA"]),
+                wrap(r["Fonte Recursos Detalhada"]),
+                wrap(r["DOTACAO ATUALIZADA"]),
+                wrap(r["DESTAQUE RECEBIDO"]),
+            ]
+        )
+
+    col_widths = [
+        1.2 * inch,
+        0.6 * inch,
+        2.0 * inch,
+        2.5 * inch,
+        1.0 * inch,
+        1.0 * inch,
+    ]
+    tbl = Table(table_data, colWidths=col_widths)
+    tbl.setStyle(
+        TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#0b2b57")),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("WORDWRAP", (0, 0), (-1, -1), True),
+                ("FONTSIZE", (0, 0), (-1, -1), 8),
+            ]
+        )
+    )
+
+    story.append(tbl)
+    return story
+
+
+def montar_pdf(dados_pdf, destino=None):
+    # Com destino (caminho ou arquivo), grava direto nele; senão retorna bytes
+    buffer = destino or BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    doc.build(montar_story(dados_pdf))
+    if destino is None:
+        return buffer.getvalue()
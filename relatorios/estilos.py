@@ -0,0 +1,25 @@
+# relatorios/estilos.py
+
+# Estilos compartilhados pelos relatórios (criados uma vez por processo)
+
+from functools import lru_cache
+
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+
+AZUL_UNIFEI = "#0b2b57"
+
+ESTILOS = getSampleStyleSheet()
+
+
+@lru_cache(maxsize=None)
+def estilo_titulo(tamanho):
+    return ParagraphStyle(
+        f"titulo_{tamanho}",
+        fontSize=tamanho,
+        alignment=TA_CENTER,
+        textColor=AZUL_UNIFEI,
+    )
+
+
+ESTILO_FILTROS = ParagraphStyle("filtros", fontSize=6, alignment=TA_LEFT)
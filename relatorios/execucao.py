@@ -0,0 +1,142 @@
+# relatorios/execucao.py
+
+# Base dos relatórios de Execução do Orçamento (UNIFEI e TED)
+
+from io import BytesIO
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_LEFT
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from dados.moeda import fmt_centavos
+from dados.planilhas import COLUNAS_EXECUCAO
+from relatorios.estilos import ESTILO_FILTROS, estilo_titulo
+
+wrap_style = ParagraphStyle(
+    name="wrap5",
+    fontSize=5,
+    leading=6,
+    spaceAfter=0,
+    alignment=TA_LEFT,
+)
+
+
+def wrap(text):
+    return Paragraph(str(text)[:150], wrap_style)
+
+
+# Larguras otimizadas para landscape
+COL_WIDTHS = [
+    1.2 * inch,  # Unidade
+    1.4 * inch,  # Fonte Recursos
+    1.1 * inch,  # Grupo Desp
+    1.3 * inch,  # Natureza Desp
+    0.75 * inch, # RP N.P.
+    0.75 * inch, # Empenha.
+    0.75 * inch, # Liquida.
+    0.8 * inch,  # Liq. Pagar
+    0.75 * inch, # Pagas
+]
+
+
+def montar_story(dados_pdf, titulo, linhas_filtros, cabecalho, coluna_unidade):
+    story = []
+
+    # Título
+    story.append(Paragraph(titulo, estilo_titulo(14)))
+    story.append(Spacer(1, 0.08 * inch))
+
+    # Filtros
+    for linha in linhas_filtros:
+        story.append(Paragraph(linha, ESTILO_FILTROS))
+    story.append(Spacer(1, 0.08 * inch))
+
+    # Cards/Totais
+    tot = dados_pdf["totais"]
+    cards_data = [
+        ["RP Não Proc.", fmt_centavos(tot["rp"])],
+        ["Empenhadas", fmt_centavos(tot["emp"])],
+        ["Liquidadas", fmt_centavos(tot["liq"])],
+        ["Liq. a Pagar", fmt_centavos(tot["liq_pagar"])],
+        ["Pagas", fmt_centavos(tot["pagas"])],
+    ]
+
+    tbl_cards = Table(cards_data, colWidths=[1.5 * inch, 1.5 * inch])
+    tbl_cards.setStyle(
+        TableStyle(
+            [
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("BACKGROUND", (0, 0), (-1, -1), colors.whitesmoke),
+                ("TEXTCOLOR", (0, 0), (-1, -1), colors.HexColor("#0b2b57")),
+                ("FONTSIZE", (0, 0), (-1, -1), 7),
+                ("LEFTPADDING", (0, 0), (-1, -1), 2),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 2),
+                ("TOPPADDING", (0, 0), (-1, -1), 2),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
+            ]
+        )
+    )
+    story.append(tbl_cards)
+    story.append(Spacer(1, 0.1 * inch))
+
+    # Tabela detalhada
+    colunas = [
+        coluna_unidade,
+        "Fonte Recursos Detalhada",
+        "GRUPO DESP",
+        "Natureza Despesa",
+    ] + COLUNAS_EXECUCAO
+
+    table_data = [cabecalho]
+    for r in dados_pdf["tabela"]:
+        table_data.append([wrap(r[c]) for c in colunas])
+
+    tbl = Table(table_data, colWidths=COL_WIDTHS)
+    tbl.setStyle(
+        TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#0b2b57")),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+                ("GRID", (0, 0), (-1, -1), 0.3, colors.grey),
+                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("WORDWRAP", (0, 0), (-1, -1), True),
+                ("FONTSIZE", (0, 0), (-1, 0), 5),
+                ("FONTSIZE", (0, 1), (-1, -1), 5),
+                (
+                    "ROWBACKGROUNDS",
+                    (0, 1),
+                    (-1, -1),
+                    [colors.white, colors.HexColor("#f9f9f9")],
+                ),
+                ("LEFTPADDING", (0, 0), (-1, -1), 1),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 1),
+                ("TOPPADDING", (0, 0), (-1, -1), 1),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 1),
+            ]
+        )
+    )
+
+    story.append(tbl)
+    return story
+
+
+def montar_documento(story, destino=None):
+    # Com destino (caminho ou arquivo), grava direto nele; senão retorna bytes
+    buffer = destino or BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=landscape(letter),
+        topMargin=0.3 * inch,
+        bottomMargin=0.3 * inch,
+        leftMargin=0.3 * inch,
+        rightMargin=0.3 * inch,
+    )
+    doc.build(story)
+    if destino is None:
+        return buffer.getvalue()
@@ -0,0 +1,43 @@
+# relatorios/execucao_ted.py
+
+# Relatório: Execução do Orçamento - TED
+
+from relatorios import execucao
+
+NOME_ARQUIVO = "execucao_orcamento_ted.pdf"
+
+CABECALHO = [
+    "UO",
+    "Fonte\nRecursos",
+    "Grupo\nDespesa",
+    "Natureza\nDespesa",
+    "RP N.P.",
+    "Empenha.",
+    "Liquida.",
+    "Liq. Pagar",
+    "Pagas",
+]
+
+
+def montar_story(dados_pdf):
+    f = dados_pdf["filtros"]
+    linhas_filtros = [
+        f"UO: {f['uo'] if f['uo'] else 'Todas'} | "
+        f"UG Exec: {f['ugexec'] if f['ugexec'] else 'Todas'} | "
+        f"Ano: {f['ano'] if f['ano'] else 'Todos'} | "
+        f"Mês: {f['mes'] if f['mes'] else 'Todos'}",
+        f"Fonte: {f['fonte'] if f['fonte'] else 'Todas'} | "
+        f"Grupo: {f['grupo'] if f['grupo'] else 'Todos'} | "
+        f"Natureza: {f['nat'] if f['nat'] else 'Todas'}",
+    ]
+    return execucao.montar_story(
+        dados_pdf,
+        "Relatório de Execução do Orçamento - TED",
+        linhas_filtros,
+        CABECALHO,
+        "Unidade Orçamentária",
+    )
+
+
+def montar_pdf(dados_pdf, destino=None):
+    return execucao.montar_documento(montar_story(dados_pdf), destino)
@@ -0,0 +1,42 @@
+# relatorios/execucao_unifei.py
+
+# Relatório: Execução do Orçamento - UNIFEI
+
+from relatorios import execucao
+
+NOME_ARQUIVO = "execucao_orcamento_unifei.pdf"
+
+CABECALHO = [
+    "UG Executora",
+    "Fonte Recursos",
+    "Grupo Desp.",
+    "Natureza Desp.",
+    "RP N.P.",
+    "Empenha.",
+    "Liquida.",
+    "Liq. Pagar",
+    "Pagas",
+]
+
+
+def montar_story(dados_pdf):
+    f = dados_pdf["filtros"]
+    linhas_filtros = [
+        f"UG: {f['ug_exec'] if f['ug_exec'] else 'Todas'} | "
+        f"Mês: {f['mes'] if f['mes'] else 'Todos'} | "
+        f"Ano: {f['ano'] if f['ano'] else 'Todos'} | "
+        f"Fonte: {f['fonte'] if f['fonte'] else 'Todas'}",
+        f"Grupo: {f['grupo'] if f['grupo'] else 'Todos'} | "
+        f"Natureza: {f['nat'] if f['nat'] else 'Todas'}",
+    ]
+    return execucao.montar_story(
+        dados_pdf,
+        "Relatório de Execução do Orçamento - UNIFEI",
+        linhas_filtros,
+        CABECALHO,
+        "UG Executora",
+    )
+
+
+def montar_pdf(dados_pdf, destino=None):
+    return execucao.montar_documento(montar_story(dados_pdf), destino)
@@ -0,0 +1,231 @@
+# relatorios/lote.py
+
+# Exportação em lote: um PDF por unidade e ano para cada painel.
+#
+# Uso:
+#   python -m relatorios.lote --saida relatorios_2025.zip --ano 2025
+#   python -m relatorios.lote --saida relatorios/ --painel dotacao --painel passagens
+#
+# As planilhas são carregadas uma única vez no processo principal (ou
+# restauradas de --snapshots) e repassadas a cada processo de trabalho no
+# initializer do pool; os estilos do reportlab são criados no import dos
+# módulos de relatório, também uma vez por processo.
+
+import argparse
+import importlib
+import os
+import re
+import sys
+import time
+import unicodedata
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from dados import consultas, registro
+
+
+# painel -> (dataset, coluna do ano, coluna da unidade, filtro da unidade,
+#            filtrar, resumir, módulo do relatório)
+PAINEIS = {
+    "dotacao": (
+        "dotacao",
+        "ANO",
+        "UNIDADE ORÇAMENTÁRIA",
+        "unidade",
+        consultas.filtrar_dotacao,
+        consultas.relatorio_dotacao,
+        "relatorios.dotacao",
+    ),
+    "execucao_unifei": (
+        "execucao_unifei",
+        "Ano",
+        "UG Executora",
+        "ug_exec",
+        consultas.filtrar_execucao_unifei,
+        consultas.relatorio_execucao_unifei,
+        "relatorios.execucao_unifei",
+    ),
+    "execucao_ted": (
+        "execucao_ted",
+        "Ano",
+        "Unidade Orçamentária",
+        "uo",
+        consultas.filtrar_execucao_ted,
+        consultas.relatorio_execucao_ted,
+        "relatorios.execucao_ted",
+    ),
+    "passagens": (
+        "passagens",
+        "Ano",
+        "Unidade (Viagem)",
+        "unidade",
+        consultas.filtrar_passagens,
+        consultas.relatorio_passagens_completo,
+        "relatorios.passagens",
+    ),
+}
+
+
+# --------------------------------------------------
+# Processo de trabalho
+# --------------------------------------------------
+_frames = {}
+
+
+def _inicializar(frames):
+    global _frames
+    _frames = frames
+    # Importa os módulos de relatório (e seus estilos) uma vez por processo
+    for *_, modulo in PAINEIS.values():
+        importlib.import_module(modulo)
+
+
+def _renderizar(tarefa):
+    painel, ano, unidade, arquivo = tarefa
+    _, _, _, filtro_unidade, filtrar, resumir, modulo = PAINEIS[painel]
+
+    filtros = consultas.filtros_vazios(filtrar)
+    filtros["ano"] = ano
+    filtros[filtro_unidade] = unidade
+
+    dff = filtrar(_frames[painel], **filtros)
+    dados_pdf = resumir(dff, filtros)
+    return arquivo, importlib.import_module(modulo).montar_pdf(dados_pdf)
+
+
+# --------------------------------------------------
+# Processo principal
+# --------------------------------------------------
+def _slug(texto):
+    texto = unicodedata.normalize("NFKD", str(texto))
+    texto = texto.encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^A-Za-z0-9]+", "_", texto).strip("_").lower() or "sem_nome"
+
+
+def montar_tarefas(frames, anos=None):
+    tarefas = []
+    for painel, df in frames.items():
+        _, coluna_ano, coluna_unidade, *_ = PAINEIS[painel]
+        pares = (
+            df[[coluna_ano, coluna_unidade]]
+            .dropna()
+            .drop_duplicates()
+            .sort_values([coluna_ano, coluna_unidade])
+        )
+        for ano, unidade in pares.itertuples(index=False):
+            ano = int(ano)
+            if anos and ano not in anos:
+                continue
+            arquivo = f"{painel}/{ano}/{_slug(unidade)}.pdf"
+            tarefas.append((painel, ano, unidade, arquivo))
+    return tarefas
+
+
+def carregar_frames(paineis, anos=None, snapshots=None):
+    if snapshots:
+        registro.restaurar_snapshots(snapshots)
+
+    datasets = registro.obter_varias([PAINEIS[p][0] for p in paineis])
+
+    frames = {}
+    for painel in paineis:
+        dataset, coluna_ano, *_ = PAINEIS[painel]
+        df = datasets[dataset]
+        if anos:
+            df = df[df[coluna_ano].isin(anos)]
+        frames[painel] = df
+
+    if snapshots:
+        registro.salvar_snapshots(
+            snapshots, [PAINEIS[p][0] for p in paineis]
+        )
+    return frames
+
+
+def exportar(saida, paineis=None, anos=None, snapshots=None, processos=None):
+    paineis = paineis or list(PAINEIS)
+    frames = carregar_frames(paineis, anos, snapshots)
+    tarefas = montar_tarefas(frames, anos)
+    if not tarefas:
+        return 0
+
+    processos = processos or os.cpu_count() or 1
+    chunksize = max(1, len(tarefas) // (processos * 4))
+
+    como_zip = saida.lower().endswith(".zip")
+    zf = zipfile.ZipFile(saida, "w", zipfile.ZIP_DEFLATED) if como_zip else None
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=processos,
+            initializer=_inicializar,
+            initargs=(frames,),
+        ) as pool:
+            for arquivo, conteudo in pool.map(
+                _renderizar, tarefas, chunksize=chunksize
+            ):
+                if zf is not None:
+                    zf.writestr(arquivo, conteudo)
+                else:
+                    caminho = os.path.join(saida, arquivo)
+                    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+                    with open(caminho, "wb") as fh:
+                        fh.write(conteudo)
+    finally:
+        if zf is not None:
+            zf.close()
+
+    return len(tarefas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Gera um PDF por unidade e ano para cada painel."
+    )
+    parser.add_argument(
+        "--saida",
+        required=True,
+        help="arquivo .zip ou diretório de destino",
+    )
+    parser.add_argument(
+        "--painel",
+        action="append",
+        choices=sorted(PAINEIS),
+        help="painel a exportar (pode repetir; padrão: todos)",
+    )
+    parser.add_argument(
+        "--ano",
+        action="append",
+        type=int,
+        help="ano a exportar (pode repetir; padrão: todos)",
+    )
+    parser.add_argument(
+        "--snapshots",
+        help="diretório de snapshots em disco (lidos se existirem, "
+        "gravados após a carga)",
+    )
+    parser.add_argument(
+        "--processos",
+        type=int,
+        help="número de processos de trabalho (padrão: núcleos da máquina)",
+    )
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    total = exportar(
+        args.saida,
+        paineis=args.painel,
+        anos=args.ano,
+        snapshots=args.snapshots,
+        processos=args.processos,
+    )
+    print(
+        f"{total} relatórios gerados em {args.saida} "
+        f"({time.perf_counter() - inicio:.1f}s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
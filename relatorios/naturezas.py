@@ -0,0 +1,91 @@
+# relatorios/naturezas.py
+
+# Relatório: Naturezas de Despesa utilizadas em 2024
+
+from io import BytesIO
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_LEFT
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from relatorios.estilos import estilo_titulo
+
+NOME_ARQUIVO = "naturezas_despesa_2024.pdf"
+
+wrap_style = ParagraphStyle(
+    name="wrap",
+    fontSize=8,
+    leading=10,
+    spaceAfter=2,
+    alignment=TA_LEFT,
+)
+
+
+def wrap(text):
+    return Paragraph(str(text), wrap_style)
+
+
+def montar_story(tabela):
+    story = []
+
+    titulo = Paragraph(
+        "Naturezas de Despesa utilizadas em 2024", estilo_titulo(18)
+    )
+    story.append(titulo)
+    story.append(Spacer(1, 0.2 * inch))
+
+    # Cabeçalho e linhas
+    colunas = list(tabela[0].keys())
+    header = [wrap(c) for c in colunas]
+    table_data = [header]
+
+    for r in tabela:
+        row = [wrap(r.get(c, "")) for c in colunas]
+        table_data.append(row)
+
+    col_widths = [3.0 * inch, 7.0 * inch]  # ND SOF, TITULO
+    tbl = Table(table_data, colWidths=col_widths)
+    tbl.setStyle(
+        TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#0b2b57")),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+                ("GRID", (0, 0), (-1, -1), 0.4, colors.grey),
+                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("WORDWRAP", (0, 0), (-1, -1), True),
+                ("FONTSIZE", (0, 0), (-1, 0), 8),
+                ("FONTSIZE", (0, 1), (-1, -1), 8),
+                (
+                    "ROWBACKGROUNDS",
+                    (0, 1),
+                    (-1, -1),
+                    [colors.white, colors.HexColor("#f5f5f5")],
+                ),
+                ("LEFTPADDING", (0, 0), (-1, -1), 3),
+                ("RIGHTPADDING", (0, 0), (-1, -1), 3),
+                ("TOPPADDING", (0, 0), (-1, -1), 3),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 3),
+            ]
+        )
+    )
+
+    story.append(tbl)
+    return story
+
+
+def montar_pdf(tabela, destino=None):
+    # Com destino (caminho ou arquivo), grava direto nele; senão retorna bytes
+    buffer = destino or BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=landscape(letter),
+        topMargin=0.5 * inch,
+        bottomMargin=0.5 * inch,
+    )
+    doc.build(montar_story(tabela))
+    if destino is None:
+        return buffer.getvalue()
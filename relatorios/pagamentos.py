@@ -0,0 +1,105 @@
+# relatorios/pagamentos.py
+
+# Relatório: Pagamentos Efetivados (total + tabela)
+
+from io import BytesIO
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from dados.moeda import fmt_centavos
+from relatorios.estilos import ESTILOS, estilo_titulo
+
+NOME_ARQUIVO = "pagamentos_efetivados.pdf"
+
+wrap_style = ParagraphStyle(
+    name="wrap",
+    fontSize=8,
+    leading=10,
+    spaceAfter=4,
+)
+
+
+def wrap(text):
+    return Paragraph(str(text), wrap_style)
+
+
+def montar_story(dados_pdf):
+    story = []
+
+    titulo = Paragraph("Relatório de Pagamentos Efetivados", estilo_titulo(22))
+    story.append(titulo)
+    story.append(Spacer(1, 0.3 * inch))
+
+    filtros = dados_pdf["filtros"]
+    story.append(
+        Paragraph(
+            f"Ano: {filtros['ano']} — "
+            f"Mês: {filtros['mes'] if filtros['mes'] else 'Todos'} — "
+            f"Lista: {filtros['lista'] if filtros['lista'] else 'Todas'} — "
+            f"Fonte: {filtros['fonte'] if filtros['fonte'] else 'Todas'}",
+            ESTILOS["Normal"],
+        )
+    )
+    story.append(Spacer(1, 0.3 * inch))
+
+    story.append(
+        Paragraph(
+            f"Total Geral: {fmt_centavos(dados_pdf['total_geral'])}",
+            ESTILOS["Normal"],
+        )
+    )
+    story.append(Spacer(1, 0.2 * inch))
+
+    table_data = [
+        ["DT ATESTE", "DT PGTO", "Valor", "FONTE", "LISTAS", "RAZÃO SOCIAL"]
+    ]
+    for r in dados_pdf["tabela"]:
+        table_data.append(
+            [
+                wrap(r["DT ATESTE"]),
+                wrap(r["DT PGTO"]),
+                wrap(r["Valor"]),
+                wrap(r["FONTE"]),
+                wrap(r["LISTAS"]),
+                wrap(r["RAZÃO SOCIAL"][:30]),
+            ]
+        )
+
+    col_widths = [
+        1.0 * inch,
+        1.0 * inch,
+        1.0 * inch,
+        1.0 * inch,
+        1.0 * inch,
+        1.3 * inch,
+    ]
+    tbl = Table(table_data, colWidths=col_widths)
+    tbl.setStyle(
+        TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#0b2b57")),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("WORDWRAP", (0, 0), (-1, -1), True),
+                ("FONTSIZE", (0, 0), (-1, -1), 8),
+            ]
+        )
+    )
+
+    story.append(tbl)
+    return story
+
+
+def montar_pdf(dados_pdf, destino=None):
+    # Com destino (caminho ou arquivo), grava direto nele; senão retorna bytes
+    buffer = destino or BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    doc.build(montar_story(dados_pdf))
+    if destino is None:
+        return buffer.getvalue()
@@ -0,0 +1,142 @@
+# relatorios/passagens.py
+
+# Relatório: Gastos com Viagens (cards + resumo por unidade + detalhe PCDP)
+
+from io import BytesIO
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from dados.moeda import fmt_centavos
+from relatorios.estilos import ESTILOS, estilo_titulo
+
+NOME_ARQUIVO = "relatorio_gastos_viagens.pdf"
+
+wrap_style = ParagraphStyle(
+    name="wrap",
+    fontSize=8,
+    leading=10,
+    spaceAfter=4,
+)
+
+
+def wrap(text):
+    return Paragraph(str(text), wrap_style)
+
+
+def montar_story(dados_pdf):
+    story = []
+
+    titulo = Paragraph("Relatório de Gastos com Viagens", estilo_titulo(22))
+    story.append(titulo)
+    story.append(Spacer(1, 0.3 * inch))
+
+    filtros = dados_pdf["filtros"]
+    story.append(
+        Paragraph(
+            f"Ano: {filtros['ano']} — "
+            f"Mês: {filtros['mes'] if filtros['mes'] else 'Todos'} — "
+            f"Unidade: {filtros['unidade'] if filtros['unidade'] else 'Todas'}",
+            ESTILOS["Normal"],
+        )
+    )
+    story.append(Spacer(1, 0.3 * inch))
+
+    cards_vals = dados_pdf["cards"]
+
+    cards_data = [
+        ["Total Viagens", fmt_centavos(cards_vals["total_viagem"])],
+        ["Passagens no Prazo", fmt_centavos(cards_vals["total_prazo"])],
+        ["Passagens Urgência", fmt_centavos(cards_vals["total_urgencia"])],
+        ["Gasto em Diárias", fmt_centavos(cards_vals["total_diarias"])],
+        ["Seguro Viagem", fmt_centavos(cards_vals["total_seguro"])],
+        ["Restituições", fmt_centavos(cards_vals["total_restit"])],
+    ]
+
+    tbl_cards = Table(cards_data, colWidths=[3.0 * inch, 3.0 * inch])
+    tbl_cards.setStyle(
+        TableStyle(
+            [
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+                ("BACKGROUND", (0, 0), (-1, -1), colors.whitesmoke),
+                ("TEXTCOLOR", (0, 0), (-1, -1), colors.HexColor("#0b2b57")),
+            ]
+        )
+    )
+    story.append(tbl_cards)
+    story.append(Spacer(1, 0.4 * inch))
+
+    story.append(Paragraph("Resumo por Unidade", ESTILOS["Heading2"]))
+    table1 = [["Unidade", "Diárias", "Passagem", "Restituição", "Seguro"]]
+    for r in dados_pdf["resumo"]:
+        table1.append(
+            [
+                wrap(r["Unidade (Viagem)"]),
+                wrap(r["Valor das Diárias"]),
+                wrap(r["Valor da Passagem"]),
+                wrap(r["Valor Restituição"]),
+                wrap(r["Valor Seguro Viagem"]),
+            ]
+        )
+
+    col_widths1 = [2.8 * inch, 1.0 * inch, 1.0 * inch, 1.0 * inch, 1.0 * inch]
+    tbl1 = Table(table1, colWidths=col_widths1)
+    tbl1.setStyle(
+        TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#0b2b57")),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("WORDWRAP", (0, 0), (-1, -1), True),
+            ]
+        )
+    )
+    story.append(tbl1)
+    story.append(Spacer(1, 0.5 * inch))
+
+    story.append(Paragraph("Detalhamento PCDP", ESTILOS["Heading2"]))
+    table2 = [["Unidade", "PCDP", "Data", "Prazo", "Urgência"]]
+    for r in dados_pdf["detalhe"]:
+        table2.append(
+            [
+                wrap(r["Unidade (Viagem)"]),
+                wrap(r["Número da PCDP"]),
+                wrap(r["Data Início da Viagem"]),
+                wrap(r["Custo com emissão de passagens dentro do prazo"]),
+                wrap(r["Custo com emissão de passagens em caráter de urgência"]),
+            ]
+        )
+
+    col_widths2 = [2.8 * inch, 1.0 * inch, 1.0 * inch, 1.2 * inch, 1.2 * inch]
+    tbl2 = Table(table2, colWidths=col_widths2)
+    tbl2.setStyle(
+        TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#003A70")),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("WORDWRAP", (0, 0), (-1, -1), True),
+                ("FONTSIZE", (0, 0), (-1, -1), 8),
+            ]
+        )
+    )
+    story.append(tbl2)
+    return story
+
+
+def montar_pdf(dados_pdf, destino=None):
+    # Com destino (caminho ou arquivo), grava direto nele; senão retorna bytes
+    buffer = destino or BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    doc.build(montar_story(dados_pdf))
+    if destino is None:
+        return buffer.getvalue()
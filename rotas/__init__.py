@@ -0,0 +1,4 @@
+# rotas/__init__.py
+
+# Rotas Flask adicionais registradas no servidor do Dash (app.server).
+# Cada módulo expõe registrar(server).
@@ -0,0 +1,78 @@
+# rotas/downloads.py
+
+# Entrega dos relatórios em PDF por uma rota de download.
+#
+# O callback grava o PDF direto em disco e devolve só a URL; o navegador
+# baixa o arquivo por
+#
+#   GET /download/<token>/<nome_arquivo>
+#
+# servido com Content-Length e suporte a Range (send_from_directory com
+# conditional), sem passar o conteúdo em base64 pela resposta do callback.
+# Como os arquivos ficam num diretório comum, qualquer worker do gunicorn
+# atende o download. Arquivos mais antigos que VALIDADE são apagados a cada
+# novo relatório gravado.
+
+import os
+import re
+import secrets
+import shutil
+import tempfile
+import time
+from urllib.parse import quote
+
+import flask
+
+DIRETORIO = os.environ.get(
+    "PAINEL_DOWNLOADS_DIR",
+    os.path.join(tempfile.gettempdir(), "painel-dcf-downloads"),
+)
+VALIDADE = 60 * 60  # segundos
+
+_TOKEN = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+def limpar_expirados(agora=None):
+    agora = agora or time.time()
+    if not os.path.isdir(DIRETORIO):
+        return
+    for token in os.listdir(DIRETORIO):
+        caminho = os.path.join(DIRETORIO, token)
+        try:
+            if agora - os.path.getmtime(caminho) > VALIDADE:
+                shutil.rmtree(caminho, ignore_errors=True)
+        except OSError:
+            pass
+
+
+def gravar_relatorio(montar_pdf, dados_pdf, nome_arquivo):
+    """Grava o PDF em disco e retorna a URL de download."""
+    limpar_expirados()
+
+    token = secrets.token_urlsafe(16)
+    pasta = os.path.join(DIRETORIO, token)
+    os.makedirs(pasta)
+    montar_pdf(dados_pdf, os.path.join(pasta, nome_arquivo))
+
+    return f"/download/{token}/{quote(nome_arquivo)}"
+
+
+def baixar(token, nome_arquivo):
+    if not _TOKEN.match(token):
+        flask.abort(404)
+    return flask.send_from_directory(
+        DIRETORIO,
+        f"{token}/{nome_arquivo}",
+        as_attachment=True,
+        download_name=nome_arquivo,
+        mimetype="application/pdf",
+        max_age=0,
+    )
+
+
+def registrar(server):
+    server.add_url_rule(
+        "/download/<token>/<nome_arquivo>",
+        endpoint="download_relatorio",
+        view_func=baixar,
+    )
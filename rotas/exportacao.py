@@ -0,0 +1,318 @@
+# rotas/exportacao.py
+
+# Exportação da visão filtrada de cada painel em CSV, XLSX ou Parquet.
+#
+#   GET /exportar/<painel>.<formato>?ano=2025&unidade=...
+#
+# Os parâmetros da query string são os mesmos filtros das páginas (ver
+# dados.consultas). As linhas são enviadas em blocos por um gerador, sem
+# montar o arquivo inteiro em memória:
+#   - CSV: cada bloco é serializado e enviado na sequência;
+#   - Parquet: cada bloco vira um row group, enviado assim que é escrito;
+#   - XLSX: escrito pelo xlsxwriter em modo constant_memory num arquivo
+#     temporário, que é então enviado em partes.
+# Os valores em reais, guardados em centavos nos snapshots, saem em reais
+# (convertidos bloco a bloco).
+#
+# /exportar/execucao.<formato> exporta o consolidado da execução (UNIFEI e
+# TED juntas, ver dados.execucao), com os filtros de
+# consultas.filtrar_execucao.
+#
+# A rota nunca baixa planilhas: se o snapshot ainda não foi carregado (a
+# carga inicial em andamento, ou uma que falhou), ela dispara a carga em
+# segundo plano e responde 503 com Retry-After, como as páginas fazem com
+# o aviso de "carregando".
+
+import tempfile
+from urllib.parse import urlencode
+
+import flask
+import pandas as pd
+from dash import html
+
+from dados import consultas, esquemas, execucao, registro
+from dados.moeda import reais
+from dados.planilhas import COLUNAS_EXECUCAO
+
+TAMANHO_BLOCO = 10_000
+TAMANHO_LEITURA = 64 * 1024
+ESPERA = 5  # segundos (Retry-After enquanto as planilhas carregam)
+
+# painel -> (dataset, função de filtro, filtro -> coluna)
+PAINEIS = {
+    "passagens": (
+        "passagens",
+        consultas.filtrar_passagens,
+        {"ano": "Ano", "mes": "Mes", "unidade": "Unidade (Viagem)"},
+    ),
+    "pagamentos": (
+        "pagamentos",
+        consultas.filtrar_pagamentos,
+        {"ano": "Ano", "mes": "Mes", "lista": "LISTAS", "fonte": "FONTE"},
+    ),
+    "dotacao": (
+        "dotacao",
+        consultas.filtrar_dotacao,
+        {
+            "grupo": "GRUPO DA DESPESA",
+            "ano": "ANO",
+            "unidade": "UNIDADE ORÇAMENTÁRIA",
+            "fonte": "Fonte Recursos Detalhada",
+        },
+    ),
+    "execucao_unifei": (
+        "execucao_unifei",
+        consultas.filtrar_execucao_unifei,
+        execucao.PLANILHAS["execucao_unifei"].filtros,
+    ),
+    "execucao_ted": (
+        "execucao_ted",
+        consultas.filtrar_execucao_ted,
+        execucao.PLANILHAS["execucao_ted"].filtros,
+    ),
+    "execucao": (
+        execucao.CONSOLIDADO,
+        consultas.filtrar_execucao,
+        execucao.PLANILHAS[execucao.CONSOLIDADO].filtros,
+    ),
+    "naturezas": ("naturezas", None, {}),
+}
+
+FORMATOS = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+# --------------------------------------------------
+# Filtros a partir da query string
+# --------------------------------------------------
+def _converter(valor, serie):
+    # Os valores chegam como texto; colunas numéricas comparam por número
+    if pd.api.types.is_numeric_dtype(serie):
+        numero = float(valor)
+        return int(numero) if numero.is_integer() else numero
+    return valor
+
+
+def _planilhas(dataset):
+    # O consolidado depende das duas planilhas da execução
+    if dataset == execucao.CONSOLIDADO:
+        return execucao.ORIGENS
+    return [dataset]
+
+
+def _snapshot(dataset):
+    if dataset in execucao.PLANILHAS:
+        return execucao.obter(dataset)
+    return registro.obter(dataset)
+
+
+def _moeda(dataset):
+    # O consolidado da execução tem os valores das duas planilhas
+    if dataset == execucao.CONSOLIDADO:
+        return COLUNAS_EXECUCAO
+    return esquemas.colunas_moeda(dataset)
+
+
+def filtrar(painel, args):
+    dataset, funcao, colunas = PAINEIS[painel]
+    df = _snapshot(dataset)
+    if funcao is None:
+        return df
+
+    filtros = {}
+    for nome, coluna in colunas.items():
+        valor = args.get(nome)
+        if valor not in (None, ""):
+            filtros[nome] = _converter(valor, df[coluna])
+    return funcao(df, **filtros)
+
+
+# --------------------------------------------------
+# Geradores por formato
+# --------------------------------------------------
+def _em_reais(bloco, moeda):
+    if not moeda:
+        return bloco
+    return bloco.assign(**{c: reais(bloco[c]) for c in moeda})
+
+
+def _blocos(dff, moeda=()):
+    for inicio in range(0, len(dff), TAMANHO_BLOCO):
+        yield _em_reais(dff.iloc[inicio:inicio + TAMANHO_BLOCO], moeda)
+
+
+def gerar_csv(dff, moeda=()):
+    yield dff.head(0).to_csv(index=False)
+    for bloco in _blocos(dff, moeda):
+        yield bloco.to_csv(index=False, header=False)
+
+
+class _Saida:
+    # Destino de escrita que acumula bytes até serem drenados pelo gerador
+
+    def __init__(self):
+        self.partes = []
+        self.posicao = 0
+        self.closed = False
+
+    def write(self, dados):
+        dados = bytes(dados)
+        self.partes.append(dados)
+        self.posicao += len(dados)
+        return len(dados)
+
+    def tell(self):
+        return self.posicao
+
+    def flush(self):
+        pass
+
+    def writable(self):
+        return True
+
+    def close(self):
+        self.closed = True
+
+    def drenar(self):
+        dados = b"".join(self.partes)
+        self.partes = []
+        return dados
+
+
+def _texto_para_string(bloco, colunas_texto):
+    bloco = bloco.copy()
+    for c in colunas_texto:
+        bloco[c] = bloco[c].where(bloco[c].isna(), bloco[c].astype(str))
+    return bloco
+
+
+def gerar_parquet(dff, moeda=()):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # Colunas object podem misturar tipos; são gravadas como texto para o
+    # schema ser o mesmo em todos os row groups
+    colunas_texto = [c for c in dff.columns if dff[c].dtype == object]
+    vazio = _em_reais(dff.head(0), moeda)
+    schema = pa.Schema.from_pandas(
+        _texto_para_string(vazio, colunas_texto), preserve_index=False
+    )
+    schema = pa.schema(
+        [
+            pa.field(f.name, pa.string()) if f.name in colunas_texto else f
+            for f in schema
+        ]
+    )
+
+    saida = _Saida()
+    writer = pq.ParquetWriter(saida, schema)
+    for bloco in _blocos(dff, moeda):
+        bloco = _texto_para_string(bloco, colunas_texto)
+        writer.write_table(
+            pa.Table.from_pandas(bloco, schema=schema, preserve_index=False)
+        )
+        yield saida.drenar()
+    writer.close()
+    yield saida.drenar()
+
+
+def gerar_xlsx(dff, moeda=()):
+    import xlsxwriter
+
+    with tempfile.TemporaryFile() as arquivo:
+        workbook = xlsxwriter.Workbook(
+            arquivo,
+            {"constant_memory": True, "default_date_format": "dd/mm/yyyy"},
+        )
+        planilha = workbook.add_worksheet()
+        planilha.write_row(0, 0, [str(c) for c in dff.columns])
+
+        linha = 1
+        for bloco in _blocos(dff, moeda):
+            bloco = bloco.astype(object).where(bloco.notna(), None)
+            for valores in bloco.itertuples(index=False, name=None):
+                planilha.write_row(linha, 0, valores)
+                linha += 1
+        workbook.close()
+
+        arquivo.seek(0)
+        while True:
+            dados = arquivo.read(TAMANHO_LEITURA)
+            if not dados:
+                break
+            yield dados
+
+
+GERADORES = {
+    "csv": gerar_csv,
+    "xlsx": gerar_xlsx,
+    "parquet": gerar_parquet,
+}
+
+
+# --------------------------------------------------
+# Rota
+# --------------------------------------------------
+def exportar(painel, formato):
+    if painel not in PAINEIS or formato not in FORMATOS:
+        flask.abort(404)
+
+    pendentes = [
+        nome for nome in _planilhas(PAINEIS[painel][0]) if not registro.pronto(nome)
+    ]
+    if pendentes:
+        registro.carregar_em_segundo_plano(pendentes)
+        return flask.Response(
+            f"Planilhas ainda carregando: {', '.join(pendentes)}\n",
+            status=503,
+            mimetype="text/plain",
+            headers={"Retry-After": str(ESPERA)},
+        )
+
+    try:
+        dff = filtrar(painel, flask.request.args)
+    except ValueError:
+        flask.abort(400)
+    moeda = [c for c in _moeda(PAINEIS[painel][0]) if c in dff.columns]
+
+    return flask.Response(
+        GERADORES[formato](dff, moeda),
+        mimetype=FORMATOS[formato],
+        headers={
+            "Content-Disposition": f'attachment; filename="{painel}.{formato}"'
+        },
+    )
+
+
+def registrar(server):
+    server.add_url_rule(
+        "/exportar/<painel>.<formato>",
+        endpoint="exportar",
+        view_func=exportar,
+    )
+
+
+# --------------------------------------------------
+# Links para as páginas
+# --------------------------------------------------
+def url_exportacao(painel, formato, filtros):
+    query = urlencode({k: v for k, v in filtros.items() if v not in (None, "")})
+    url = f"/exportar/{painel}.{formato}"
+    return f"{url}?{query}" if query else url
+
+
+def links_exportacao(painel, filtros):
+    children = [html.Span("Exportar: ")]
+    for formato in FORMATOS:
+        children.append(
+            html.A(
+                formato.upper(),
+                href=url_exportacao(painel, formato, filtros),
+                className="export-link",
+                style={"marginRight": "8px"},
+            )
+        )
+    return children
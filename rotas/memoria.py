@@ -0,0 +1,82 @@
+# rotas/memoria.py
+
+# Diagnóstico de memória do worker que atender a requisição (ver
+# monitoramento.memoria).
+#
+#   GET    /admin/memoria                  RSS, snapshots, caches, linha do
+#                                          tempo e estado do tracemalloc
+#   POST   /admin/memoria/marcas?nome=X    nova marca do tracemalloc
+#   DELETE /admin/memoria/marcas           desliga o tracemalloc
+#   GET    /admin/memoria/diferenca?de=X[&ate=Y][&n=20][&agrupar=lineno]
+#                                          maiores variações entre as marcas
+#                                          (sem ate, até agora)
+#
+# Todas exigem o token de admin (monitoramento.admin).
+
+import os
+
+import flask
+
+from monitoramento import admin, memoria
+
+AGRUPAMENTOS = ("lineno", "filename", "traceback")
+
+
+def ver_memoria():
+    admin.exigir()
+    return flask.jsonify(
+        {
+            "pid": os.getpid(),
+            "rss": memoria.rss(),
+            "snapshots": memoria.snapshots(),
+            "caches": memoria.caches(),
+            "linha_do_tempo": memoria.linha_do_tempo(),
+            "tracemalloc": memoria.estado_rastreamento(),
+        }
+    )
+
+
+def marcas():
+    admin.exigir()
+    if flask.request.method == "DELETE":
+        estado = memoria.parar()
+    else:
+        estado = memoria.marcar(flask.request.args.get("nome"))
+    return flask.jsonify({"pid": os.getpid(), **estado})
+
+
+def diferenca():
+    admin.exigir()
+    args = flask.request.args
+    agrupar = args.get("agrupar", "lineno")
+    if agrupar not in AGRUPAMENTOS:
+        flask.abort(400)
+    try:
+        variacoes = memoria.diferenca(
+            args.get("de", ""),
+            args.get("ate"),
+            args.get("n", 20, type=int),
+            agrupar,
+        )
+    except KeyError:
+        # A marca pode ter sido criada em outro worker
+        resposta = {"pid": os.getpid(), "erro": "marca não encontrada"}
+        return flask.jsonify(resposta), 404
+    return flask.jsonify({"pid": os.getpid(), "variacoes": variacoes})
+
+
+def registrar(server):
+    server.add_url_rule(
+        "/admin/memoria", endpoint="memoria", view_func=ver_memoria
+    )
+    server.add_url_rule(
+        "/admin/memoria/marcas",
+        endpoint="marcas_memoria",
+        view_func=marcas,
+        methods=["POST", "DELETE"],
+    )
+    server.add_url_rule(
+        "/admin/memoria/diferenca",
+        endpoint="diferenca_memoria",
+        view_func=diferenca,
+    )
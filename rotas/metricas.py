@@ -0,0 +1,20 @@
+# rotas/metricas.py
+
+# Métricas do painel no formato do Prometheus (ver monitoramento.metricas).
+#
+#   GET /metrics
+
+import flask
+
+from monitoramento import metricas
+
+
+def exportar_metricas():
+    corpo, tipo = metricas.exportar()
+    return flask.Response(corpo, content_type=tipo)
+
+
+def registrar(server):
+    server.add_url_rule(
+        "/metrics", endpoint="metricas", view_func=exportar_metricas
+    )
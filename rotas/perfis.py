@@ -0,0 +1,77 @@
+# rotas/perfis.py
+
+# Perfis de callbacks gravados sob demanda (ver monitoramento.perfil).
+#
+#   GET /admin/perfis                          lista, do mais recente
+#   GET /admin/perfis/<id>                     contexto de um perfil
+#   GET /admin/perfis/<id>/<arquivo>           relatório (HTML ou .pstats)
+#
+# Todas exigem o token de admin (monitoramento.admin).
+
+import os
+import re
+
+import flask
+
+from monitoramento import admin, perfil
+
+_IDENTIFICADOR = re.compile(r"^[0-9]{8}-[0-9]{6}-[0-9a-f]+$")
+
+
+def _detalhar(identificador):
+    # OSError/ValueError: perfil ainda sendo gravado ou com gravação falha
+    dados = perfil.contexto(identificador)
+    pasta = os.path.join(perfil.DIRETORIO, identificador)
+    dados["arquivos"] = [
+        f"/admin/perfis/{identificador}/{arquivo}"
+        for arquivo in sorted(os.listdir(pasta))
+    ]
+    return dados
+
+
+def listar_perfis():
+    admin.exigir()
+    perfis = []
+    for identificador in perfil.listar():
+        try:
+            perfis.append(_detalhar(identificador))
+        except (OSError, ValueError):
+            continue  # incompleto; não derruba a lista
+    return flask.jsonify(perfis)
+
+
+def ver_perfil(identificador):
+    admin.exigir()
+    if not _IDENTIFICADOR.match(identificador):
+        flask.abort(404)
+    try:
+        dados = _detalhar(identificador)
+    except (OSError, ValueError):
+        flask.abort(404)
+    return flask.jsonify(dados)
+
+
+def baixar_perfil(identificador, arquivo):
+    admin.exigir()
+    if not _IDENTIFICADOR.match(identificador):
+        flask.abort(404)
+    return flask.send_from_directory(
+        perfil.DIRETORIO,
+        f"{identificador}/{arquivo}",
+        as_attachment=arquivo.endswith(".pstats"),
+        max_age=0,
+    )
+
+
+def registrar(server):
+    server.add_url_rule(
+        "/admin/perfis", endpoint="perfis", view_func=listar_perfis
+    )
+    server.add_url_rule(
+        "/admin/perfis/<identificador>", endpoint="perfil", view_func=ver_perfil
+    )
+    server.add_url_rule(
+        "/admin/perfis/<identificador>/<arquivo>",
+        endpoint="arquivo_perfil",
+        view_func=baixar_perfil,
+    )